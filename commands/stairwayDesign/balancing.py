@@ -0,0 +1,45 @@
+import math
+
+# ------------------------------------------------------------------------------
+# Balancing of the steps with the Harrow method (pure python, no adsk import)
+# ------------------------------------------------------------------------------
+
+def computeHarrowBalancing(
+        stepGoing:      float,
+        walkpathRadius: float,
+        insideRadius:   float,
+        straightLength: float,
+        balanceAngleTo: float
+    ) -> dict:
+    """Compute the whole balanced section in one pass.
+    Return a dict of lists by step : 'Inside' and 'Walk' offsets, 'Angle', and 'IsStepLine' if a new step line is needed"""
+
+    walkpathBalance    = ( walkpathRadius * 2 + insideRadius * 2 ) * balanceAngleTo / 2
+    walkpathTotal      = straightLength + walkpathBalance
+    insidePathTotal    = straightLength + insideRadius * balanceAngleTo
+
+    stepNumber         = math.ceil( walkpathTotal / stepGoing )
+
+    angleB             = math.atan( walkpathTotal / insidePathTotal )
+    angleA             = math.pi - ( 2 * angleB )
+
+    tanA               = math.tan( angleA )
+    cosA               = math.cos( angleA )
+
+    # ------------------------------------------------------------------------------
+
+    goings   = [ stepGoing * ( step + 1 ) for step in range( stepNumber ) ]
+    walks    = [ going  if( going < walkpathTotal )  else walkpathTotal for going in goings ]
+    angles   = [ math.atan( walk / insidePathTotal ) for walk in walks ]
+    insides  = [ insidePathTotal / ( tanA / math.tan( angle ) + 1 ) / cosA for angle in angles ]
+
+    # the last step is shortened to the end of the walkpath, it has no step line
+
+    isStepLines = [ round( going - walk, 2 ) == 0.0 for going, walk in zip( goings, walks ) ]
+
+    return {
+        'Inside':     insides,
+        'Walk':       walks,
+        'Angle':      angles,
+        'IsStepLine': isStepLines
+    }
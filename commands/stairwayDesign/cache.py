@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+# ------------------------------------------------------------------------------
+# Bounded LRU cache of the compute results (no adsk import)
+# ------------------------------------------------------------------------------
+
+KEY_DIGITS = 6      # rounding of the float values in the keys (cm)
+
+# ------------------------------------------------------------------------------
+
+def makeCacheKey( values: list, digits: int = KEY_DIGITS ) -> tuple:
+    "Canonical tuple of values, the floats are rounded to be stable between two inputs"
+
+    return tuple( round( value, digits )  if( isinstance( value, float ) )  else value for value in values )
+
+
+class LRUCache:
+
+    def __init__( self, maxSize: int = 32 ):
+
+        self.maxSize: int         = maxSize
+        self.items: OrderedDict   = OrderedDict()
+        self.hits: int            = 0
+        self.misses: int          = 0
+
+    # ------------------------------------------------------------------------------
+
+    def get( self, key: tuple ):
+
+        if key not in self.items:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.items.move_to_end( key )
+
+        return self.items[ key ]
+
+
+    def put( self, key: tuple, value ) -> bool:
+
+        self.items[ key ] = value
+        self.items.move_to_end( key )
+
+        # remove the least recently used
+
+        while len( self.items ) > self.maxSize:
+            self.items.popitem( last = False )
+
+        return True
+
+
+    def clear( self ) -> bool:
+
+        self.items.clear()
+        self.hits   = 0
+        self.misses = 0
+
+        return True
@@ -0,0 +1,472 @@
+import math
+import threading
+import traceback
+
+from ...lib.fusion360custom.geometry2d import *
+from ...lib.fusion360custom.intersect  import *
+from ...lib.fusion360custom.walkpath   import *
+
+from .balancing import *
+
+# ------------------------------------------------------------------------------
+# Compute of the steps on analytic walkpaths in a worker thread (pure python, no adsk import)
+# The paths are given by name 'Walk', 'Inside' and 'Outside', an entry of a step is the tuple
+# ( x, y, curveId, distance, crosswise line ( x1, y1, x2, y2 ) ) of StairwayDesign.packStepEntry()
+# ------------------------------------------------------------------------------
+
+def computeStepsPacked( walkPaths: dict, values: dict ) -> tuple:
+    "Return the steps in the format of StairwayDesign.packComputeResult()"
+
+    walkSteps      = computeWalkStepsPacked( walkPaths[ 'Walk' ], values )
+    radiatingSteps = computeRadiatingStepsPacked( walkPaths, walkSteps )
+
+    # ------------------------------------------------------------------------------
+
+    radiatingStepsOverlap = {}
+    radiatingStepsRiser   = {}
+    radiatingStepsBack    = {}
+
+    if values[ 'isOverlap' ]:
+        radiatingStepsOverlap = computeParallelStepsPacked( walkPaths, radiatingSteps, -values[ 'overlapLength' ], values )
+
+    if values[ 'isRiser' ]:
+        radiatingStepsRiser   = computeParallelStepsPacked( walkPaths, radiatingSteps, values[ 'riserThickness' ], values )
+        radiatingStepsBack    = computeParallelStepsPacked( walkPaths, radiatingSteps, values[ 'riserRabbet' ], values )
+
+    # ------------------------------------------------------------------------------
+
+    balancingSteps        = {}
+    balancingStepsOverlap = {}
+    balancingStepsRiser   = {}
+    balancingStepsBack    = {}
+
+    if values[ 'isBalancing' ]:
+
+        balancingSteps = computeBalancingStepsPacked( walkPaths, radiatingSteps, values )
+
+        if values[ 'isOverlap' ]:
+            balancingStepsOverlap = computeParallelStepsPacked( walkPaths, balancingSteps, -values[ 'overlapLength' ], values )
+
+        if values[ 'isRiser' ]:
+            balancingStepsRiser   = computeParallelStepsPacked( walkPaths, balancingSteps, values[ 'riserThickness' ], values )
+            balancingStepsBack    = computeParallelStepsPacked( walkPaths, balancingSteps, values[ 'riserRabbet' ], values )
+
+    # ------------------------------------------------------------------------------
+
+    return (
+        tuple( walkSteps.items() ),
+        packNamedSteps( radiatingSteps ),
+        packNamedSteps( radiatingStepsOverlap ),
+        packNamedSteps( radiatingStepsRiser ),
+        packNamedSteps( radiatingStepsBack ),
+        packNamedSteps( balancingSteps ),
+        packNamedSteps( balancingStepsOverlap ),
+        packNamedSteps( balancingStepsRiser ),
+        packNamedSteps( balancingStepsBack )
+    )
+
+
+def packNamedSteps( steps: dict ) -> tuple:
+
+    return tuple( ( step, tuple( stepData.items() ) ) for step, stepData in steps.items() )
+
+# ------------------------------------------------------------------------------
+
+def computeWalkStepsPacked( walkPath: WalkPath, values: dict ) -> dict:
+    "Same as StairwayDesign.computeWalkSteps(), entry by step"
+
+    data: dict = {}
+
+    for step in range( 0, values[ 'stepNumber' ] + 1 ):
+
+        walkDistance = min( ( values[ 'stepGoing' ] * step ) + values[ 'startLength' ], values[ 'totalLength' ] )
+
+        ( isFound, point, curveId, tangent ) = walkPath.getDataAtLength( walkDistance )
+
+        if not isFound:
+            continue
+
+        # crosswise line : the tangent rotated by 90° around Z
+
+        crosswise = ( point[ 0 ], point[ 1 ], point[ 0 ] - tangent[ 1 ], point[ 1 ] + tangent[ 0 ] )
+
+        data[ step ] = ( point[ 0 ], point[ 1 ], curveId, walkDistance, crosswise )
+
+    return data
+
+
+def computeRadiatingStepsPacked( walkPaths: dict, walkSteps: dict ) -> dict:
+    "Same as StairwayDesign.computeRadiatingSteps(), { 'Walk', 'Inside', 'Outside' } by step"
+
+    data: dict = {}
+
+    for step, walkEntry in walkSteps.items():
+
+        ( x1, y1, x2, y2 ) = walkEntry[ 4 ]
+
+        stepData: dict = { 'Walk': walkEntry }
+
+        for name in [ 'Inside', 'Outside' ]:
+
+            ( isFound, point, curveId, length ) = intersectLineWalkPath2D( ( x1, y1 ), ( x2, y2 ), walkPaths[ name ] )
+
+            if not isFound:
+                break
+
+            stepData[ name ] = ( point[ 0 ], point[ 1 ], curveId, length, None )
+
+        if len( stepData ) == 3:
+            data[ step ] = stepData
+
+    return data
+
+
+def computeParallelStepsPacked( walkPaths: dict, steps: dict, offset: float, values: dict ) -> dict:
+    "Same as StairwayDesign.computeParallelSteps(), an entry is None if the offset line does not cross the path"
+
+    # WORKAROUND to compute parallel
+
+    if values[ 'stairAngle' ] < 0:
+        offset *= -1
+
+    # ------------------------------------------------------------------------------
+
+    stepLines = [ ( ( stepData[ 'Walk' ][ 0 ], stepData[ 'Walk' ][ 1 ] ), ( stepData[ 'Inside' ][ 0 ], stepData[ 'Inside' ][ 1 ] ) ) for stepData in steps.values() ]
+
+    data: dict = {}
+
+    for step, offsetLine in zip( steps.keys(), offsetStepLines2D( stepLines, offset ) ):
+
+        if offsetLine == None:
+            continue
+
+        ( x1, y1, x2, y2 ) = offsetLine
+
+        stepData: dict = {}
+
+        for name in [ 'Walk', 'Inside', 'Outside' ]:
+
+            ( isFound, point, curveId, _ ) = intersectLineWalkPath2D( ( x1, y1 ), ( x2, y2 ), walkPaths[ name ] )
+
+            stepData[ name ] = ( point[ 0 ], point[ 1 ], curveId, None, None )  if( isFound )  else None
+
+        data[ step ] = stepData
+
+    return data
+
+# ------------------------------------------------------------------------------
+
+def computeBalancingStepsPacked( walkPaths: dict, radiatingSteps: dict, values: dict ) -> dict:
+    "Same as StairwayDesign.computeBalancingStepsAll()"
+
+    balancingSteps: dict = {}
+
+    if not( 0 in radiatingSteps and values[ 'stepNumber' ] in radiatingSteps ):
+        return dict( radiatingSteps )
+
+    # balanced steps on 1st string
+
+    computeBalancingSectionPacked(
+        walkPaths,
+        radiatingSteps,
+        balancingSteps,
+
+        0, # start
+        - values[ 'stairAngle' ] + values[ 'flightBalanceDelta' ],
+        values[ 'flightBalanceProp1' ],
+        False,
+        values
+    )
+
+    # balanced steps on 2nd string
+
+    if values[ 'symmetryAxis' ] != None:
+        mirrorBalancingStepsPacked( walkPaths, balancingSteps, values )
+
+    else:
+        computeBalancingSectionPacked(
+            walkPaths,
+            radiatingSteps,
+            balancingSteps,
+
+            values[ 'stepNumber' ], # end
+            - values[ 'stairAngle' ] - values[ 'flightBalanceDelta' ],
+            values[ 'flightBalanceProp2' ],
+            True,
+            values
+        )
+
+    # not balanced steps with radial steps
+
+    for step, radiatingStep in radiatingSteps.items():
+
+        if step not in balancingSteps.keys():
+            balancingSteps[ step ] = radiatingStep
+
+    return balancingSteps
+
+
+def getLengthOnCurve( walkPath: WalkPath, entry: tuple ) -> tuple:
+    "Return ( length from the start of the curve in its own direction, length of the curve ) at the point of an entry"
+
+    ( x, y, curveId, _, _ ) = entry
+
+    segment = walkPath.segments[ curveId ]
+    length  = segment.getLengthAtPoint( ( x, y ) )
+
+    if walkPath.isReversed[ curveId ]:
+        length = segment.length - length
+
+    return ( length, segment.length )
+
+
+def computeBalancingSectionPacked(
+        walkPaths:         dict,
+        radiatingSteps:    dict,
+        balancingSteps:    dict,
+
+        stepStartIndex:    int,
+        stairAngle:        float,
+        balanceProportion: int,
+        isReverse:         bool,
+        values:            dict
+    ):
+    "Same as StairwayDesign.computeBalancingStepsSection()"
+
+    data: dict = radiatingSteps[ stepStartIndex ]
+    stepGoing  = values[ 'stepGoing' ]
+
+    ( walkLength, walkCurveLength )     = getLengthOnCurve( walkPaths[ 'Walk' ],   data[ 'Walk' ] )
+    ( insideLength, insideCurveLength ) = getLengthOnCurve( walkPaths[ 'Inside' ], data[ 'Inside' ] )
+
+    if not isReverse:
+        walkLengthLeft   = walkCurveLength   - walkLength
+        insideLengthLeft = insideCurveLength - insideLength
+
+    else:
+        walkLengthLeft   = walkLength
+        insideLengthLeft = insideLength
+
+    # ------------------------------------------------------------------------------
+
+    walkOffsetBalanceR      = walkLengthLeft * ( 1 - balanceProportion / 100 )
+    walkOffsetBalanceStep   = int( walkOffsetBalanceR / stepGoing )
+    walkOffsetBalance       = walkOffsetBalanceStep * stepGoing
+    walkLengthToBalance     = walkLengthLeft - walkOffsetBalance
+
+    insideOffsetBalanceR    = insideLengthLeft * ( 1 - balanceProportion / 100 )
+    insideOffsetBalanceStep = int( insideOffsetBalanceR / stepGoing )
+    insideOffsetBalance     = insideOffsetBalanceStep * stepGoing
+
+    # ------------------------------------------------------------------------------
+
+    balanceAngle        = math.fabs( stairAngle / 2 )
+    harrowBalancedSteps = computeHarrowBalancing( stepGoing, values[ 'walkpathMaxiRadius' ], values[ 'insideRadius' ], walkLengthToBalance, balanceAngle )
+
+    for step, isStepLine in enumerate( harrowBalancedSteps[ 'IsStepLine' ] ):
+
+        if not isStepLine:
+            continue
+
+        insideB = harrowBalancedSteps[ 'Inside' ][ step ]
+        walkB   = harrowBalancedSteps[ 'Walk' ]  [ step ]
+
+        if not isReverse:
+            stepIndex = stepStartIndex + step + 1 + walkOffsetBalanceStep
+            walkL     = data[ 'Walk' ][ 3 ]   + ( walkOffsetBalance   + walkB )
+            insideL   = data[ 'Inside' ][ 3 ] + ( insideOffsetBalance + insideB )
+
+        else:
+            stepIndex = stepStartIndex - step - 1 - walkOffsetBalanceStep
+            walkL     = data[ 'Walk' ][ 3 ]   - ( walkOffsetBalance   + walkB )
+            insideL   = data[ 'Inside' ][ 3 ] - ( insideOffsetBalance + insideB )
+
+        if stepIndex in balancingSteps.keys():
+            continue
+
+        # the step line (inside -> walkpath) to the outside
+
+        ( isInside, insidePoint, insideCurveId, _ ) = walkPaths[ 'Inside' ].getDataAtLength( insideL )
+        ( isWalk,   walkPoint,   walkCurveId,   _ ) = walkPaths[ 'Walk' ].getDataAtLength( walkL )
+
+        if not( isInside and isWalk ):
+            continue
+
+        ( isFound, outsidePoint, outsideCurveId, _ ) = intersectLineWalkPath2D( insidePoint, walkPoint, walkPaths[ 'Outside' ] )
+
+        if isFound:
+
+            balancingSteps[ stepIndex ] = {
+                'Walk':    ( walkPoint[ 0 ],    walkPoint[ 1 ],    walkCurveId,    None, None ),
+                'Inside':  ( insidePoint[ 0 ],  insidePoint[ 1 ],  insideCurveId,  None, None ),
+                'Outside': ( outsidePoint[ 0 ], outsidePoint[ 1 ], outsideCurveId, None, None )
+            }
+
+
+def mirrorBalancingStepsPacked( walkPaths: dict, balancingSteps: dict, values: dict ):
+    "Same as StairwayDesign.mirrorBalancingSteps()"
+
+    ( axisPoint, axisNormal ) = values[ 'symmetryAxis' ]
+
+    for step, balancingStep in list( balancingSteps.items() ):
+
+        mirrorStep = values[ 'stepNumber' ] - step
+
+        if mirrorStep in balancingSteps.keys():
+            continue
+
+        mirrorData: dict = {}
+
+        for name, walkPath in walkPaths.items():
+
+            ( x, y )          = reflectPoint2D( balancingStep[ name ][ :2 ], axisPoint, axisNormal )
+            length            = walkPath.getLengthAtPoint( ( x, y ) )
+            ( _, curveId, _ ) = walkPath.getSegmentFromLength( length )
+
+            mirrorData[ name ] = ( x, y, curveId, length, None )
+
+        balancingSteps[ mirrorStep ] = mirrorData
+
+
+# ------------------------------------------------------------------------------
+# Worker thread
+# ------------------------------------------------------------------------------
+
+class ComputeWorker:
+    """Run the computes one at a time in a worker thread, only the last submitted compute is kept.
+    onDone( generation ) is called in the worker thread : it must only post an event to the main thread"""
+
+    def __init__( self, onDone = None ):
+
+        self.onDone                      = onDone
+        self.generation: int             = 0          # incremented by each submit, older results are stale
+        self.job: tuple                  = None       # ( generation, key, function, args ) waiting for the thread
+        self.running: tuple              = None       # ( generation, key ) of the compute in progress
+        self.result: tuple               = None       # ( generation, key, result ) of the last compute
+        self.failedKeys: set             = set()      # computes raising an error, done in the main thread
+        self.errors: list                = []         # tracebacks of the errors, logged by the main thread
+        self.isStopped: bool             = False
+
+        self.condition                   = threading.Condition()
+        self.thread: threading.Thread    = None
+
+    # ------------------------------------------------------------------------------
+
+    def submit( self, key: tuple, function, *args ) -> bool:
+        "Compute function( *args ) in the thread, False if this compute failed before"
+
+        with self.condition:
+
+            if key in self.failedKeys:
+                return False
+
+            # already in progress
+
+            if self.running == ( self.generation, key ) or ( self.job != None and self.job[ 1 ] == key ):
+                return True
+
+            self.generation += 1
+            self.job        = ( self.generation, key, function, args )
+            self.isStopped  = False
+
+            if self.thread == None or not self.thread.is_alive():
+                self.thread = threading.Thread( target = self.run, daemon = True )
+                self.thread.start()
+
+            self.condition.notify()
+
+        return True
+
+
+    def run( self ):
+
+        while True:
+
+            with self.condition:
+
+                while self.job == None and not self.isStopped:
+                    self.condition.wait()
+
+                if self.isStopped:
+                    return
+
+                ( generation, key, function, args ) = self.job
+
+                self.job     = None
+                self.running = ( generation, key )
+
+            # ------------------------------------------------------------------------------
+
+            try:
+                result = function( *args )
+
+            except Exception:
+                result = None
+
+                with self.condition:
+                    self.errors.append( traceback.format_exc() )
+
+            # ------------------------------------------------------------------------------
+
+            with self.condition:
+
+                self.running = None
+
+                if result == None:
+                    self.failedKeys.add( key )
+
+                # a newer compute was submitted or the worker was cancelled
+
+                if generation != self.generation:
+                    continue
+
+                self.result = ( generation, key, result )
+
+            if self.onDone != None:
+                self.onDone( generation )
+
+
+    def take( self, generation: int ) -> tuple:
+        "Return ( key, result ) of the compute, None if it is stale or already taken"
+
+        with self.condition:
+
+            if self.result == None or self.result[ 0 ] != generation or generation != self.generation:
+                return None
+
+            ( _, key, result ) = self.result
+            self.result        = None
+
+        return ( key, result )
+
+
+    def takeErrors( self ) -> list:
+        "Return the tracebacks of the computes failed since the last call"
+
+        with self.condition:
+            ( errors, self.errors ) = ( self.errors, [] )
+
+        return errors
+
+
+    def cancel( self ) -> bool:
+        "The compute in progress becomes stale"
+
+        with self.condition:
+            self.generation += 1
+            self.job         = None
+            self.result      = None
+
+        return True
+
+
+    def stop( self ) -> bool:
+
+        with self.condition:
+            self.generation += 1
+            self.job         = None
+            self.result      = None
+            self.isStopped   = True
+            self.condition.notify()
+
+        return True
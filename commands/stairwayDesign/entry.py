@@ -117,6 +117,18 @@ def command_created( args: adsk.core.CommandCreatedEventArgs ):
     futil.add_handler( args.command.execute,        command_execute,        local_handlers = local_handlers )
     futil.add_handler( args.command.destroy,        command_destroy,        local_handlers = local_handlers )
 
+    # Custom event to fire the full preview when the inputs are settled
+
+    app.unregisterCustomEvent( StairwayDesign.PREVIEW_EVENT_ID )
+    preview_settled = app.registerCustomEvent( StairwayDesign.PREVIEW_EVENT_ID )
+    futil.add_handler( preview_settled,             command_preview_settled, local_handlers = local_handlers )
+
+    # Custom event to draw the steps computed in the worker thread
+
+    app.unregisterCustomEvent( StairwayDesign.COMPUTE_EVENT_ID )
+    compute_done = app.registerCustomEvent( StairwayDesign.COMPUTE_EVENT_ID )
+    futil.add_handler( compute_done,                command_compute_done,    local_handlers = local_handlers )
+
     # -----------------------------------------------------------------------------------
 
     stairway.eventCreated( args )
@@ -157,6 +169,28 @@ def command_preview( args: adsk.core.CommandEventArgs ):
     stairway.eventPreview( args )
 
 
+def command_preview_settled( args: adsk.core.CustomEventArgs ):
+    "This event handler is called when the inputs are settled after a draft preview."
+
+    futil.log( f' ' )
+    futil.log( f'{CMD_NAME} : command_preview_settled()' )
+
+    # -----------------------------------------------------------------------------------
+
+    stairway.eventPreviewSettled( args )
+
+
+def command_compute_done( args: adsk.core.CustomEventArgs ):
+    "This event handler is called when the steps are computed in the worker thread."
+
+    futil.log( f' ' )
+    futil.log( f'{CMD_NAME} : command_compute_done()' )
+
+    # -----------------------------------------------------------------------------------
+
+    stairway.eventComputeDone( args )
+
+
 def command_execute( args: adsk.core.CustomEventArgs ):
     "This event handler is called when the user clicks the OK button in the command dialog or is immediately called after the created event not command inputs were created for the dialog."
 
@@ -179,6 +213,9 @@ def command_destroy( args: adsk.core.CommandEventArgs ):
     global local_handlers
     local_handlers = []
 
+    app.unregisterCustomEvent( StairwayDesign.PREVIEW_EVENT_ID )
+    app.unregisterCustomEvent( StairwayDesign.COMPUTE_EVENT_ID )
+
     # -----------------------------------------------------------------------------------
 
     stairway.eventDestroy( args )
@@ -0,0 +1,87 @@
+import threading
+import time
+
+# ------------------------------------------------------------------------------
+# Coalesce the previews while the inputs are changing (no adsk import)
+# The clock and the timer can be replaced to test without Fusion
+# ------------------------------------------------------------------------------
+
+def startThreadingTimer( delay: float, callback ):
+    "Call back after a delay (s) in a thread, return the timer to cancel"
+
+    timer = threading.Timer( delay, callback )
+    timer.daemon = True
+    timer.start()
+
+    return timer
+
+
+class PreviewScheduler:
+
+    def __init__( self,
+            quietPeriod: float = 0.3,
+            onSettled          = None,
+            clock              = time.monotonic,
+            startTimer         = startThreadingTimer
+        ):
+
+        self.quietPeriod: float     = quietPeriod   # (s) without input change before the full preview
+        self.onSettled              = onSettled     # called when the inputs are settled after a draft preview
+        self.clock                  = clock
+        self.startTimer             = startTimer
+
+        self.previousChangeTime     = None
+        self.lastChangeTime         = None
+        self.timer                  = None
+
+    # ------------------------------------------------------------------------------
+
+    def inputChanged( self ) -> bool:
+
+        self.previousChangeTime = self.lastChangeTime
+        self.lastChangeTime     = self.clock()
+
+        return True
+
+
+    def isSettled( self ) -> bool:
+        "True if the last change is alone (not in a burst of changes) or older than the quiet period"
+
+        if self.lastChangeTime == None:
+            return True
+
+        if self.previousChangeTime == None or self.lastChangeTime - self.previousChangeTime >= self.quietPeriod:
+            return True
+
+        return self.clock() - self.lastChangeTime >= self.quietPeriod
+
+
+    def schedule( self ) -> bool:
+        "Call onSettled at the end of the quiet period, the previous call is cancelled"
+
+        self.cancel()
+
+        delay = max( self.quietPeriod - ( self.clock() - self.lastChangeTime ), 0 )  if( self.lastChangeTime != None )  else 0
+
+        self.timer = self.startTimer( delay, self.fire )
+
+        return True
+
+
+    def fire( self ):
+
+        self.timer = None
+
+        if self.onSettled != None:
+            self.onSettled()
+
+
+    def cancel( self ) -> bool:
+
+        if self.timer == None:
+            return False
+
+        self.timer.cancel()
+        self.timer = None
+
+        return True
@@ -0,0 +1,126 @@
+# ------------------------------------------------------------------------------
+# Dependency graph of the preview stages (no adsk import)
+# ------------------------------------------------------------------------------
+
+STAGES = [
+    'outline',              # draw the stairway sketch 2D
+    'curves',               # connected curves of the walkpath, inside and outside strings
+    'walkpath_values',      # start length, total length, walkpath length
+    'step_values',          # optimal step number, step going, step height
+    'walk_steps',           # points on the walkpath
+    'radiating_steps',      # radiating step lines
+    'parallel_steps',       # overlap, riser and back lines of the radiating steps
+    'balancing_steps'       # balancing step lines with their overlap, riser and back lines
+]
+
+# first stage invalidated by each input (None : no effect on the preview 2D)
+
+INPUT_STAGES = {
+
+    # TAB1 -------------------------------------------------------------------------
+
+    'stair_height':          'step_values',
+    'stair_width':           'outline',
+    'walkpath_radius':       'outline',
+    'inside_radius':         'outline',
+    'stair_angle':           'outline',
+
+    'stair_group':           None,
+    'step_number':           'step_values',
+    'stair_thickness':       None,
+    'front_reserve_length':  'walkpath_values',
+
+    'is_overlap':            'walkpath_values',
+    'overlap_length':        'walkpath_values',
+    'is_overlap_last':       None,
+
+    'is_riser':              'parallel_steps',
+    'riser_thickness':       'parallel_steps',
+    'riser_groove':          None,
+    'riser_rabbet':          'parallel_steps',
+
+    'is_preview_radiating':  None,
+    'is_preview_balancing':  None,
+    'preview_time_budget':   None,
+    'preview_status':        None,
+
+    'flight_group':          None,
+    'flight_length_1':       'outline',
+    'flight_balance_prop_1': 'balancing_steps',
+    'flight_length_2':       'outline',
+    'flight_balance_prop_2': 'balancing_steps',
+    'flight_balance_delta':  'balancing_steps',
+
+    # TAB2 -------------------------------------------------------------------------
+
+    'is_create_steps':        None,
+    'is_create_risers':       None,
+    'is_engrave_reference':   None,
+    'is_fast_build':          None,
+
+    'is_create_stair_layout': None,
+    'flat_modulo':            None,
+    'flat_origin_x':          None,
+    'flat_origin_y':          None,
+    'flat_space_x':           None,
+    'flat_space_y':           None
+}
+
+# ------------------------------------------------------------------------------
+
+class StageGraph:
+
+    def __init__( self, stages: list = STAGES ):
+
+        self.stages: list = list( stages )
+        self.dirty: set   = set( self.stages )      # all stages need to be computed at start
+
+    # ------------------------------------------------------------------------------
+
+    def getDownstreamStages( self, stage: str ) -> list:
+        "The stage and all the stages depending on it"
+
+        return self.stages[ self.stages.index( stage ): ]
+
+
+    def invalidate( self, stage: str ) -> bool:
+
+        if stage not in self.stages:
+            return False
+
+        self.dirty.update( self.getDownstreamStages( stage ) )
+
+        return True
+
+
+    def invalidateAll( self ) -> bool:
+
+        self.dirty = set( self.stages )
+
+        return True
+
+
+    def invalidateFromInput( self, inputId: str ) -> bool:
+        "Invalidate the stages affected by an input, all the stages if the input is unknown"
+
+        if inputId not in INPUT_STAGES:
+            return self.invalidateAll()
+
+        stage = INPUT_STAGES[ inputId ]
+
+        if stage == None:
+            return False
+
+        return self.invalidate( stage )
+
+
+    def isDirty( self, stage: str ) -> bool:
+
+        return stage in self.dirty
+
+
+    def setClean( self, stage: str ) -> bool:
+
+        self.dirty.discard( stage )
+
+        return True
@@ -1,9 +1,19 @@
 import adsk.core, adsk.fusion
 import math
+import time
 
 from ...lib import fusion360utils as futil
-from ...lib.fusion360custom.misc   import *
-from ...lib.fusion360custom.fields import *
+from ...lib.fusion360custom.misc       import *
+from ...lib.fusion360custom.fields     import *
+from ...lib.fusion360custom.geometry2d import *
+from ...lib.fusion360custom.intersect  import *
+from ...lib.fusion360custom.walkpath   import *
+
+from .balancing import *
+from .cache     import *
+from .compute   import *
+from .scheduler import *
+from .stages    import *
 
 # ------------------------------------------------------------------------------
 
@@ -11,6 +21,23 @@ class StairwayDesign:
 
     IS_EVENT_PREVIEW_ONLY       = False   # (for developement) don't execute 'eventExecute' if True, then only preview 2D Sketch
     IS_AUTO_CAMERA_FIT          = True
+    IS_SYMMETRIC_BALANCING      = True    # compute the 2nd balanced section by reflection of the 1st one if the stair is symmetric (only without front reserve : start_length = 0)
+    COMPUTE_CACHE_SIZE          = 32      # number of compute results kept during the command (LRU)
+    IS_DIRECT_OFFSET            = True    # draw the inside string and the walkpath with computed lines and arcs instead of sketch offset and fillets
+    IS_CUSTOM_GRAPHICS_PREVIEW  = True    # draw the steps of the preview with custom graphics instead of sketch points and lines
+    IS_RETAINED_GRAPHICS        = True    # update the custom graphics of the previous preview in place instead of drawing them again
+    IS_PREVIEW_SCHEDULER        = True    # draw a draft preview (outline + walk points) while the inputs are changing quickly
+    PREVIEW_QUIET_PERIOD        = 0.3     # (s) without input change before the full preview
+    PREVIEW_EVENT_ID            = 'Stairway360_preview_settled'
+    PREVIEW_LAYERS              = [ 'dimensions', 'radiating', 'riser' ]   # layers of the preview dropped in this order when over the time budget
+    PREVIEW_RECOVER_RATIO       = 0.5     # a dropped layer is drawn again when the preview takes less than this ratio of the time budget
+    IS_COMPUTE_WORKER           = True    # compute the steps on lines and arcs in a worker thread, the preview is fired again when done
+    COMPUTE_EVENT_ID            = 'Stairway360_compute_done'
+
+    IS_SHARED_STEPS             = True    # build the identical steps once, the others are occurrences of the same component
+    SHARED_STEPS_DIGITS         = 4       # rounding of the step outlines (cm) to detect the identical steps
+    ATTRIBUTES_GROUP            = 'Stairway360'
+    IS_BREP_BODIES              = True    # build the bodies of the steps and risers from their outline in a base feature instead of a sketch and an extrude
 
     IS_READ_PARAMETERS          = False
     IS_STORE_PARAMETERS         = False
@@ -32,6 +59,7 @@ class StairwayDesign:
             self.stairAngle: float              = None       # data for flight group
             self.isPreviewRadiating: bool       = None
             self.isPreviewBalancing: bool       = None
+            self.previewTimeBudget: int         = None       # (ms) 0 for no limit
             # ------------------------------------------------------------------------------
             self.stepNumber: int                = None
             self.stepNumberMini: int            = None
@@ -67,6 +95,7 @@ class StairwayDesign:
             self.isCreateSteps: bool            = None
             self.isCreateRisers: bool           = None
             self.isEngraveReference: bool       = None
+            self.isFastBuild: bool              = None
             # ------------------------------------------------------------------------------
             self.isCreateStairLayout: bool      = None
             self.flatModulo                     = None
@@ -84,6 +113,10 @@ class StairwayDesign:
             self.walkCurvesSKT: list            = []
             self.insideCurvesSKT: list          = []
             self.outsideCurvesSKT: list         = []
+            self.walkPaths: dict                = {}       # analytic walkpaths by curves id (None if not lines and arcs)
+            self.curveIndexes: dict             = {}       # cumulative lengths of curves by curves id
+            self.bigNurbsCurves: dict           = {}       # merged nurbs curve and parameter extents by curves id
+            self.curveChains: dict              = {}       # orientation of the connected curves by curves id
             # ------------------------------------------------------------------------------
             self.walkSteps: dict                = {}
             # ------------------------------------------------------------------------------
@@ -97,6 +130,17 @@ class StairwayDesign:
             self.balancingStepsRiser: dict      = {}
             self.balancingStepsBack: dict       = {}
             # ------------------------------------------------------------------------------
+            self.stages: StageGraph             = None     # stages of the preview to compute again
+            self.computeCache: LRUCache         = None     # compute results by design parameters
+            self.previewProduct: tuple          = None     # ( compute key, compute result ) of the last preview
+            self.previewGraphics: adsk.fusion.CustomGraphicsGroup = None    # steps drawn in the preview
+            self.previewGraphicsItems: dict     = {}       # ( entity, coordinates ) of the preview graphics by layer 'Lines', 'Construction', 'Points'
+            self.previewScheduler: PreviewScheduler = None # full preview when the inputs are settled
+            self.previewSkipCount: int          = 0        # number of PREVIEW_LAYERS dropped to keep the preview in the time budget
+            self.previewTimes: dict             = {}       # (ms) duration of the stages of the last preview
+            self.computeWorker: ComputeWorker   = None     # compute of the steps out of the main thread
+            self.command: adsk.core.Command     = None
+            # ------------------------------------------------------------------------------
             self.stairs: dict                   = {}
             # ------------------------------------------------------------------------------
             self.stairwayOccurence:         adsk.fusion.Occurrence = None # the main occurence
@@ -104,6 +148,8 @@ class StairwayDesign:
             self.stairLayoutOccurence:      adsk.fusion.Occurrence = None # the stair layout occurence child of the main occurence
             self.stepsGroupOccurence:       adsk.fusion.Occurrence = None
             self.risersGroupOccurence:      adsk.fusion.Occurrence = None
+            self.fastBuildSteps: list           = []       # ( reference, temporary body ) of the steps built in one base feature (fast build)
+            self.fastBuildRisers: list          = []       # ( reference, temporary body ) of the risers built in one base feature (fast build)
 
         # ------------------------------------------------------------------------------
         # init class field
@@ -201,6 +247,27 @@ class StairwayDesign:
                 # 'resourceFolder':   '',
             },
 
+            'preview_time_budget': {
+                'label':            'Budget prévisu. (ms)',
+                'tooltip':          'Temps maximum de la prévisualisation en millisecondes (0 = sans limite)',
+                'description':      'Au delà, les cotes puis les marches rayonnantes puis les contremarches ne sont plus prévisualisées.',
+                'value':            500,
+                'unit':             '',
+                'mini':             0,
+                'isMiniLimited':    True,
+                'isMiniInclusive':  True,
+            },
+
+            'preview_status': {
+                'label':            'Prévisualisation',
+                'tooltip':          'Durée de la dernière prévisualisation et éléments non dessinés',
+                'description':      '',
+                'value':            '',
+                'unit':             '',
+                'numRows':          1,
+                'isReadOnly':       True,
+            },
+
 
             # ------------------------------------------------------------------------------
             'is_overlap': {
@@ -526,6 +593,16 @@ class StairwayDesign:
                 'resourceFolder':   '',   # resources/switch3-blue
             },
 
+            'is_fast_build': {
+                'label':            'Génération rapide ?',
+                'tooltip':          'Générer les marches et contremarches comme simples corps, tous dans une seule fonction de base par composant : sans sous-composants, esquisses ni gravure. L\'historique du document est conservé',
+                'description':      '',
+                'value':            False,
+                'unit':             'bool',
+                'isCheckBox':       True,
+                'resourceFolder':   '',
+            },
+
 
             # ------------------------------------------------------------------------------
             'is_create_stair_layout': {
@@ -647,6 +724,7 @@ class StairwayDesign:
         # -----------------------------------------------------------------------------------
 
         self.inputs: adsk.core.CommandInputs = eventArgs.command.commandInputs
+        self.command: adsk.core.Command      = eventArgs.command
 
         # -----------------------------------------------------------------------------------
 
@@ -709,6 +787,10 @@ class StairwayDesign:
         self.walkCurvesSKT: list            = []
         self.insideCurvesSKT: list          = []
         self.outsideCurvesSKT: list         = []
+        self.walkPaths: dict                = {}
+        self.curveIndexes: dict             = {}
+        self.bigNurbsCurves: dict           = {}
+        self.curveChains: dict              = {}
         self.walkSteps: dict                = {}
         self.radiatingSteps: dict           = {}
         self.radiatingStepsOverlap: dict    = {}
@@ -719,6 +801,14 @@ class StairwayDesign:
         self.balancingStepsRiser: dict      = {}
         self.balancingStepsBack: dict       = {}
         self.stairs: dict                   = {}
+        self.stages: StageGraph             = StageGraph()
+        self.computeCache: LRUCache         = LRUCache( self.COMPUTE_CACHE_SIZE )
+        self.previewProduct: tuple          = None
+        self.previewGraphicsItems: dict     = {}
+        self.previewScheduler               = PreviewScheduler( self.PREVIEW_QUIET_PERIOD, self.firePreviewSettled )
+        self.previewSkipCount: int          = 0
+        self.previewTimes: dict             = {}
+        self.computeWorker                  = ComputeWorker( self.fireComputeDone )
 
         # get default values
 
@@ -880,6 +970,10 @@ class StairwayDesign:
                 self.isPreviewBalancing      = self.inputs.itemById( input.id ).value
                 pass
 
+            case 'preview_time_budget':
+                self.previewTimeBudget       = int( round( self.inputs.itemById( input.id ).value ) )
+                self.previewSkipCount        = 0 # measure again with all the layers
+
             # ------------------------------------------------------------------------------
 
             case 'flight_group':
@@ -916,6 +1010,9 @@ class StairwayDesign:
             case 'is_engrave_reference':
                 self.isEngraveReference   = self.inputs.itemById( input.id ).value
 
+            case 'is_fast_build':
+                self.isFastBuild          = self.inputs.itemById( input.id ).value
+
             # ------------------------------------------------------------------------------
 
             case 'is_create_stair_layout':
@@ -943,6 +1040,13 @@ class StairwayDesign:
                 self.flatSpaceY           = self.inputs.itemById( input.id ).value
 
 
+        # ------------------------------------------------------------------------------
+
+        # invalidate the stages of the preview affected by the input
+
+        self.stages.invalidateFromInput( input.id )
+        self.previewScheduler.inputChanged()
+
         # ------------------------------------------------------------------------------
 
         flightLengthMinimum = self.computeFlightLengthMinimum()
@@ -964,13 +1068,34 @@ class StairwayDesign:
         if not( self.isPreviewEventAvailable ): # WORKAROUND
             return
 
+        if not self.IS_RETAINED_GRAPHICS:
+            self.deletePreviewGraphics()
+
+        # layers dropped to keep the preview in the time budget (measured on the previous previews)
+
+        skippedLayers = self.PREVIEW_LAYERS[ :self.previewSkipCount ]
+        stageTime     = time.perf_counter()
+
+        self.previewTimes.clear()
+
+        # draft preview while the inputs are changing, the full preview is fired when they are settled
+
+        isDraft = self.IS_PREVIEW_SCHEDULER and not self.previewScheduler.isSettled()
+
+        if isDraft:
+            self.previewScheduler.schedule()
+
         # ------------------------------------------------------------------------------
         # draw the stair
         # ------------------------------------------------------------------------------
 
+        # same outline as the previous preview (only step_number, overlap, riser... changed)
+
+        isOutlineChanged = self.stages.isDirty( 'outline' )
+
         self.sketch.isComputeDeferred = True
 
-        ( self.outsideLine, self.insideLine, self.walkLine ) = self.drawStairwaySketch2D( self.sketch, True )
+        ( self.outsideLine, self.insideLine, self.walkLine ) = self.drawStairwaySketch2D( self.sketch, True, isDimension = 'dimensions' not in skippedLayers )
 
         if self.isNeedCameraToFitView:
             self.cameraFitView()
@@ -984,13 +1109,29 @@ class StairwayDesign:
 
 
         self.checkSelectedLines()
-        self.getCurvesFromSelectedLines()
+        self.getCurvesFromSelectedLines( isOutlineChanged )
+
+        # the sketch is rolled back after each preview : outline and curves are always drawn again,
+        # then the steps computed before are bound to the new curves (same outline only : the curve ids
+        # of a changed outline do not match, its steps are computed again)
+
+        self.stages.setClean( 'outline' )
+        self.stages.setClean( 'curves' )
+
+        if isOutlineChanged:
+            self.clearSteps()
+        else:
+            self.rebindStepsCurves()
+
+        stageTime = self.measurePreviewStage( 'outline', stageTime )
 
         # ------------------------------------------------------------------------------
         # compute step distance & walkpath length & total length
         # ------------------------------------------------------------------------------
 
-        self.computeWalkpathValues()
+        if self.stages.isDirty( 'walkpath_values' ):
+            self.computeWalkpathValues()
+            self.stages.setClean( 'walkpath_values' )
 
         # ------------------------------------------------------------------------------
         # get the ideal step number associate to the closest blondel law value found
@@ -999,93 +1140,188 @@ class StairwayDesign:
         if self.isNeedToComputeStepNumber:
             self.computeStepNumberOptimal()
             self.isNeedToComputeStepNumber = False # one shot
+            self.stages.invalidate( 'step_values' )
 
 
         # ------------------------------------------------------------------------------
         # compute step
         # ------------------------------------------------------------------------------
 
-        self.computeStepValues()
-        self.displayStepNumberField()
-        self.displayAllWalkpathFields()
-        self.displayAllTextFieldsComputed()
+        if self.stages.isDirty( 'step_values' ):
+            self.computeStepValues()
+            self.displayStepNumberField()
+            self.displayAllWalkpathFields()
+            self.displayAllTextFieldsComputed()
+            self.stages.setClean( 'step_values' )
+
+        # ------------------------------------------------------------------------------
+        # get the steps from the cache if this configuration was already computed
+        # ------------------------------------------------------------------------------
+
+        computeKey    = None
+        computeStages = [ 'walk_steps', 'radiating_steps', 'parallel_steps', 'balancing_steps' ]
+
+        if any( self.stages.isDirty( stage ) for stage in computeStages ):
+
+            computeKey    = self.getComputeKey()
+            computeResult = self.computeCache.get( computeKey )
+
+            if computeResult != None:
+
+                self.unpackComputeResult( computeResult )
+                self.previewProduct = ( computeKey, computeResult )
+
+                for stage in computeStages:
+                    if stage != 'balancing_steps' or self.isPreviewBalancing:
+                        self.stages.setClean( stage )
+
+                computeKey = None # nothing to store
+
+                if isDraft:
+                    isDraft = False # nothing to compute
+                    self.previewScheduler.cancel()
+
+            futil.log( f' > computeCache : hits = {self.computeCache.hits} - misses = {self.computeCache.misses}' )
+
+        # ------------------------------------------------------------------------------
+        # compute the steps in the worker thread, they are drawn by the preview fired when done
+        # ------------------------------------------------------------------------------
+
+        if computeKey != None and not isDraft and self.IS_COMPUTE_WORKER:
+
+            if self.submitCompute( computeKey ):
+                isDraft    = True # draw the walk points until the steps are computed
+                computeKey = None
 
         # ------------------------------------------------------------------------------
         # compute WALK steps
         # ------------------------------------------------------------------------------
 
-        self.walkSteps = self.computeWalkSteps()
+        if self.stages.isDirty( 'walk_steps' ):
+            self.walkSteps = self.computeWalkSteps()
+            self.stages.setClean( 'walk_steps' )
 
         # ------------------------------------------------------------------------------
         # compute RADIATING steps
         # ------------------------------------------------------------------------------
 
-        self.radiatingSteps = self.computeRadiatingSteps( self.walkSteps )
-        self.radiatingStepsOverlap.clear()
-        self.radiatingStepsRiser.clear()
-        self.radiatingStepsBack.clear()
+        if not isDraft and self.stages.isDirty( 'radiating_steps' ):
+            self.radiatingSteps = self.computeRadiatingSteps( self.walkSteps )
+            self.stages.setClean( 'radiating_steps' )
 
-        if self.isOverlapStair():
-            self.radiatingStepsOverlap = self.computeParallelSteps( self.radiatingSteps, offset = -self.overlapLength )
+        if not isDraft and self.stages.isDirty( 'parallel_steps' ):
+
+            self.radiatingStepsOverlap.clear()
+            self.radiatingStepsRiser.clear()
+            self.radiatingStepsBack.clear()
 
-        if self.isRiserStair():
-            self.radiatingStepsRiser   = self.computeParallelSteps( self.radiatingSteps, offset = self.riserThickness )
-            self.radiatingStepsBack    = self.computeParallelSteps( self.radiatingSteps, offset = self.riserRabbet )
+            if self.isOverlapStair():
+                self.radiatingStepsOverlap = self.computeParallelSteps( self.radiatingSteps, offset = -self.overlapLength )
+
+            if self.isRiserStair():
+                self.radiatingStepsRiser   = self.computeParallelSteps( self.radiatingSteps, offset = self.riserThickness )
+                self.radiatingStepsBack    = self.computeParallelSteps( self.radiatingSteps, offset = self.riserRabbet )
+
+            self.stages.setClean( 'parallel_steps' )
 
         # ------------------------------------------------------------------------------
         # compute BALANCING steps
         # ------------------------------------------------------------------------------
 
-        if self.isPreviewBalancing:
+        if not isDraft and self.isPreviewBalancing and self.stages.isDirty( 'balancing_steps' ):
 
             self.balancingSteps = self.computeBalancingStepsAll( self.radiatingSteps )
             self.balancingStepsOverlap.clear()
             self.balancingStepsRiser.clear()
-            self.radiatingStepsBack.clear()
+            self.balancingStepsBack.clear()
 
             if self.isOverlapStair():
                 self.balancingStepsOverlap = self.computeParallelSteps( self.balancingSteps, offset = -self.overlapLength )
 
             if self.isRiserStair():
                 self.balancingStepsRiser   = self.computeParallelSteps( self.balancingSteps, offset = self.riserThickness )
-                self.radiatingStepsBack    = self.computeParallelSteps( self.balancingSteps, offset = self.riserRabbet )
+                self.balancingStepsBack    = self.computeParallelSteps( self.balancingSteps, offset = self.riserRabbet )
+
+            self.stages.setClean( 'balancing_steps' )
+
+        if computeKey != None and not isDraft:
+
+            computeResult = self.packComputeResult()
+
+            self.computeCache.put( computeKey, computeResult )
+            self.previewProduct = ( computeKey, computeResult )
+
+        stageTime = self.measurePreviewStage( 'compute', stageTime )
 
         # ------------------------------------------------------------------------------
         # draw RADIATING steps & BALANCING steps
         # ------------------------------------------------------------------------------
 
+        # already over the time budget : draw only the steps
+
+        if self.isOverPreviewTimeBudget():
+            skippedLayers = self.PREVIEW_LAYERS
+
+        layerSets: list  = []      # ( layer, steps, isConstruction )
+        pointSteps: dict = {}
+
         if self.isPreviewRadiating:
-            self.drawLineStepsSketch2D( self.radiatingSteps, True )
+            layerSets.append( ( 'radiating', self.radiatingSteps, True ) )
 
             if self.isOverlapStair():
-                self.drawLineStepsSketch2D( self.radiatingStepsOverlap, True )
+                layerSets.append( ( 'radiating', self.radiatingStepsOverlap, True ) )
 
             if self.isRiserStair():
-                self.drawLineStepsSketch2D( self.radiatingStepsRiser, True )
+                layerSets.append( ( 'radiating', self.radiatingStepsRiser, True ) )
 
         # ------------------------------------------------------------------------------
 
         if self.isPreviewBalancing:
 
             if self.isOverlapStair():
-                self.drawLineStepsSketch2D( self.balancingSteps, True )
-                self.drawLineStepsSketch2D( self.balancingStepsOverlap )
+                layerSets.append( ( 'steps', self.balancingSteps, True ) )
+                layerSets.append( ( 'steps', self.balancingStepsOverlap, False ) )
             else:
-                self.drawLineStepsSketch2D( self.balancingSteps )
+                layerSets.append( ( 'steps', self.balancingSteps, False ) )
 
             if self.isRiserStair():
-                self.drawLineStepsSketch2D( self.balancingStepsRiser, True )
-                self.drawLineStepsSketch2D( self.balancingStepsBack, True  )
+                layerSets.append( ( 'riser', self.balancingStepsRiser, True ) )
+                layerSets.append( ( 'riser', self.balancingStepsBack, True ) )
+
+        lineSets: list = [ ( steps, isConstruction ) for ( layer, steps, isConstruction ) in layerSets if layer not in skippedLayers ]
 
         # ------------------------------------------------------------------------------
 
         if not( self.isPreviewRadiating or self.isPreviewBalancing ):
-            self.drawPointStepsSketch2D( self.walkSteps )
+            pointSteps = self.walkSteps
+
+        if isDraft:
+            lineSets   = []
+            pointSteps = self.walkSteps
+
+        # ------------------------------------------------------------------------------
+
+        if self.IS_CUSTOM_GRAPHICS_PREVIEW:
+            self.drawStepsGraphics( lineSets, pointSteps )
+
+        else:
+            for ( steps, isConstruction ) in lineSets:
+                self.drawLineStepsSketch2D( steps, isConstruction )
+
+            if len( pointSteps ) > 0:
+                self.drawPointStepsSketch2D( pointSteps )
 
         # ------------------------------------------------------------------------------
 
         self.sketch.isComputeDeferred = False
 
+        self.measurePreviewStage( 'draw', stageTime )
+
+        if not isDraft:
+            self.updatePreviewSkipCount()
+
+        self.displayPreviewStatusField( skippedLayers )
+
         # ------------------------------------------------------------------------------
         # Set the isValidResult property to use these results at the final result.
         # This will result in the execute event not being fired.
@@ -1099,6 +1335,89 @@ class StairwayDesign:
         # ------------------------------------------------------------------------------
 
 
+    def measurePreviewStage( self, stage: str, startTime: float ) -> float:
+        "Store the duration (ms) of a stage of the preview, return the start time of the next stage"
+
+        currentTime = time.perf_counter()
+
+        self.previewTimes[ stage ] = ( currentTime - startTime ) * 1000
+
+        return currentTime
+
+
+    def isOverPreviewTimeBudget( self ) -> bool:
+
+        if not self.previewTimeBudget:
+            return False
+
+        return sum( self.previewTimes.values() ) > self.previewTimeBudget
+
+
+    def updatePreviewSkipCount( self ) -> None:
+        "Drop one more layer when the preview is over the time budget, draw it again when the preview is fast enough"
+
+        previewTime = sum( self.previewTimes.values() )
+
+        futil.log( f' > preview times (ms) : {self.previewTimes} - total = {previewTime:.0f}' )
+
+        if not self.previewTimeBudget:
+            self.previewSkipCount = 0
+
+        elif previewTime > self.previewTimeBudget:
+            self.previewSkipCount = min( self.previewSkipCount + 1, len( self.PREVIEW_LAYERS ) )
+
+        elif previewTime < self.previewTimeBudget * self.PREVIEW_RECOVER_RATIO:
+            self.previewSkipCount = max( self.previewSkipCount - 1, 0 )
+
+
+    def eventPreviewSettled( self, eventArgs: adsk.core.CustomEventArgs ):
+
+        futil.log( f' >>> eventPreviewSettled()' )
+
+        # ------------------------------------------------------------------------------
+
+        # fire the full preview
+
+        if self.command != None and self.command.isValid:
+            self.command.doExecutePreview()
+
+
+    def firePreviewSettled( self ):
+        "Called from the timer thread : the preview must be fired in the main thread by a custom event"
+
+        adsk.core.Application.get().fireCustomEvent( self.PREVIEW_EVENT_ID )
+
+
+    def eventComputeDone( self, eventArgs: adsk.core.CustomEventArgs ):
+
+        futil.log( f' >>> eventComputeDone( {eventArgs.additionalInfo} )' )
+
+        # ------------------------------------------------------------------------------
+
+        # the result is discarded if the inputs changed during the compute
+
+        product = self.computeWorker.take( int( eventArgs.additionalInfo ) )
+
+        if product == None:
+            return
+
+        ( computeKey, computeResult ) = product
+
+        # if the compute failed, the next preview computes in the main thread
+
+        if computeResult != None:
+            self.computeCache.put( computeKey, computeResult )
+
+        if self.command != None and self.command.isValid:
+            self.command.doExecutePreview()
+
+
+    def fireComputeDone( self, generation: int ):
+        "Called from the worker thread : the preview must be fired in the main thread by a custom event"
+
+        adsk.core.Application.get().fireCustomEvent( self.COMPUTE_EVENT_ID, str( generation ) )
+
+
     def eventExecute( self, eventArgs: adsk.core.CommandEventArgs ):
 
         futil.log( f' >>> eventExecute()' )
@@ -1117,6 +1436,10 @@ class StairwayDesign:
             ui.messageBox( 'Not initialized' )
             return False
 
+        self.deletePreviewGraphics()
+        self.previewScheduler.cancel()
+        self.computeWorker.cancel()
+
         # ------------------------------------------------------------------------------
         # draw stairway
         # ------------------------------------------------------------------------------
@@ -1127,44 +1450,56 @@ class StairwayDesign:
         self.getCurvesFromSelectedLines()
 
         # ------------------------------------------------------------------------------
-        # compute WALK steps
+        # reuse the steps of the last preview (or the cache) if computed with the same inputs
         # ------------------------------------------------------------------------------
 
-        self.walkSteps = self.computeWalkSteps()
+        computeResult = self.getExecuteComputeResult()
 
-        # ------------------------------------------------------------------------------
-        # compute RADIATING steps
-        # ------------------------------------------------------------------------------
+        if computeResult != None:
+            futil.log( f' > reuse the preview compute result' )
+            self.unpackComputeResult( computeResult )
 
-        self.radiatingSteps = self.computeRadiatingSteps( self.walkSteps )
-        self.radiatingStepsOverlap.clear()
-        self.radiatingStepsRiser.clear()
-        self.radiatingStepsBack.clear()
+        else:
 
-        # ------------------------------------------------------------------------------
+            # ------------------------------------------------------------------------------
+            # compute WALK steps
+            # ------------------------------------------------------------------------------
 
-        if self.isOverlapStair():
-            self.radiatingStepsOverlap = self.computeParallelSteps( self.radiatingSteps, offset = - self.overlapLength )
+            self.walkSteps = self.computeWalkSteps()
+
+            # ------------------------------------------------------------------------------
+            # compute RADIATING steps
+            # ------------------------------------------------------------------------------
 
-        if self.isRiserStair():
-            self.radiatingStepsRiser = self.computeParallelSteps( self.radiatingSteps, offset = self.riserThickness )
-            self.balancingStepsBack  = self.computeParallelSteps( self.radiatingSteps, offset = self.riserRabbet )
+            self.radiatingSteps = self.computeRadiatingSteps( self.walkSteps )
+            self.radiatingStepsOverlap.clear()
+            self.radiatingStepsRiser.clear()
+            self.radiatingStepsBack.clear()
 
-        # ------------------------------------------------------------------------------
-        # compute BALANCING steps
-        # ------------------------------------------------------------------------------
+            # ------------------------------------------------------------------------------
 
-        self.balancingSteps = self.computeBalancingStepsAll( self.radiatingSteps )
-        self.balancingStepsOverlap.clear()
-        self.balancingStepsRiser.clear()
-        self.balancingStepsBack.clear()
+            if self.isOverlapStair():
+                self.radiatingStepsOverlap = self.computeParallelSteps( self.radiatingSteps, offset = - self.overlapLength )
 
-        if self.isOverlapStair():
-            self.balancingStepsOverlap = self.computeParallelSteps( self.balancingSteps, offset = - self.overlapLength )
+            if self.isRiserStair():
+                self.radiatingStepsRiser = self.computeParallelSteps( self.radiatingSteps, offset = self.riserThickness )
+                self.radiatingStepsBack  = self.computeParallelSteps( self.radiatingSteps, offset = self.riserRabbet )
+
+            # ------------------------------------------------------------------------------
+            # compute BALANCING steps
+            # ------------------------------------------------------------------------------
+
+            self.balancingSteps = self.computeBalancingStepsAll( self.radiatingSteps )
+            self.balancingStepsOverlap.clear()
+            self.balancingStepsRiser.clear()
+            self.balancingStepsBack.clear()
 
-        if self.isRiserStair():
-            self.balancingStepsRiser = self.computeParallelSteps( self.balancingSteps, offset = self.riserThickness )
-            self.balancingStepsBack  = self.computeParallelSteps( self.balancingSteps, offset = self.riserRabbet )
+            if self.isOverlapStair():
+                self.balancingStepsOverlap = self.computeParallelSteps( self.balancingSteps, offset = - self.overlapLength )
+
+            if self.isRiserStair():
+                self.balancingStepsRiser = self.computeParallelSteps( self.balancingSteps, offset = self.riserThickness )
+                self.balancingStepsBack  = self.computeParallelSteps( self.balancingSteps, offset = self.riserRabbet )
 
         # ------------------------------------------------------------------------------
         # compute stairs
@@ -1229,8 +1564,9 @@ class StairwayDesign:
         if self.isCreateStairLayout:
             moveOccurence( self.stairLayoutOccurence, x = 500 )
 
-            snapshot = design.snapshots.add()
-            snapshot.name = f'Capture position stair layout'
+            if design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+                snapshot = design.snapshots.add()
+                snapshot.name = f'Capture position stair layout'
 
         # ------------------------------------------------------------------------------
         # fit camera view
@@ -1280,6 +1616,10 @@ class StairwayDesign:
             case adsk.core.CommandTerminationReason.UnknownTerminationReason:
                 futil.log( ' > : The command is terminated out of the reasons list below.' )
 
+        self.deletePreviewGraphics()
+        self.previewScheduler.cancel()
+        self.computeWorker.stop()
+
         # ------------------------------------------------------------------------------
         # remove component if not completed
         # ------------------------------------------------------------------------------
@@ -1301,12 +1641,18 @@ class StairwayDesign:
     def drawStairwaySketch2D( self,
             sketch:       adsk.fusion.Sketch,
             isWalkpath:   bool = False,
-            isConstraint: bool = False
+            isConstraint: bool = False,
+            isDimension:  bool = True
         ) -> bool:
 
 
         futil.log( f' > : drawStairwaySketch2D( \'{sketch.name}\' )' )
 
+        # the constraints need the curves of the sketch offset
+
+        if self.IS_DIRECT_OFFSET and not isConstraint:
+            return self.drawStairwaySketch2DDirect( sketch, isWalkpath, isDimension )
+
         #sketch: adsk.fusion.Sketch = app.activeEditObject
 
         outsideStringLine1: adsk.fusion.SketchLine = None
@@ -1403,7 +1749,7 @@ class StairwayDesign:
                     offsetPoint( startOutsideSketchPoint, 0, outsideStringLength1 + outsideStringLength2, 0 )
                 )
 
-            if True:
+            if isDimension:
                 # add 1st outside string dimension
 
                 sketchDimensions.addDistanceDimension(
@@ -1479,7 +1825,7 @@ class StairwayDesign:
                     line3D.endPoint
                 )
 
-                if True:
+                if isDimension:
 
                     # add 2nd outside string dimension
 
@@ -1548,7 +1894,7 @@ class StairwayDesign:
                 )
                 insideArc.isConstruction = False
 
-                if insideStringRadius > 0.1:
+                if isDimension and insideStringRadius > 0.1:
 
                     # add inside string angular dimension if > 1mm
 
@@ -1603,7 +1949,7 @@ class StairwayDesign:
 
             # ------------------------------------------------------------------------------
 
-            if True and stairAngle != 0:
+            if isDimension and stairAngle != 0:
 
                 # add a driven dimension angle inside
 
@@ -1615,7 +1961,7 @@ class StairwayDesign:
                 )
 
 
-            if True:
+            if isDimension:
 
                 sketchDimensions.addDistanceDimension(
                     insideStringLine1.startSketchPoint,
@@ -1661,112 +2007,414 @@ class StairwayDesign:
 
         return( outsideStringLine1, insideStringLine1, walkpathLine1 )
 
-    # ------------------------------------------------------------------------------
 
-    def drawPointStepsSketch2D( self, walkSteps: dict  ) -> bool:
+    def drawStairwaySketch2DDirect( self,
+            sketch:       adsk.fusion.Sketch,
+            isWalkpath:   bool = False,
+            isDimension:  bool = True
+        ) -> bool:
+        "Same drawing as drawStairwaySketch2D() without constraints, the offset curves and the fillets are computed (no sketch solver)"
 
-        futil.log( f' > drawPointStepsSketch2D()')
+        futil.log( f' > : drawStairwaySketch2DDirect( \'{sketch.name}\' )' )
+
+        walkpathLine1: adsk.fusion.SketchLine = None
 
         # ------------------------------------------------------------------------------
 
-        sketchPoints: adsk.fusion.SketchPoints = self.sketch.sketchPoints
+        stairAngle            = -self.stairAngle
+        stairWidth            = self.stairWidth
+        walkpathRadius        = self.walkpathRadius
+        outsideStringLength1  = self.flightLength1
+        outsideStringLength2  = self.flightLength2
+        insideStringRadius    = self.insideRadius
 
         # ------------------------------------------------------------------------------
 
-        for walkStep in walkSteps.values():
-            sketchPoints.add( walkStep[ 'Point3D' ] )
+        sketchPoints: adsk.fusion.SketchPoints              = sketch.sketchPoints
+        sketchDimensions: adsk.fusion.SketchDimensions      = sketch.sketchDimensions
 
-        return True
+        # ------------------------------------------------------------------------------
+        # ----- compute the OUTSIDE STRING polyline ( start -> corner -> end, start -> end if straight )
+        # ------------------------------------------------------------------------------
 
+        isStraight   = stairAngle == 0
+        side         = -1  if( isStraight )  else sign( stairAngle )   # the straight outside string is on the left
 
-    def drawLineStepsSketch2D( self, steps: dict, isConstruction = False ) -> bool:
+        walkOffsetX  = stairWidth - walkpathRadius
+        cornerX      = walkOffsetX * side
 
-        futil.log( f' > drawLineStepsSketch2D()')
+        if isStraight:
+            outsidePoints = [
+                ( cornerX, 0 ),
+                ( cornerX, outsideStringLength1 + outsideStringLength2 )
+            ]
+        else:
+            outsidePoints = [
+                ( cornerX, 0 ),
+                ( cornerX, outsideStringLength1 ),
+                ( cornerX - math.sin( stairAngle ) * outsideStringLength2, outsideStringLength1 + math.cos( stairAngle ) * outsideStringLength2 )
+            ]
 
-        # ------------------------------------------------------------------------------
+        # the inside string and the walkpath are on the inner side of the turn (left side if stairAngle > 0, right side if straight)
 
-        sketchPoints: adsk.fusion.SketchPoints               = self.sketch.sketchPoints
-        sketchLines: adsk.fusion.SketchLines                 = self.sketch.sketchCurves.sketchLines
+        insidePoints = offsetPolyline2D( outsidePoints, stairWidth * side )
+        walkPoints   = offsetPolyline2D( outsidePoints, ( stairWidth - walkpathRadius ) * side )
 
+        # ------------------------------------------------------------------------------
+        # ----- draw the OUTSIDE STRING curves with 1 mm fillet (WORKAROUND for compute)
         # ------------------------------------------------------------------------------
 
-        for step in steps.values():
+        outsideCurves = drawCurves2D( sketch, filletPolyline2D( outsidePoints, 0.1 ) )
 
-            walk    = step[ 'Walk' ]
-            inside  = step[ 'Inside' ]
-            outside = step[ 'Outside' ]
+        outsideStringLine1 = outsideCurves[ 0 ]
+        outsideStringLine2 = outsideCurves[ -1 ]
 
-            if 'Point3D' in walk.keys():
-                walkPointSKT    = sketchPoints.add( step[ 'Walk' ] [ 'Point3D' ] )
+        if isDimension and isStraight:
 
-            if 'Point3D' in inside.keys():
-                insidePointSKT  = sketchPoints.add( step[ 'Inside' ] [ 'Point3D' ] )
+            # add outside string dimension
 
-            if 'Point3D' in outside.keys():
-                outsidePointSKT = sketchPoints.add( step[ 'Outside' ] [ 'Point3D' ] )
+            sketchDimensions.addDistanceDimension(
+                outsideStringLine1.startSketchPoint,
+                outsideStringLine1.endSketchPoint,
+                adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
+                middlePoint( sketch,  outsideStringLine1.startSketchPoint, outsideStringLine1.endSketchPoint, -40.0 * sign( stairAngle ) )
+            )
 
-            if 'Point3D' in inside.keys() and 'Point3D' in outside.keys():
-                stepLineSKT = sketchLines.addByTwoPoints( insidePointSKT, outsidePointSKT )
-                stepLineSKT.isConstruction = isConstruction
+        elif isDimension:
 
-        return True
+            # add outside string dimensions from the corner point (the lines are trimmed by the fillet)
 
+            startSketchPoint  = outsideStringLine1.startSketchPoint
+            cornerSketchPoint = sketchPoints.add( adsk.core.Point3D.create( outsidePoints[ 1 ][ 0 ], outsidePoints[ 1 ][ 1 ], 0 ) )
+            endSketchPoint    = outsideStringLine2.endSketchPoint
 
-    def drawStairLinesSketch2D( self ) -> bool:
+            sketchDimensions.addDistanceDimension(
+                startSketchPoint,
+                cornerSketchPoint,
+                adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
+                middlePoint( sketch,  startSketchPoint, cornerSketchPoint, -40.0 * sign( stairAngle ) )
+            )
 
-        futil.log( f' > drawStairLinesSketch2D()')
+            sketchDimensions.addDistanceDimension(
+                cornerSketchPoint,
+                endSketchPoint,
+                adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
+                middlePoint( sketch,  cornerSketchPoint, endSketchPoint, -40.0 * sign( stairAngle ) )
+            )
 
-        # ------------------------------------------------------------------------------
+            # add outside string angular dimension (1st and 2nd)
 
-        if len( self.stairs ) == 0:
-            return False
+            sketchDimensions.addAngularDimension(
+                outsideStringLine1,
+                outsideStringLine2,
+                middlePoint( sketch,  outsideStringLine1.endSketchPoint, outsideStringLine2.startSketchPoint, 40.0 )
+            )
 
         # ------------------------------------------------------------------------------
+        # ----- draw the INSIDE STRING curves
+        # ------------------------------------------------------------------------------
 
-        sketchPoints: adsk.fusion.SketchPoints = self.sketch.sketchPoints
-        sketchLines: adsk.fusion.SketchLines   = self.sketch.sketchCurves.sketchLines
+        insideCurves = drawCurves2D( sketch, filletPolyline2D( insidePoints, insideStringRadius ) )
 
-        # ------------------------------------------------------------------------------
+        insideStringLine1 = insideCurves[ 0 ]
+        insideStringLine2 = insideCurves[ -1 ]
 
-        for stair in self.stairs.values():
+        if isDimension and not isStraight and insideStringRadius > 0.1:
 
-            # {
-            #     'FrontLine3D': Line3D,
-            #     'BackLine3D':  Line3D,
-            #     'RabbetLine3D': Line3D,
-            # }
+            # add inside string angular dimension if > 1mm
 
-            if 'FrontLine3D'  in stair.keys() and stair[ 'FrontLine3D' ] != None:
-                overlapLineSKT: adsk.fusion.SketchLine = sketchLines.addByTwoPoints( stair[ 'FrontLine3D' ].startPoint, stair[ 'FrontLine3D' ].endPoint )
-                overlapLineSKT.isConstruction = False
+            insideArc = insideCurves[ 1 ]
 
-            if 'BackLine3D'   in stair.keys() and stair[ 'BackLine3D' ] != None:
-                backLineSKT: adsk.fusion.SketchLine    = sketchLines.addByTwoPoints( stair[ 'BackLine3D' ].startPoint, stair[ 'BackLine3D' ].endPoint )
-                backLineSKT.isConstruction = False
+            sketchDimensions.addRadialDimension(
+                insideArc,
+                middlePoint( sketch,  insideArc.startSketchPoint, insideArc.endSketchPoint, 0 )
+            )
 
-            if 'RabbetLine3D' in stair.keys() and stair[ 'RabbetLine3D' ] != None:
-                backLineSKT: adsk.fusion.SketchLine    = sketchLines.addByTwoPoints( stair[ 'RabbetLine3D' ].startPoint, stair[ 'RabbetLine3D' ].endPoint )
-                backLineSKT.isConstruction = True
+        # ------------------------------------------------------------------------------
+        # ----- draw the WALK PATH curves
+        # ------------------------------------------------------------------------------
 
-            # if 'grooveLine3D_1' in stair.keys() and stair[ 'grooveLine3D_1' ] != None:
-            #     backLineSKT: adsk.fusion.SketchLine    = sketchLines.addByTwoPoints( stair[ 'grooveLine3D_1' ].startPoint, stair[ 'grooveLine3D_1' ].endPoint )
-            #     backLineSKT.isConstruction = True
+        if isWalkpath:
 
-            # if 'grooveLine3D_2' in stair.keys() and stair[ 'grooveLine3D_2' ] != None:
-            #     backLineSKT: adsk.fusion.SketchLine    = sketchLines.addByTwoPoints( stair[ 'RabbetLine3D' ].startPoint, stair[ 'RabbetLine3D' ].endPoint )
-            #     backLineSKT.isConstruction = True
+            walkCurves = drawCurves2D( sketch, filletPolyline2D( walkPoints, insideStringRadius + walkpathRadius ), True )
 
+            walkpathLine1 = walkCurves[ 0 ]
 
-    # ------------------------------------------------------------------------------
-    # COMPUTE STAIR (BEFORE 3D)
-    # ------------------------------------------------------------------------------
+            # ------------------------------------------------------------------------------
 
-    def computeStair( self ) -> bool:
+            if isDimension and not isStraight:
 
-        futil.log( f' > computeStair()' )
+                # add a driven dimension angle inside
 
-        # balancingSteps:        dict = {},
-        # balancingStepsOverlap: dict = {},
+                sketchDimensions.addAngularDimension(
+                    insideStringLine1,
+                    insideStringLine2,
+                    middlePoint( sketch,  insideStringLine1.startSketchPoint, insideStringLine2.endSketchPoint ),
+                    False
+                )
+
+            if isDimension:
+
+                sketchDimensions.addDistanceDimension(
+                    insideStringLine1.startSketchPoint,
+                    walkpathLine1.startSketchPoint,
+                    adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
+                    middlePoint( sketch,  insideStringLine1.startSketchPoint, walkpathLine1.startSketchPoint, -40.0 * sign( stairAngle ) ),
+                    False
+                )
+
+                sketchDimensions.addDistanceDimension(
+                    insideStringLine1.startSketchPoint,
+                    outsideStringLine1.startSketchPoint,
+                    adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
+                    middlePoint( sketch,  insideStringLine1.startSketchPoint, outsideStringLine1.startSketchPoint, -80.0 * sign( stairAngle ) ),
+                    False
+                )
+
+        # ------------------------------------------------------------------------------
+
+        return( outsideStringLine1, insideStringLine1, walkpathLine1 )
+
+    # ------------------------------------------------------------------------------
+
+    def drawPointStepsSketch2D( self, walkSteps: dict  ) -> bool:
+
+        futil.log( f' > drawPointStepsSketch2D()')
+
+        # ------------------------------------------------------------------------------
+
+        sketchPoints: adsk.fusion.SketchPoints = self.sketch.sketchPoints
+
+        # ------------------------------------------------------------------------------
+
+        for walkStep in walkSteps.values():
+            sketchPoints.add( walkStep[ 'Point3D' ] )
+
+        return True
+
+
+    def drawLineStepsSketch2D( self, steps: dict, isConstruction = False ) -> bool:
+
+        futil.log( f' > drawLineStepsSketch2D()')
+
+        # ------------------------------------------------------------------------------
+
+        sketchPoints: adsk.fusion.SketchPoints               = self.sketch.sketchPoints
+        sketchLines: adsk.fusion.SketchLines                 = self.sketch.sketchCurves.sketchLines
+
+        # ------------------------------------------------------------------------------
+
+        for step in steps.values():
+
+            walk    = step[ 'Walk' ]
+            inside  = step[ 'Inside' ]
+            outside = step[ 'Outside' ]
+
+            if 'Point3D' in walk.keys():
+                walkPointSKT    = sketchPoints.add( step[ 'Walk' ] [ 'Point3D' ] )
+
+            if 'Point3D' in inside.keys():
+                insidePointSKT  = sketchPoints.add( step[ 'Inside' ] [ 'Point3D' ] )
+
+            if 'Point3D' in outside.keys():
+                outsidePointSKT = sketchPoints.add( step[ 'Outside' ] [ 'Point3D' ] )
+
+            if 'Point3D' in inside.keys() and 'Point3D' in outside.keys():
+                stepLineSKT = sketchLines.addByTwoPoints( insidePointSKT, outsidePointSKT )
+                stepLineSKT.isConstruction = isConstruction
+
+        return True
+
+
+    # ------------------------------------------------------------------------------
+    # DRAW PREVIEW WITH CUSTOM GRAPHICS
+    # ------------------------------------------------------------------------------
+
+    def drawStepsGraphics( self, lineSets: list, pointSteps: dict ) -> bool:
+        "Draw the step lines ( steps, isConstruction ) and the walk points in one custom graphics group, without the sketch solver"
+
+        futil.log( f' > drawStepsGraphics()')
+
+        # ------------------------------------------------------------------------------
+
+        app = adsk.core.Application.get()
+        design: adsk.fusion.Design = app.activeProduct
+
+        # ------------------------------------------------------------------------------
+
+        # packed coordinates : x, y, z for each point
+
+        lineCoordinates         = []
+        constructionCoordinates = []
+        pointCoordinates        = []
+
+        for ( steps, isConstruction ) in lineSets:
+
+            coordinates = constructionCoordinates  if( isConstruction )  else lineCoordinates
+
+            for step in steps.values():
+
+                for name in [ 'Walk', 'Inside', 'Outside' ]:
+
+                    if 'Point3D' in step[ name ].keys():
+                        point3D: adsk.core.Point3D = step[ name ][ 'Point3D' ]
+                        pointCoordinates.extend( [ point3D.x, point3D.y, 0 ] )
+
+                if 'Point3D' in step[ 'Inside' ].keys() and 'Point3D' in step[ 'Outside' ].keys():
+                    insidePoint3D: adsk.core.Point3D  = step[ 'Inside' ][ 'Point3D' ]
+                    outsidePoint3D: adsk.core.Point3D = step[ 'Outside' ][ 'Point3D' ]
+                    coordinates.extend( [ insidePoint3D.x, insidePoint3D.y, 0, outsidePoint3D.x, outsidePoint3D.y, 0 ] )
+
+        for walkStep in pointSteps.values():
+            point3D: adsk.core.Point3D = walkStep[ 'Point3D' ]
+            pointCoordinates.extend( [ point3D.x, point3D.y, 0 ] )
+
+        # ------------------------------------------------------------------------------
+
+        # the group of the previous preview is kept in retained mode
+
+        if self.previewGraphics == None or not self.previewGraphics.isValid:
+            self.previewGraphics      = design.rootComponent.customGraphicsGroups.add()
+            self.previewGraphicsItems = {}
+
+        isChanged = False
+
+        isChanged |= self.updatePreviewGraphicsItem( 'Lines',        lineCoordinates )
+        isChanged |= self.updatePreviewGraphicsItem( 'Construction', constructionCoordinates )
+        isChanged |= self.updatePreviewGraphicsItem( 'Points',       pointCoordinates )
+
+        if isChanged:
+            app.activeViewport.refresh()
+
+        return True
+
+
+    def updatePreviewGraphicsItem( self, layer: str, coordinates: list ) -> bool:
+        "Move the entity of a layer to the new coordinates, it is created or deleted only if the layer appears or disappears. Return True if changed"
+
+        ( item, previousCoordinates ) = self.previewGraphicsItems.get( layer, ( None, None ) )
+
+        if item != None and not item.isValid:
+            item = None
+
+        if item != None and coordinates == previousCoordinates:
+            return False
+
+        # ------------------------------------------------------------------------------
+
+        if len( coordinates ) == 0:
+
+            if item != None:
+                item.deleteMe()
+
+            self.previewGraphicsItems.pop( layer, None )
+
+            return item != None
+
+        # ------------------------------------------------------------------------------
+
+        graphicsCoordinates = adsk.fusion.CustomGraphicsCoordinates.create( coordinates )
+
+        if item != None:
+            item.coordinates = graphicsCoordinates
+
+        else:
+            color = adsk.fusion.CustomGraphicsSolidColorEffect.create( adsk.core.Color.create( 0, 0, 255, 255 ) )
+
+            match layer:
+
+                case 'Lines':
+                    item = self.previewGraphics.addLines( graphicsCoordinates, [], False )
+
+                case 'Construction':
+                    item = self.previewGraphics.addLines( graphicsCoordinates, [], False )
+                    item.lineStylePattern = adsk.fusion.LineStylePatterns.dashedLineStylePattern
+
+                case 'Points':
+                    item = self.previewGraphics.addPointSet(
+                        graphicsCoordinates,
+                        [],
+                        adsk.fusion.CustomGraphicsPointTypes.PointCustomGraphicsPointType,
+                        ''
+                    )
+
+            item.color = color
+
+        self.previewGraphicsItems[ layer ] = ( item, coordinates )
+
+        return True
+
+
+    def deletePreviewGraphics( self ) -> bool:
+
+        self.previewGraphicsItems = {}
+
+        if self.previewGraphics == None:
+            return False
+
+        if self.previewGraphics.isValid:
+            self.previewGraphics.deleteMe()
+
+        self.previewGraphics = None
+
+        return True
+
+
+    def drawStairLinesSketch2D( self ) -> bool:
+
+        futil.log( f' > drawStairLinesSketch2D()')
+
+        # ------------------------------------------------------------------------------
+
+        if len( self.stairs ) == 0:
+            return False
+
+        # ------------------------------------------------------------------------------
+
+        sketchPoints: adsk.fusion.SketchPoints = self.sketch.sketchPoints
+        sketchLines: adsk.fusion.SketchLines   = self.sketch.sketchCurves.sketchLines
+
+        # ------------------------------------------------------------------------------
+
+        for stair in self.stairs.values():
+
+            # {
+            #     'FrontLine3D': Line3D,
+            #     'BackLine3D':  Line3D,
+            #     'RabbetLine3D': Line3D,
+            # }
+
+            if 'FrontLine3D'  in stair.keys() and stair[ 'FrontLine3D' ] != None:
+                overlapLineSKT: adsk.fusion.SketchLine = sketchLines.addByTwoPoints( stair[ 'FrontLine3D' ].startPoint, stair[ 'FrontLine3D' ].endPoint )
+                overlapLineSKT.isConstruction = False
+
+            if 'BackLine3D'   in stair.keys() and stair[ 'BackLine3D' ] != None:
+                backLineSKT: adsk.fusion.SketchLine    = sketchLines.addByTwoPoints( stair[ 'BackLine3D' ].startPoint, stair[ 'BackLine3D' ].endPoint )
+                backLineSKT.isConstruction = False
+
+            if 'RabbetLine3D' in stair.keys() and stair[ 'RabbetLine3D' ] != None:
+                backLineSKT: adsk.fusion.SketchLine    = sketchLines.addByTwoPoints( stair[ 'RabbetLine3D' ].startPoint, stair[ 'RabbetLine3D' ].endPoint )
+                backLineSKT.isConstruction = True
+
+            # if 'grooveLine3D_1' in stair.keys() and stair[ 'grooveLine3D_1' ] != None:
+            #     backLineSKT: adsk.fusion.SketchLine    = sketchLines.addByTwoPoints( stair[ 'grooveLine3D_1' ].startPoint, stair[ 'grooveLine3D_1' ].endPoint )
+            #     backLineSKT.isConstruction = True
+
+            # if 'grooveLine3D_2' in stair.keys() and stair[ 'grooveLine3D_2' ] != None:
+            #     backLineSKT: adsk.fusion.SketchLine    = sketchLines.addByTwoPoints( stair[ 'RabbetLine3D' ].startPoint, stair[ 'RabbetLine3D' ].endPoint )
+            #     backLineSKT.isConstruction = True
+
+
+    # ------------------------------------------------------------------------------
+    # COMPUTE STAIR (BEFORE 3D)
+    # ------------------------------------------------------------------------------
+
+    def computeStair( self ) -> bool:
+
+        futil.log( f' > computeStair()' )
+
+        # balancingSteps:        dict = {},
+        # balancingStepsOverlap: dict = {},
         # balancingStepsRiser:   dict = {},
         # balancingStepsBack:    dict = {},
 
@@ -1847,6 +2495,10 @@ class StairwayDesign:
                 'RabbetLine3D':   rabbetLine3D,
                 'GrooveLine3D_1': grooveLine3D_1,
                 'GrooveLine3D_2': grooveLine3D_2,
+                'IsStraight':     self.isStraightStep(
+                                      self.balancingStepsOverlap.get( step )  if( isOverlap )  else self.balancingSteps.get( step ),
+                                      self.balancingStepsBack.get( step + 1 )  if( isRiser and step + 1 < self.stepNumber )  else self.balancingSteps.get( step + 1 )
+                                  ),
             }
 
         # ------------------------------------------------------------------------------
@@ -1876,6 +2528,7 @@ class StairwayDesign:
                 'RabbetLine3D':   None,
                 'GrooveLine3D_1': None,
                 'GrooveLine3D_2': None,
+                'IsStraight':     self.isStraightStep( self.balancingStepsOverlap.get( step ), self.balancingSteps.get( step ) ),
             }
 
         # ------------------------------------------------------------------------------
@@ -1885,6 +2538,60 @@ class StairwayDesign:
         return True
 
 
+    def isStraightStep( self, frontItem: dict, backItem: dict ) -> bool:
+        "The strings are the same sketch lines at the front and at the back of the step : its outline is the quadrilateral of these lines"
+
+        if frontItem == None or backItem == None:
+            return False
+
+        for name in [ 'Inside', 'Outside' ]:
+
+            curveId = frontItem.get( name, {} ).get( 'CurveId' )
+
+            if curveId == None or curveId != backItem.get( name, {} ).get( 'CurveId' ):
+                return False
+
+            curveSKT = frontItem[ name ].get( 'CurveSKT' )
+
+            if curveSKT == None or curveSKT.objectType != adsk.fusion.SketchLine.classType():
+                return False
+
+        return True
+
+
+    def getStepSignature( self, step: int, stair: dict ) -> tuple:
+        "Outline of the step moved to its front line, with the groove lines. None if the step can not be shared"
+
+        if not stair[ 'IsStraight' ] or stair[ 'FrontLine3D' ] == None or stair[ 'BackLine3D' ] == None:
+            return None
+
+        # the reference engraved on each step is different
+
+        if self.isEngraveReference and not( step == self.stepNumber and self.isOverlapStair() ):
+            return None
+
+        # ------------------------------------------------------------------------------
+
+        lines = [ stair[ 'FrontLine3D' ], stair[ 'BackLine3D' ] ]
+
+        if self.isRiserStair() and self.riserGroove > 0 and stair[ 'GrooveLine3D_1' ] != None and stair[ 'GrooveLine3D_2' ] != None:
+            lines += [ stair[ 'GrooveLine3D_1' ], stair[ 'GrooveLine3D_2' ] ]
+
+        points = []
+
+        for line3D in lines:
+            points += [ ( line3D.startPoint.x, line3D.startPoint.y ), ( line3D.endPoint.x, line3D.endPoint.y ) ]
+
+        ( xTrans, yTrans, _, zAngleRotate ) = self.getStairXYZandAngleByLevel( step + 1, stair[ 'FrontLine3D' ] )
+
+        values = [ len( lines ) ]
+
+        for ( x, y ) in movePoints2D( points, ( xTrans, yTrans ), zAngleRotate ):
+            values += [ x, y ]
+
+        return makeCacheKey( values, self.SHARED_STEPS_DIGITS )
+
+
     def createInOutLine3D( self, stepItem: dict ) -> adsk.core.Line3D:
 
         line3D: adsk.core.Line3D = None
@@ -1901,6 +2608,274 @@ class StairwayDesign:
         return line3D
 
 
+    def getStepOutline2D( self, frontLine3D: adsk.core.Line3D, backLine3D: adsk.core.Line3D ) -> tuple:
+        """Closed outline between two lines from the inside to the outside string : front line, outside string, back line, inside string.
+        Return ( pieces, backIndex ) : pieces of lines and arcs (see WalkPath.getPiecesBetweenLengths) and the index of the back line piece,
+        None if a string is not made of lines and arcs"""
+
+        insidePath: WalkPath  = self.getWalkPath( self.insideCurvesSKT )
+        outsidePath: WalkPath = self.getWalkPath( self.outsideCurvesSKT )
+
+        if insidePath == None or outsidePath == None:
+            return None
+
+        ( frontInside, frontOutside ) = ( ( frontLine3D.startPoint.x, frontLine3D.startPoint.y ), ( frontLine3D.endPoint.x, frontLine3D.endPoint.y ) )
+        ( backInside, backOutside )   = ( ( backLine3D.startPoint.x,  backLine3D.startPoint.y ),  ( backLine3D.endPoint.x,  backLine3D.endPoint.y ) )
+
+        pieces  = [ ( frontInside, frontOutside ) ]
+        pieces += outsidePath.getPiecesBetweenLengths( outsidePath.getLengthAtPoint( frontOutside ), outsidePath.getLengthAtPoint( backOutside ) )
+
+        backIndex = len( pieces )
+
+        pieces += [ ( backOutside, backInside ) ]
+        pieces += insidePath.getPiecesBetweenLengths( insidePath.getLengthAtPoint( backInside ), insidePath.getLengthAtPoint( frontInside ) )
+
+        return ( pieces, backIndex )
+
+
+    def getToolOutline2D( self, line3D_1: adsk.core.Line3D, line3D_2: adsk.core.Line3D ) -> list:
+        "Quadrilateral between two lines from the inside to the outside string, extended by the riser thickness to cut through the strings"
+
+        ( x1, y1, x2, y2 ) = extendLine2D( ( line3D_1.startPoint.x, line3D_1.startPoint.y, line3D_1.endPoint.x, line3D_1.endPoint.y ), self.riserThickness )
+        ( x3, y3, x4, y4 ) = extendLine2D( ( line3D_2.startPoint.x, line3D_2.startPoint.y, line3D_2.endPoint.x, line3D_2.endPoint.y ), self.riserThickness )
+
+        return [ ( ( x1, y1 ), ( x2, y2 ) ), ( ( x2, y2 ), ( x4, y4 ) ), ( ( x4, y4 ), ( x3, y3 ) ), ( ( x3, y3 ), ( x1, y1 ) ) ]
+
+
+    def createPrismBody3D( self,
+            level:        int,
+            originLine3D: adsk.core.Line3D,
+            frontLine3D:  adsk.core.Line3D,
+            backLine3D:   adsk.core.Line3D,
+            height:       float,
+            tools:        list = None
+        ) -> tuple:
+        """Temporary body of a step or a riser moved like moveSketchToFrontLineByLevel, to add to its component (see addBaseFeatureBodies).
+        The tools ( line3D_1, line3D_2, height ) are cut from the bottom of the body (groove, rabbet).
+        Return ( body, faceRoles ) : faceRoles is the index of the faces by role (see createPrismBody and getBodyFaceByRole).
+        Return ( None, None ) if it can not be created"""
+
+        outline = self.getStepOutline2D( frontLine3D, backLine3D )
+
+        if outline == None:
+            return ( None, None )
+
+        ( pieces, backIndex ) = outline
+
+        ( xTrans, yTrans, _, zAngleRotate ) = self.getStairXYZandAngleByLevel( level, originLine3D )
+
+        pieces = [ tuple( movePoints2D( piece, ( xTrans, yTrans ), zAngleRotate ) ) for piece in pieces ]
+
+        body: adsk.fusion.BRepBody = createPrismBody( pieces, height )
+
+        if body == None:
+            return ( None, None )
+
+        # the faces are built in the order bottom, top, side of each piece
+
+        faceRoles = { 'Bottom': 0, 'Top': 1, 'Front': 2, 'Back': 2 + backIndex }
+
+        # ------------------------------------------------------------------------------
+        # Cut the tools from the temporary body : no sketch and no feature
+        # ------------------------------------------------------------------------------
+
+        temporaryBRep: adsk.fusion.TemporaryBRepManager = adsk.fusion.TemporaryBRepManager.get()
+
+        for ( toolLine3D_1, toolLine3D_2, toolHeight ) in ( tools  if( tools != None )  else [] ):
+
+            toolPieces = [ tuple( movePoints2D( piece, ( xTrans, yTrans ), zAngleRotate ) ) for piece in self.getToolOutline2D( toolLine3D_1, toolLine3D_2 ) ]
+            toolBody: adsk.fusion.BRepBody = createPrismBody( toolPieces, toolHeight )
+
+            if toolBody == None or not temporaryBRep.booleanOperation( body, toolBody, adsk.fusion.BooleanTypes.DifferenceBooleanType ):
+                return ( None, None )
+
+            # the bottom face may be split by the tool
+
+            faceRoles.pop( 'Bottom', None )
+
+        return ( body, faceRoles )
+
+
+    def createStepBody3D( self, step: int, stair: dict ) -> tuple:
+        "Temporary body of a step with the groove of its riser and its face roles (see createPrismBody3D), ( None, None ) if it can not be created"
+
+        if stair[ 'FrontLine3D' ] == None or stair[ 'BackLine3D' ] == None:
+            return ( None, None )
+
+        tools = []
+
+        if self.isRiserStair() and self.riserGroove > 0 and stair[ 'GrooveLine3D_1' ] != None and stair[ 'GrooveLine3D_2' ] != None:
+            tools.append( ( stair[ 'GrooveLine3D_1' ], stair[ 'GrooveLine3D_2' ], self.riserGroove ) )
+
+        return self.createPrismBody3D( step + 1, stair[ 'FrontLine3D' ], stair[ 'FrontLine3D' ], stair[ 'BackLine3D' ], self.stairThickness, tools )
+
+
+    def createRiserBody3D( self, step: int, stair: dict, height: float ) -> tuple:
+        "Temporary body of a riser with the rabbet of the step below and its face roles (see createPrismBody3D), ( None, None ) if it can not be created"
+
+        if stair[ 'GrooveLine3D_1' ] == None or stair[ 'GrooveLine3D_2' ] == None:
+            return ( None, None )
+
+        # the rabbet is the back of the step below, inside the riser
+
+        tools = []
+
+        if self.riserRabbet > 0 and step > 0 and self.stairs[ step - 1 ][ 'RabbetLine3D' ] != None and self.stairs[ step - 1 ][ 'BackLine3D' ] != None:
+            tools.append( ( self.stairs[ step - 1 ][ 'RabbetLine3D' ], self.stairs[ step - 1 ][ 'BackLine3D' ], self.stairThickness ) )
+
+        return self.createPrismBody3D( step, stair[ 'GrooveLine3D_1' ], stair[ 'GrooveLine3D_1' ], stair[ 'GrooveLine3D_2' ], height, tools )
+
+
+    def addFastBuildBodies( self, component: adsk.fusion.Component, bodies: list, bodyName: str, featureName: str ) -> adsk.fusion.BaseFeature:
+        """Fast build : add the temporary bodies ( reference, body, matrixTransform ) moved by their matrix, all in one base feature of the component.
+        No sub component and no sketch, the reference is the name and an attribute of each body. Return the base feature, None if no body"""
+
+        if len( bodies ) == 0:
+            return None
+
+        temporaryBRep: adsk.fusion.TemporaryBRepManager = adsk.fusion.TemporaryBRepManager.get()
+
+        movedBodies = []
+
+        for ( _, body, matrixTransform ) in bodies:
+
+            movedBody: adsk.fusion.BRepBody = temporaryBRep.copy( body )
+            temporaryBRep.transform( movedBody, matrixTransform )
+
+            movedBodies.append( movedBody )
+
+        ( newBodies, baseFeature ) = addBaseFeatureBodies( component, movedBodies )
+
+        for ( ( reference, _, _ ), newBody ) in zip( bodies, newBodies ):
+            newBody.name = f'Body {bodyName} {reference}'
+            newBody.attributes.add( self.ATTRIBUTES_GROUP, 'Reference', reference )
+
+        if baseFeature != None:
+            baseFeature.name = featureName
+
+        return baseFeature
+
+
+    def getLayoutMatrix3D( self, index: int, yAngle: float, zTranslation: float ) -> adsk.core.Matrix3D:
+        "Matrix of the piece at index in the layout grid : laid flat by a rotation of yAngle, in rows of flatModulo pieces"
+
+        xSpacing = self.flatSpaceX + self.stepGoing
+        ySpacing = self.flatSpaceY + self.stairWidth
+        modulo   = self.flatModulo
+
+        col = index % modulo
+        row = math.floor( index / modulo )
+
+        xDestination = row * xSpacing
+        yDestination = col * ySpacing
+
+        # init matrix
+        matrixTransform = adsk.core.Matrix3D.create()
+
+        # rotation
+        matrixRotation = adsk.core.Matrix3D.create()
+        matrixRotation.setToRotation(
+            -math.pi / 2,
+            adsk.core.Vector3D.create( z = 1 ),
+            adsk.core.Point3D.create( x = xDestination, y = yDestination )
+        )
+        matrixTransform.transformBy( matrixRotation )
+
+        # rotation 2
+        matrixRotation = adsk.core.Matrix3D.create()
+        matrixRotation.setToRotation(
+            yAngle,
+            adsk.core.Vector3D.create( y = 1 ),
+            adsk.core.Point3D.create( x = xDestination, y = yDestination )
+        )
+        matrixTransform.transformBy( matrixRotation )
+
+        # translation
+        matrixTransform.translation = adsk.core.Vector3D.create( xDestination, yDestination, zTranslation )
+
+        return matrixTransform
+
+
+    def getBodyFaceByRole( self,
+            source,
+            role:         str,
+            faceRoles:    dict,
+            level:        int,
+            originLine3D: adsk.core.Line3D,
+            frontLine3D:  adsk.core.Line3D,
+            backLine3D:   adsk.core.Line3D
+        ) -> adsk.fusion.BRepFace:
+        """Face of a step or a riser body by role 'Bottom', 'Front' or 'Back'.
+        The source is the extrude feature of the body or the body itself : its face is read at its index in faceRoles (see createPrismBody3D),
+        checked on its plane. The faces are searched on the plane only if the role is unknown (see findFaceOnPlane)"""
+
+        isExtrude = source.objectType == adsk.fusion.ExtrudeFeature.classType()
+
+        # one profile : the start face of the extrude is the bottom face
+
+        if role == 'Bottom' and isExtrude and source.startFaces.count > 0:
+            return source.startFaces.item( 0 )
+
+        # ------------------------------------------------------------------------------
+        # Plane of the face : the front or back face holds the line moved like moveSketchToFrontLineByLevel
+        # ------------------------------------------------------------------------------
+
+        if role == 'Bottom':
+            point  = adsk.core.Point3D.create( 0, 0, 0 )
+            normal = adsk.core.Vector3D.create( 0, 0, 1 )
+
+        else:
+            line3D = frontLine3D  if( role == 'Front' )  else backLine3D
+
+            ( xTrans, yTrans, _, zAngleRotate ) = self.getStairXYZandAngleByLevel( level, originLine3D )
+            ( ( x1, y1 ), ( x2, y2 ) )          = movePoints2D( [ ( line3D.startPoint.x, line3D.startPoint.y ), ( line3D.endPoint.x, line3D.endPoint.y ) ], ( xTrans, yTrans ), zAngleRotate )
+
+            point  = adsk.core.Point3D.create( ( x1 + x2 ) / 2, ( y1 + y2 ) / 2, 0 )
+            normal = adsk.core.Vector3D.create( y1 - y2, x2 - x1, 0 )
+
+        # ------------------------------------------------------------------------------
+        # Face read at its index
+        # ------------------------------------------------------------------------------
+
+        if not isExtrude and faceRoles != None and role in faceRoles and faceRoles[ role ] < source.faces.count:
+
+            face: adsk.fusion.BRepFace = source.faces.item( faceRoles[ role ] )
+
+            if isFaceOnPlane( face, point, normal ):
+                return face
+
+        # ------------------------------------------------------------------------------
+
+        faces = source.sideFaces  if( isExtrude )  else source.faces
+
+        return findFaceOnPlane( faces, point, normal )
+
+
+    def getTimelineIndex( self, entity ) -> int:
+        "Index of the entity in the timeline, None in a design without history (direct modeling)"
+
+        design: adsk.fusion.Design = adsk.core.Application.get().activeProduct
+
+        if design.designType != adsk.fusion.DesignTypes.ParametricDesignType:
+            return None
+
+        return entity.timelineObject.index
+
+
+    def addTimelineGroup( self, timelineStart: int, timelineEnd: int, name: str ) -> adsk.fusion.TimelineGroup:
+        "Group the timeline from start to end, nothing in a design without history (direct modeling)"
+
+        if timelineStart == None or timelineEnd == None:
+            return None
+
+        design: adsk.fusion.Design = adsk.core.Application.get().activeProduct
+
+        timelineGroup: adsk.fusion.TimelineGroup = design.timeline.timelineGroups.add( timelineStart, timelineEnd )
+        timelineGroup.name = name
+
+        return timelineGroup
+
+
     # ------------------------------------------------------------------------------
     # CREATE 3D STAIRS AND RISERS COMPONENTS
     # ------------------------------------------------------------------------------
@@ -1945,10 +2920,12 @@ class StairwayDesign:
         # Create steps
         # ------------------------------------------------------------------------------
 
-        timeline: adsk.fusion.Timeline = design.timeline
         timelineStart = None
         timelineEnd   = None
 
+        sharedComponents: dict = {}     # ( component, references ) by step signature
+        fastBuildBodies: list  = []     # ( reference, body, matrixTransform ) of the steps (fast build)
+
         for step, stair in self.stairs.items():
 
             # Create reference
@@ -1973,10 +2950,44 @@ class StairwayDesign:
             matrixTranslation.translation = adsk.core.Vector3D.create( xTrans, yTrans, zTrans )
             matrixTransform.transformBy( matrixTranslation )
 
+            # ------------------------------------------------------------------------------
+            # Fast build : only the body, added with the others after the loop (see addFastBuildBodies)
+            # ------------------------------------------------------------------------------
+
+            if self.isFastBuild:
+
+                ( temporaryBody, _ ) = self.createStepBody3D( step, stair )
+
+                if temporaryBody != None:
+                    fastBuildBodies.append( ( reference, temporaryBody, matrixTransform ) )
+                    continue
+
+                # the strings are not lines and arcs : the step is built with its sketch
+
+            # ------------------------------------------------------------------------------
+            # Identical step already built : add an occurence of its component
+            # ------------------------------------------------------------------------------
+
+            signature = self.getStepSignature( step, stair )  if( self.IS_SHARED_STEPS )  else None
+
+            if signature != None and signature in sharedComponents:
+
+                ( sharedComponent, references ) = sharedComponents[ signature ]
+                references.append( reference )
+
+                subOccurrence: adsk.fusion.Occurrence = subOccurrences.addExistingComponent( sharedComponent, matrixTransform )
+                subOccurrence.isGroundToParent = True
+                subOccurrence.attributes.add( self.ATTRIBUTES_GROUP, 'Reference', reference )
+
+                timelineEnd = self.getTimelineIndex( subOccurrence ) # timeline last operation
+
+                continue
+
             # Create sub occurence
 
             subOccurrence: adsk.fusion.Occurrence = subOccurrences.addNewComponent( matrixTransform )
             subOccurrence.isGroundToParent = True
+            subOccurrence.attributes.add( self.ATTRIBUTES_GROUP, 'Reference', reference )
 
             # Create sub component in sub occurence
 
@@ -1984,6 +2995,9 @@ class StairwayDesign:
             subComponent.name = f'STEP {reference}'
             subComponent.partNumber = reference
 
+            if signature != None:
+                sharedComponents[ signature ] = ( subComponent, [ reference ] )
+
             # subComponent.material
             # subComponent.componentColor
 
@@ -1992,15 +3006,42 @@ class StairwayDesign:
             # ------------------------------------------------------------------------------
 
             if timelineStart == None:
-                timelineStart = subOccurrence.timelineObject.index
+                timelineStart = self.getTimelineIndex( subOccurrence )
 
             # ------------------------------------------------------------------------------
             # Extrude stair step
             # ------------------------------------------------------------------------------
 
-            body = None
+            body       = None
+            isToolsCut = False      # groove already cut in the body
+            faceSource = None       # extrude feature or body to find the faces (see getBodyFaceByRole)
+            faceRoles  = None       # index of the body faces by role (see createPrismBody3D)
+
+            if self.IS_BREP_BODIES and not self.isFastBuild:
+
+                ( temporaryBody, faceRoles ) = self.createStepBody3D( step, stair )
+
+                # all the bodies of the component in one base feature : the step is the only body of its component
+
+                if temporaryBody != None:
 
-            if True:
+                    ( ( body, ), baseFeature ) = addBaseFeatureBodies( subComponent, [ temporaryBody ] )
+
+                    body.name  = f'Body Step {reference}'
+                    isToolsCut = True
+                    faceSource = body
+
+                    if baseFeature != None:
+
+                        baseFeature.name = f'Base Step {reference}'
+
+                        # ------------------------------------------------------------------------------
+
+                        timelineEnd = self.getTimelineIndex( baseFeature ) # timeline last operation
+
+            # sketch and extrude when the strings are not lines and arcs
+
+            if body == None:
 
                 # Create sketch on xyPlane
 
@@ -2018,7 +3059,7 @@ class StairwayDesign:
 
                 # ------------------------------------------------------------------------------
 
-                timelineEnd = sketchBase.timelineObject.index # timeline last operation
+                timelineEnd = self.getTimelineIndex( sketchBase ) # timeline last operation
 
                 # ------------------------------------------------------------------------------
 
@@ -2060,10 +3101,11 @@ class StairwayDesign:
 
                     body: adsk.fusion.BRepBody = extrudeFeature.bodies.item( 0 )
                     body.name = f'Body Step {reference}'
+                    faceSource = extrudeFeature
 
                     # ------------------------------------------------------------------------------
 
-                    timelineEnd = extrudeFeature.timelineObject.index # timeline last operation
+                    timelineEnd = self.getTimelineIndex( extrudeFeature ) # timeline last operation
 
 
             # ------------------------------------------------------------------------------
@@ -2079,8 +3121,7 @@ class StairwayDesign:
                 # faceFront  = min( faces, key = ( lambda f: f.centroid.y ) )
                 # faceBack   = max( faces, key = ( lambda f: f.centroid.y ) )
 
-                faces:      adsk.fusion.BRepFaces = body.faces
-                faceBottom: adsk.fusion.BRepFace  = min( faces, key = ( lambda f: f.centroid.z ) ) # bottom face
+                faceBottom: adsk.fusion.BRepFace  = self.getBodyFaceByRole( faceSource, 'Bottom', faceRoles, step + 1, stair[ 'FrontLine3D' ], stair[ 'FrontLine3D' ], stair[ 'BackLine3D' ] ) # bottom face
 
                 # create sketch on 'bottom' face of stair
 
@@ -2098,7 +3139,7 @@ class StairwayDesign:
 
                 # ------------------------------------------------------------------------------
 
-                timelineEnd = sketchEngrave.timelineObject.index # timeline last operation
+                timelineEnd = self.getTimelineIndex( sketchEngrave ) # timeline last operation
 
                 # ------------------------------------------------------------------------------
 
@@ -2180,14 +3221,14 @@ class StairwayDesign:
 
                 # ------------------------------------------------------------------------------
 
-                timelineEnd =  extrudeText.timelineObject.index # timeline last operation
+                timelineEnd =  self.getTimelineIndex( extrudeText ) # timeline last operation
 
 
             # ------------------------------------------------------------------------------
             # Make a groove in body for riser on BOTTOM face
             # ------------------------------------------------------------------------------
 
-            if body != None and self.isRiserStair() and self.riserGroove > 0:
+            if body != None and not isToolsCut and self.isRiserStair() and self.riserGroove > 0:
 
                 if stair[ 'GrooveLine3D_1' ] != None and stair[ 'GrooveLine3D_2' ] != None:
 
@@ -2207,7 +3248,7 @@ class StairwayDesign:
 
                     # ------------------------------------------------------------------------------
 
-                    timelineEnd = sketchGroove.timelineObject.index # timeline last operation
+                    timelineEnd = self.getTimelineIndex( sketchGroove ) # timeline last operation
 
                     # ------------------------------------------------------------------------------
 
@@ -2251,26 +3292,42 @@ class StairwayDesign:
 
                         # ------------------------------------------------------------------------------
 
-                        timelineEnd = extrudeGroove.timelineObject.index # timeline last operation
+                        timelineEnd = self.getTimelineIndex( extrudeGroove ) # timeline last operation
 
                     # ------------------------------------------------------------------------------
 
                     sketchGroove.isVisible = False
                     sketchGroove.isComputeDeferred = False
 
+        # ------------------------------------------------------------------------------
+        # Part numbers of the shared components : the references of their steps
+        # ------------------------------------------------------------------------------
+
+        for ( sharedComponent, references ) in sharedComponents.values():
+
+            if len( references ) > 1:
+                sharedComponent.name       = f'STEP {references[ 0 ]} (x{len( references )})'
+                sharedComponent.partNumber = ', '.join( references )
+
+        # ------------------------------------------------------------------------------
+        # Fast build : all the steps in one base feature of the parent component
+        # ------------------------------------------------------------------------------
+
+        baseFeature = self.addFastBuildBodies( parentComponent, fastBuildBodies, 'Step', 'Base Steps' )
+
+        if baseFeature != None and timelineStart != None:
+            timelineEnd = self.getTimelineIndex( baseFeature ) # timeline last operation
+
         # ------------------------------------------------------------------------------
         # Create timeline group
         # ------------------------------------------------------------------------------
 
-        timelineGroup = timeline.timelineGroups.add(
-            timelineStart,
-            timelineEnd
-        )
-        timelineGroup.name = f'Group Steps'
+        self.addTimelineGroup( timelineStart, timelineEnd, 'Group Steps' )
 
         # ------------------------------------------------------------------------------
 
         self.stepsGroupOccurence = parentOccurrence
+        self.fastBuildSteps      = [ ( reference, body ) for ( reference, body, _ ) in fastBuildBodies ]
 
         return True
 
@@ -2297,10 +3354,6 @@ class StairwayDesign:
 
         xOrigin  = self.flatOriginX + 0
         yOrigin  = self.flatOriginY
-        xSpacing = self.flatSpaceX + self.stepGoing
-        ySpacing = self.flatSpaceY + self.stairWidth
-        modulo   = self.flatModulo
-        index    = 0
 
         # ------------------------------------------------------------------------------
         # Create parent component for layout stairs
@@ -2321,45 +3374,27 @@ class StairwayDesign:
 
         # ------------------------------------------------------------------------------
 
-        timeline: adsk.fusion.Timeline = design.timeline
         timelineStart = None
         timelineEnd   = None
 
+        # ------------------------------------------------------------------------------
+        # Fast build : the step bodies laid flat, all in one base feature
         # ------------------------------------------------------------------------------
 
-        for sourceOccurence in self.stepsGroupOccurence.childOccurrences:
-
-            col = index % modulo
-            row = math.floor( index / modulo )
+        bodies = [ ( reference, body, self.getLayoutMatrix3D( index, math.pi, self.stairThickness ) ) for index, ( reference, body ) in enumerate( self.fastBuildSteps ) ]
 
-            xDestination = row * xSpacing
-            yDestination = col * ySpacing
+        baseFeature = self.addFastBuildBodies( parentComponent, bodies, 'Step', 'Base Steps layout' )
 
-            # ------------------------------------------------------------------------------
+        if baseFeature != None:
+            timelineStart = self.getTimelineIndex( baseFeature )
 
-            # init matrix
-            matrixTransform = adsk.core.Matrix3D.create()
+        index = len( bodies )
 
-            # rotation
-            matrixRotation = adsk.core.Matrix3D.create()
-            matrixRotation.setToRotation(
-                -math.pi / 2,
-                adsk.core.Vector3D.create( z = 1 ),
-                adsk.core.Point3D.create( x = xDestination, y = yDestination )
-            )
-            matrixTransform.transformBy( matrixRotation )
+        # ------------------------------------------------------------------------------
 
-            # rotation 2
-            matrixRotation = adsk.core.Matrix3D.create()
-            matrixRotation.setToRotation(
-                math.pi,
-                adsk.core.Vector3D.create( y = 1 ),
-                adsk.core.Point3D.create( x = xDestination, y = yDestination )
-            )
-            matrixTransform.transformBy( matrixRotation )
+        for sourceOccurence in self.stepsGroupOccurence.childOccurrences:
 
-            # translation
-            matrixTransform.translation = adsk.core.Vector3D.create( xDestination, yDestination, self.stairThickness )
+            matrixTransform = self.getLayoutMatrix3D( index, math.pi, self.stairThickness )
 
             # add
             subOccurrence = subOccurrences.addExistingComponent( sourceOccurence.component, matrixTransform )
@@ -2367,9 +3402,9 @@ class StairwayDesign:
             # ------------------------------------------------------------------------------
 
             if timelineStart == None:
-                timelineStart = subOccurrence.timelineObject.index
+                timelineStart = self.getTimelineIndex( subOccurrence )
             else:
-                timelineEnd   = subOccurrence.timelineObject.index
+                timelineEnd   = self.getTimelineIndex( subOccurrence )
 
             # ------------------------------------------------------------------------------
 
@@ -2379,11 +3414,7 @@ class StairwayDesign:
 
         # Create timeline parent
 
-        timelineGroup = timeline.timelineGroups.add(
-            timelineStart,
-            timelineEnd
-        )
-        timelineGroup.name = f'Group Flatted Steps'
+        self.addTimelineGroup( timelineStart, timelineEnd, 'Group Flatted Steps' )
 
         # ------------------------------------------------------------------------------
 
@@ -2423,7 +3454,6 @@ class StairwayDesign:
 
         # ------------------------------------------------------------------------------
 
-        timeline: adsk.fusion.Timeline = design.timeline
         timelineStart = None
         timelineEnd   = None
 
@@ -2447,6 +3477,8 @@ class StairwayDesign:
         # Create risers
         # ------------------------------------------------------------------------------
 
+        fastBuildBodies: list = []      # ( reference, body, matrixTransform ) of the risers (fast build)
+
         for step, stair in self.stairs.items():
 
             # Break for the last stair is overlap
@@ -2476,6 +3508,25 @@ class StairwayDesign:
             matrixTranslation.translation = adsk.core.Vector3D.create( xTrans, yTrans, zTrans )
             matrixTransform.transformBy( matrixTranslation )
 
+            if step == 0:
+                distance = self.stepHeight + self.riserGroove - self.stairThickness
+            else:
+                distance = self.stepHeight + self.riserGroove
+
+            # ------------------------------------------------------------------------------
+            # Fast build : only the body, added with the others after the loop (see addFastBuildBodies)
+            # ------------------------------------------------------------------------------
+
+            if self.isFastBuild:
+
+                ( temporaryBody, _ ) = self.createRiserBody3D( step, stair, distance )
+
+                if temporaryBody != None:
+                    fastBuildBodies.append( ( reference, temporaryBody, matrixTransform ) )
+                    continue
+
+                # the strings are not lines and arcs : the riser is built with its sketch
+
             # Create sub occurence
 
             subOccurrence: adsk.fusion.Occurrence = subOccurrences.addNewComponent( matrixTransform )
@@ -2495,15 +3546,42 @@ class StairwayDesign:
             # ------------------------------------------------------------------------------
 
             if timelineStart == None:
-                timelineStart = subOccurrence.timelineObject.index
+                timelineStart = self.getTimelineIndex( subOccurrence )
 
             # ------------------------------------------------------------------------------
             # Extrude riser
             # ------------------------------------------------------------------------------
 
-            body = None
+            body       = None
+            isToolsCut = False      # rabbet already cut in the body
+            faceSource = None       # extrude feature or body to find the faces (see getBodyFaceByRole)
+            faceRoles  = None       # index of the body faces by role (see createPrismBody3D)
+
+            if self.IS_BREP_BODIES and not self.isFastBuild:
+
+                ( temporaryBody, faceRoles ) = self.createRiserBody3D( step, stair, distance )
+
+                # all the bodies of the component in one base feature : the riser is the only body of its component
+
+                if temporaryBody != None:
+
+                    ( ( body, ), baseFeature ) = addBaseFeatureBodies( subComponent, [ temporaryBody ] )
+
+                    body.name  = f'Body Riser {reference}'
+                    isToolsCut = True
+                    faceSource = body
+
+                    if baseFeature != None:
 
-            if True:
+                        baseFeature.name = f'Base Riser {reference}'
+
+                        # ------------------------------------------------------------------------------
+
+                        timelineEnd = self.getTimelineIndex( baseFeature ) # timeline last operation
+
+            # sketch and extrude when the strings are not lines and arcs
+
+            if body == None:
 
                 # Create sketch on xyPlane
 
@@ -2521,7 +3599,7 @@ class StairwayDesign:
 
                 # ------------------------------------------------------------------------------
 
-                timelineEnd = sketchBase.timelineObject.index # timeline last operation
+                timelineEnd = self.getTimelineIndex( sketchBase ) # timeline last operation
 
                 # ------------------------------------------------------------------------------
 
@@ -2551,12 +3629,6 @@ class StairwayDesign:
 
                 if True and len( sketchBase.profiles ) > 0:
 
-                    if step == 0:
-                        distance = self.stepHeight + self.riserGroove - self.stairThickness
-                    else:
-                        distance = self.stepHeight + self.riserGroove
-
-
                     profileExtrude: adsk.fusion.Profile = sketchBase.profiles.item( 0 )
                     distanceExtrude = adsk.core.ValueInput.createByReal( distance )
 
@@ -2569,10 +3641,11 @@ class StairwayDesign:
 
                     body: adsk.fusion.BRepBody = extrudeFeature.bodies.item( 0 )
                     body.name = f'Body Riser {reference}'
+                    faceSource = extrudeFeature
 
                     # ------------------------------------------------------------------------------
 
-                    timelineEnd = extrudeFeature.timelineObject.index # timeline last operation
+                    timelineEnd = self.getTimelineIndex( extrudeFeature ) # timeline last operation
 
             # ------------------------------------------------------------------------------
             # Engraving riser number on BOTTOM face
@@ -2587,8 +3660,7 @@ class StairwayDesign:
                 # faceFront  = min( faces, key = ( lambda f: f.centroid.y ) )
                 # faceBack   = max( faces, key = ( lambda f: f.centroid.y ) )
 
-                faces:    adsk.fusion.BRepFaces = body.faces
-                faceBack: adsk.fusion.BRepFace  = max( faces, key = ( lambda f: f.centroid.y ) ) # back face
+                faceBack: adsk.fusion.BRepFace  = self.getBodyFaceByRole( faceSource, 'Back', faceRoles, step, stair[ 'GrooveLine3D_1' ], stair[ 'GrooveLine3D_1' ], stair[ 'GrooveLine3D_2' ] ) # back face
 
                 # create sketch on 'bottom' face
 
@@ -2606,7 +3678,7 @@ class StairwayDesign:
 
                 # ------------------------------------------------------------------------------
 
-                timelineEnd = sketchEngrave.timelineObject.index # timeline last operation
+                timelineEnd = self.getTimelineIndex( sketchEngrave ) # timeline last operation
 
                 # ------------------------------------------------------------------------------
 
@@ -2694,14 +3766,14 @@ class StairwayDesign:
 
                 # ------------------------------------------------------------------------------
 
-                timelineEnd =  extrudeText.timelineObject.index # timeline last operation
+                timelineEnd =  self.getTimelineIndex( extrudeText ) # timeline last operation
 
 
             # ------------------------------------------------------------------------------
             # Make a rabbet in riser for stair (cut) on FRONT face
             # ------------------------------------------------------------------------------
 
-            if body != None and self.isRiserStair() and self.riserRabbet > 0 and step > 0:
+            if body != None and not isToolsCut and self.isRiserStair() and self.riserRabbet > 0 and step > 0:
 
                 # faceTop    = max( faces, key = ( lambda f: f.centroid.z ) )
                 # faceBottom = min( faces, key = ( lambda f: f.centroid.z ) )
@@ -2710,9 +3782,7 @@ class StairwayDesign:
                 # faceFront  = min( faces, key = ( lambda f: f.centroid.y ) )
                 # faceBack   = max( faces, key = ( lambda f: f.centroid.y ) )
 
-                faces:     adsk.fusion.BRepFaces = body.faces
-                faceFront: adsk.fusion.BRepFace  = min( faces, key = ( lambda f: f.centroid.y ) ) # front face
-                #faceBack: adsk.fusion.BRepFace  = max( faces, key = ( lambda f: f.centroid.y ) ) # back face
+                faceFront: adsk.fusion.BRepFace  = self.getBodyFaceByRole( faceSource, 'Front', faceRoles, step, stair[ 'GrooveLine3D_1' ], stair[ 'GrooveLine3D_1' ], stair[ 'GrooveLine3D_2' ] ) # front face
 
                 # ------------------------------------------------------------------------------
                 # Create sketch on 'front' face
@@ -2731,7 +3801,7 @@ class StairwayDesign:
 
                 # ------------------------------------------------------------------------------
 
-                timelineEnd = sketchRabbet.timelineObject.index # timeline last operation
+                timelineEnd = self.getTimelineIndex( sketchRabbet ) # timeline last operation
 
                 # ------------------------------------------------------------------------------
                 # Draw rabbet ractangle extended on X
@@ -2768,26 +3838,32 @@ class StairwayDesign:
 
                     # ------------------------------------------------------------------------------
 
-                    timelineEnd = extrudeRabbet.timelineObject.index # timeline last operation
+                    timelineEnd = self.getTimelineIndex( extrudeRabbet ) # timeline last operation
 
                 # ------------------------------------------------------------------------------
 
                 sketchRabbet.isVisible = False
                 sketchRabbet.isComputeDeferred = False
 
+        # ------------------------------------------------------------------------------
+        # Fast build : all the risers in one base feature of the parent component
+        # ------------------------------------------------------------------------------
+
+        baseFeature = self.addFastBuildBodies( parentComponent, fastBuildBodies, 'Riser', 'Base Risers' )
+
+        if baseFeature != None and timelineStart != None:
+            timelineEnd = self.getTimelineIndex( baseFeature ) # timeline last operation
+
         # ------------------------------------------------------------------------------
         # Create timeline group
         # ------------------------------------------------------------------------------
 
-        timelineGroup = timeline.timelineGroups.add(
-            timelineStart,
-            timelineEnd
-        )
-        timelineGroup.name = f'Group Risers'
+        self.addTimelineGroup( timelineStart, timelineEnd, 'Group Risers' )
 
         # ------------------------------------------------------------------------------
 
         self.risersGroupOccurence = parentOccurrence
+        self.fastBuildRisers      = [ ( reference, body ) for ( reference, body, _ ) in fastBuildBodies ]
 
         return True
 
@@ -2818,10 +3894,6 @@ class StairwayDesign:
 
         xOrigin  = self.flatOriginX + 500
         yOrigin  = self.flatOriginY
-        xSpacing = self.flatSpaceX + self.stepGoing
-        ySpacing = self.flatSpaceY + self.stairWidth
-        modulo   = self.flatModulo
-        index    = 0
 
         # ------------------------------------------------------------------------------
         # Create parent component for layout risers
@@ -2840,37 +3912,27 @@ class StairwayDesign:
 
         # ------------------------------------------------------------------------------
 
-        timeline: adsk.fusion.Timeline = design.timeline
         timelineStart = None
         timelineEnd   = None
 
-        for sourceOccurence in self.risersGroupOccurence.childOccurrences:
+        # ------------------------------------------------------------------------------
+        # Fast build : the riser bodies laid flat, all in one base feature
+        # ------------------------------------------------------------------------------
 
-            col = index % modulo
-            row = math.floor( index / modulo )
+        bodies = [ ( reference, body, self.getLayoutMatrix3D( index, math.pi / 2, self.riserThickness ) ) for index, ( reference, body ) in enumerate( self.fastBuildRisers ) ]
 
-            xDestination = row * xSpacing
-            yDestination = col * ySpacing
+        baseFeature = self.addFastBuildBodies( parentComponent, bodies, 'Riser', 'Base Risers layout' )
 
-            # ------------------------------------------------------------------------------
+        if baseFeature != None:
+            timelineStart = self.getTimelineIndex( baseFeature )
 
-            # init matrix
-            matrixTransform = adsk.core.Matrix3D.create()
+        index = len( bodies )
 
-            # rotation
-            zAxis = adsk.core.Vector3D.create( z = 1 )
-            matrixRotation = adsk.core.Matrix3D.create()
-            matrixRotation.setToRotation( - math.pi / 2, zAxis, adsk.core.Point3D.create( x = xDestination, y = yDestination ) )
-            matrixTransform.transformBy( matrixRotation )
+        # ------------------------------------------------------------------------------
 
-            # rotation2
-            zAxis = adsk.core.Vector3D.create( y = 1 )
-            matrixRotation = adsk.core.Matrix3D.create()
-            matrixRotation.setToRotation( math.pi / 2, zAxis, adsk.core.Point3D.create( x = xDestination, y = yDestination ) )
-            matrixTransform.transformBy( matrixRotation )
+        for sourceOccurence in self.risersGroupOccurence.childOccurrences:
 
-            # translation
-            matrixTransform.translation = adsk.core.Vector3D.create( xDestination, yDestination, self.riserThickness )
+            matrixTransform = self.getLayoutMatrix3D( index, math.pi / 2, self.riserThickness )
 
             # add
             subOccurrence = subOccurrences.addExistingComponent( sourceOccurence.component, matrixTransform )
@@ -2878,9 +3940,9 @@ class StairwayDesign:
             # ------------------------------------------------------------------------------
 
             if timelineStart == None:
-                timelineStart = subOccurrence.timelineObject.index
+                timelineStart = self.getTimelineIndex( subOccurrence )
             else:
-                timelineEnd   = subOccurrence.timelineObject.index
+                timelineEnd   = self.getTimelineIndex( subOccurrence )
 
             index += 1
 
@@ -2888,11 +3950,7 @@ class StairwayDesign:
 
         # Create timeline parent
 
-        timelineGroup = timeline.timelineGroups.add(
-            timelineStart,
-            timelineEnd
-        )
-        timelineGroup.name = f'Group Flatted Risers'
+        self.addTimelineGroup( timelineStart, timelineEnd, 'Group Flatted Risers' )
 
         # ------------------------------------------------------------------------------
 
@@ -3161,15 +4219,15 @@ class StairwayDesign:
 
         data: dict = {}
 
-        for step in range( 0, self.stepNumber + 1 ):
+        # compute walkDistance, limited to the total length
 
-            # compute walkDistance
+        walkDistances = [ min( ( self.stepGoing * step ) + self.startLength - offset, self.totalLength ) for step in range( 0, self.stepNumber + 1 ) ]
 
-            walkDistance = ( self.stepGoing * step ) + self.startLength - offset
+        # evaluate all the steps in one batch
 
-            # limit walkDistance
+        walkDatas = self.getDataAtLengths( walkDistances, self.walkCurvesSKT )
 
-            walkDistance = min( walkDistance, self.totalLength )
+        for step, walkDistance in enumerate( walkDistances ):
 
             # ------------------------------------------------------------------------------
 
@@ -3182,7 +4240,7 @@ class StairwayDesign:
 
             # ------------------------------------------------------------------------------
 
-            ( isDataAtLength, walkPoint3D, walkCurveSKT, walkTangentVector ) = self.getDataAtLength( walkDistance, self.walkCurvesSKT )
+            ( isDataAtLength, walkPoint3D, walkCurveSKT, walkTangentVector, walkCurveId ) = walkDatas[ step ]
 
             if isDataAtLength:
 
@@ -3217,6 +4275,7 @@ class StairwayDesign:
                 data[ step ] = {
                     'Point3D':         walkPoint3D,
                     'CurveSKT':        walkCurveSKT,
+                    'CurveId':         walkCurveId,
                     'Distance':        walkDistance,
                     'CrosswiseLine3D': walkCrosswiseLine3D
                 }
@@ -3233,110 +4292,169 @@ class StairwayDesign:
 
         # ------------------------------------------------------------------------------
 
-        data: dict = {}
+        data: dict = {}
+
+        # analytic intersection for lines and arcs, the distance is given by the walkpath
+
+        walkPath: WalkPath = self.getWalkPath( curves )
+
+        if walkPath != None:
+
+            for step, walkData in walkData.items():
+
+                crosswiseLine3D: adsk.core.Line3D = walkData[ 'CrosswiseLine3D' ]
+
+                ( isFound, point, curveId, length ) = intersectLineWalkPath2D(
+                    ( crosswiseLine3D.startPoint.x, crosswiseLine3D.startPoint.y ),
+                    ( crosswiseLine3D.endPoint.x,   crosswiseLine3D.endPoint.y ),
+                    walkPath
+                )
+
+                if isFound:
+
+                    data[ step ] = {
+                        'Point3D'  : adsk.core.Point3D.create( point[ 0 ], point[ 1 ], 0 ),
+                        'CurveSKT' : curves[ curveId ],
+                        'CurveId'  : curveId,
+                        'Distance' : length
+                    }
+
+            return data
+
+        # ------------------------------------------------------------------------------
+        # NURBS for others curves
+
+        ( bigCurves, evaluator, startP, endP ) = self.getBigNurbsCurve( curves )
+
+        for step, walkData in walkData.items():
+
+            # get the nearest point to the intersection of a line with curves
+
+            ( isFound, nearestPoint3D, nearestCurveSKT, nearestCurveId ) = self.getNearestPointIntersectLineOnCurves( walkData[ 'CrosswiseLine3D' ], curves, False)
+
+            if isFound:
+
+                # add dict, the distance is computed after for all the steps
+
+                data[ step ] = {
+                    'Point3D'  : nearestPoint3D,
+                    'CurveSKT' : nearestCurveSKT,
+                    'CurveId'  : nearestCurveId,
+                    'Distance' : None
+                }
+
+        # ------------------------------------------------------------------------------
+
+        # compute distances, parameters of all the points in one call
+
+        if len( data ) > 0:
+
+            points = [ stepData[ 'Point3D' ] for stepData in data.values() ]
+
+            ( isParameters, parameters ) = evaluator.getParametersAtPoints( points )
 
-        bigCurves: adsk.core.NurbsCurve3D = getBigNurbsCurve( curves )
+            if isParameters:
 
-        # ------------------------------------------------------------------------------
+                for stepData, parameter in zip( data.values(), parameters ):
 
-        for step, walkData in walkData.items():
+                    ( isLength, length )   = evaluator.getLengthAtParameter( startP, parameter )
+                    stepData[ 'Distance' ] = length
 
-            # get the nearest point to the intersection of a line with curves
+        # ------------------------------------------------------------------------------
 
-            ( isFound, nearestPoint3D, nearestCurveSKT, nearestCurveId ) = self.getNearestPointIntersectLineOnCurves( walkData[ 'CrosswiseLine3D' ], curves, False)
+        return data
 
-            if isFound:
 
-                # compute distance
+    def getDataAtLength( self, length: float, curves: list ):
 
-                #( isLength, length ) = getLengthAtPointOnCurves( nearestPoint, curves )
+        return self.getDataAtLengths( [ length ], curves )[ 0 ][ :4 ]
 
-                ( _, startP, endP )   = bigCurves.evaluator.getParameterExtents()
-                ( _, parameter )      = bigCurves.evaluator.getParameterAtPoint( nearestPoint3D )
-                ( isLength, length )  = bigCurves.evaluator.getLengthAtParameter( startP, parameter )
 
-                # add dict
+    def getDataAtLengths( self, lengths: list, curves: list ) -> list:
+        "Return a list of ( isFound, point, curveSKT, tangent, curveId ), the lengths are evaluated in one batch per curve"
 
-                data[ step ] = {
-                    'Point3D'  : nearestPoint3D,
-                    'CurveSKT' : nearestCurveSKT,
-                    'Distance' : length
-                }
+        result: list = [ ( False, None, None, None, None ) ] * len( lengths )
 
-        # ------------------------------------------------------------------------------
+        # analytic evaluation for lines and arcs
 
-        return data
+        walkPath: WalkPath = self.getWalkPath( curves )
 
+        if walkPath != None:
 
-    def getDataAtLength( self, length: float, curves: list ):
+            for index, length in enumerate( lengths ):
 
-        ( isFound, curveId, curveSKT, startCurve ) = self.getCurveFromLength( length, curves )
+                ( isFound, point, curveId, tangent ) = walkPath.getDataAtLength( length )
 
-        if not isFound:
-            futil.log( 'NOT FOUND for curveId {} - length {}'.format( curveId, length * 10 ) )
+                if not isFound:
+                    futil.log( 'NOT FOUND on walkpath - length {}'.format( length * 10 ) )
+                    continue
 
+                result[ index ] = (
+                    True,
+                    adsk.core.Point3D.create( point[ 0 ], point[ 1 ], 0 ),
+                    curves[ curveId ],
+                    adsk.core.Vector3D.create( tangent[ 0 ], tangent[ 1 ], 0 ),
+                    curveId
+                )
 
-        if isFound:
+            return result
 
-            nurbs = curveSKT.geometry.asNurbsCurve
+        # ------------------------------------------------------------------------------
+        # NURBS evaluation for others curves : group the lengths by curve
 
-            # test if need to reverse the nurbs curve
+        curveIndex: CurveLengthIndex = self.getCurveIndex( curves )
+        lengthsByCurve: dict         = {}
 
-            if curveId > 0:
+        for index, length in enumerate( lengths ):
 
-                prevWalkCurve = curves[ curveId - 1 ]
-                prevNurbs     = prevWalkCurve.geometry.asNurbsCurve
+            ( isFound, curveId, curveSKT, startCurve ) = self.getCurveFromLength( length, curves )
 
-                prevStart: adsk.core.Point3D = prevNurbs.controlPoints[ 0 ]
-                prevEnd:   adsk.core.Point3D = prevNurbs.controlPoints[ - 1 ] # last
+            if not isFound:
+                futil.log( 'NOT FOUND for curveId {} - length {}'.format( curveId, length * 10 ) )
+                continue
 
-                newStart:   adsk.core.Point3D = nurbs.controlPoints[ 0 ]
-                newEnd:     adsk.core.Point3D = nurbs.controlPoints[ - 1 ] # last
+            # clamp in the curve (rounding errors at both ends)
 
-                if prevEnd.isEqualTo( newEnd ):
-                    nurbs = reverseNurbsCurve( nurbs )
+            curveLength = min( max( length - startCurve, 0 ), curveIndex.lengths[ curveId ] )
 
+            lengthsByCurve.setdefault( curveId, [] ).append( ( index, curveLength ) )
 
-            # get paramLength
+        curveChain: CurveChain = self.getCurveChain( curves )
 
-            ( _, startP, endP )       = nurbs.evaluator.getParameterExtents()
-            ( isLength, paramLength ) = nurbs.evaluator.getParameterAtLength( startP, length - startCurve )
-            if isLength:
+        for curveId, items in lengthsByCurve.items():
 
-                # get point
+            curveSKT   = curves[ curveId ]
+            isReversed = curveChain.isReversed[ curveId ]
 
-                ( isPoint, point ) = nurbs.evaluator.getPointAtParameter( paramLength )
-                if isPoint:
+            # a reversed curve is evaluated from its end : length - s, and the tangents are turned over
 
-                    # get tangent
+            curveLengths = [ curveIndex.lengths[ curveId ] - curveLength  if( isReversed )  else curveLength for ( _, curveLength ) in items ]
 
-                    ( isTangent, tangentVector ) = nurbs.evaluator.getTangent( paramLength )
-                    if isTangent:
+            # get points and tangents in one call for all the lengths on this curve
 
-                        return ( True, point, curveSKT, tangentVector )
+            ( isOK, _, points, tangents ) = evaluateAtLengths( curveSKT.geometry.evaluator, curveLengths )
 
-        return ( False, None, None, None )
+            if isOK:
 
+                for ( index, _ ), point, tangent in zip( items, points, tangents ):
 
-    def getCurveFromLength( self, length: float, curves: list ):
+                    if isReversed:
+                        tangent.scaleBy( -1 )
 
-        prevLength = 0
-        isFound    = False
+                    result[ index ] = ( True, point, curveSKT, tangent, curveId )
 
-        for curveId, curveSKT in enumerate( curves ):
+        return result
 
-            lengthCurve = curveSKT.length
-            startCurve  = prevLength
-            endCurve    = prevLength + lengthCurve
 
-            if startCurve <= length <= endCurve:
-                return ( True, curveId, curveSKT, startCurve )
+    def getCurveFromLength( self, length: float, curves: list ):
+        "Return ( isFound, curveId, curveSKT, startCurve ), beyond the end ( False, len( curves ), None, totalLength )"
 
-            prevLength = prevLength + lengthCurve
+        ( isFound, curveId, startCurve ) = self.getCurveIndex( curves ).getIdFromLength( length )
 
-        #return ( isFound, curveId, curveSKT, None )
+        if not isFound:
+            return ( False, curveId, None, startCurve )
 
-        return ( True, len( curves ) - 1, curves[ -1 ], startCurve ) # WORKAROUND : get the last curve if not found
+        return ( True, curveId, curves[ curveId ], startCurve )
 
 
     # ------------------------------------------------------------------------------
@@ -3397,67 +4515,30 @@ class StairwayDesign:
 
         data: dict = {}
 
-        for step, radiatingStep in radiatingSteps.items():
-
-            walkPoint3D:   adsk.core.Point3D = radiatingStep[ 'Walk' ]   [ 'Point3D' ]
-            insidePoint3D: adsk.core.Point3D = radiatingStep[ 'Inside' ] [ 'Point3D' ]
-
-            # walkLineSKT = sketchLines.addByTwoPoints( walkPoint3D, insidePoint3D )
-            # walkLineSKT.isConstruction = True
-
-
-            # ------------------------------------------------------------------------------
-
-            distance = walkPoint3D.distanceTo( insidePoint3D )
-
-            xDelta = walkPoint3D.x - insidePoint3D.x
-            yDelta = walkPoint3D.y - insidePoint3D.y
-
-            distX  = xDelta / distance * abs( offset )
-            distY  = yDelta / distance * abs( offset )
-
-            # ------------------------------------------------------------------------------
-
-            startPoint3D = walkPoint3D
-
-            vectorXY = adsk.core.Vector3D.create( distX, distY, 0 )
-            vectorXY.add( startPoint3D.asVector() )
-
-            endPoint3D   = vectorXY.asPoint()
+        # offset all the step lines ( walk, inside ) in one batch
 
+        steps     = list( radiatingSteps.keys() )
+        stepLines = []
 
-            # ------------------------------------------------------------------------------
-
-            vectorZ        = adsk.core.Vector3D.create( z = 1 ) # Z axis # need a XY plane
-            rotationMatrix = adsk.core.Matrix3D.create()
-            lineRotate3D   = adsk.core.Line3D.create( startPoint3D, endPoint3D )
+        for radiatingStep in radiatingSteps.values():
 
+            walkPoint3D:   adsk.core.Point3D = radiatingStep[ 'Walk' ]   [ 'Point3D' ]
+            insidePoint3D: adsk.core.Point3D = radiatingStep[ 'Inside' ] [ 'Point3D' ]
 
-            if offset > 0:
-                rotationMatrix.setToRotation( - math.pi / 2, vectorZ, startPoint3D )
-            else:
-                rotationMatrix.setToRotation(   math.pi / 2, vectorZ, startPoint3D )
-
-            lineRotate3D.transformBy( rotationMatrix )
+            stepLines.append( ( ( walkPoint3D.x, walkPoint3D.y ), ( insidePoint3D.x, insidePoint3D.y ) ) )
 
-            # ------------------------------------------------------------------------------
+        offsetLines = offsetStepLines2D( stepLines, offset )
 
-            # lineRotateSKT = sketchLines.addByTwoPoints( lineRotate3D.startPoint, lineRotate3D.endPoint  )
-            # lineRotateSKT.isConstruction = False
+        # ------------------------------------------------------------------------------
 
-            # ------------------------------------------------------------------------------
-            # ------------------------------------------------------------------------------
+        for step, offsetLine in zip( steps, offsetLines ):
 
-            newStartPoint3D = lineRotate3D.endPoint
-            newVectorXY     = adsk.core.Vector3D.create( distX, distY, 0 )
-            newVectorXY.add( newStartPoint3D.asVector() )
-            newEndPoint3D   = newVectorXY.asPoint()
-            newLineRotate3D = adsk.core.Line3D.create( newStartPoint3D, newEndPoint3D )
+            if offsetLine == None:
+                continue
 
-            # ------------------------------------------------------------------------------
+            ( x1, y1, x2, y2 ) = offsetLine
 
-            # newLineSKT = sketchLines.addByTwoPoints( newLineRotate3D.startPoint, newLineRotate3D.endPoint )
-            # newLineSKT.isConstruction = False
+            newLineRotate3D = adsk.core.Line3D.create( adsk.core.Point3D.create( x1, y1, 0 ), adsk.core.Point3D.create( x2, y2, 0 ) )
 
             # ------------------------------------------------------------------------------
 
@@ -3534,7 +4615,10 @@ class StairwayDesign:
         # compute balanced steps on 2nd string
         # ------------------------------------------------------------------------------
 
-        if True:
+        if self.IS_SYMMETRIC_BALANCING and self.isSymmetricBalancing():
+            self.mirrorBalancingSteps( balancingSteps )
+
+        else:
             self.computeBalancingStepsSection(
                 radiatingSteps,
                 balancingSteps,
@@ -3570,6 +4654,105 @@ class StairwayDesign:
         return balancingSteps
 
 
+    def isSymmetricBalancing( self ) -> bool:
+        "The 2nd balanced section is the mirror of the 1st one"
+
+        if self.stairAngle == 0 or self.flightBalanceDelta != 0:
+            return False
+
+        if self.flightLength1 != self.flightLength2 or self.flightBalanceProp1 != self.flightBalanceProp2:
+            return False
+
+        # the steps are symmetric on the walkpath only without front reserve : with a start length, the steps are
+        # symmetric around the middle of [ startLength, totalLength ] while the paths are symmetric around their middle
+
+        if abs( self.startLength ) > LENGTH_TOLERANCE:
+            return False
+
+        # check the geometry : each path must be mirrored on itself
+
+        axis = self.getSymmetryAxis()
+
+        if axis == None:
+            return False
+
+        ( axisPoint, axisNormal ) = axis
+
+        for curves in [ self.walkCurvesSKT, self.insideCurvesSKT, self.outsideCurvesSKT ]:
+
+            walkPath: WalkPath = self.getWalkPath( curves )
+
+            if walkPath == None:
+                return False
+
+            startPoint = walkPath.segments[ 0 ].startPoint
+            endPoint   = walkPath.segments[ -1 ].endPoint
+
+            if not isEqualPoint2D( reflectPoint2D( startPoint, axisPoint, axisNormal ), endPoint, 1e-4 ):
+                return False
+
+        return True
+
+
+    def getSymmetryAxis( self ) -> tuple:
+        "Return ( point, unit normal ) of the symmetry axis, through the middle of the walkpath and perpendicular to the walkpath"
+
+        walkPath: WalkPath = self.getWalkPath( self.walkCurvesSKT )
+
+        if walkPath == None:
+            return None
+
+        ( isFound, middlePoint, _, tangent ) = walkPath.getDataAtLength( walkPath.totalLength / 2 )
+
+        if not isFound:
+            return None
+
+        return ( middlePoint, tangent )
+
+
+    def mirrorBalancingSteps( self, balancingSteps: dict ):
+        "Add the 2nd balanced section by reflection of the 1st one, step N - k is the mirror of step k"
+
+        futil.log( f' > mirrorBalancingSteps()' )
+
+        # ------------------------------------------------------------------------------
+
+        ( axisPoint, axisNormal ) = self.getSymmetryAxis()
+
+        curvesByName = {
+            'Walk':    self.walkCurvesSKT,
+            'Inside':  self.insideCurvesSKT,
+            'Outside': self.outsideCurvesSKT
+        }
+
+        for step, balancingStep in list( balancingSteps.items() ):
+
+            mirrorStep = self.stepNumber - step
+
+            if mirrorStep in balancingSteps.keys():
+                continue
+
+            mirrorData: dict = {}
+
+            for name, curves in curvesByName.items():
+
+                point3D: adsk.core.Point3D = balancingStep[ name ][ 'Point3D' ]
+                walkPath: WalkPath         = self.getWalkPath( curves )
+
+                ( x, y )          = reflectPoint2D( ( point3D.x, point3D.y ), axisPoint, axisNormal )
+                length            = walkPath.getLengthAtPoint( ( x, y ) )
+                ( _, curveId, _ ) = walkPath.getSegmentFromLength( length )
+
+                mirrorData[ name ] = {
+                    'Point3D':  adsk.core.Point3D.create( x, y, 0 ),
+                    'CurveSKT': curves[ curveId ],
+                    'CurveId':  curveId,
+                    'Distance': length
+                }
+
+            balancingSteps[ mirrorStep ] = mirrorData
+
+
     def computeBalancingStepsSection( self,
             radiatingSteps:    dict,
             balancingSteps:    dict,
@@ -3638,7 +4821,17 @@ class StairwayDesign:
 
         harrowBalancedSteps = self.computeBalancingStepsHarrowMethod( self.stepGoing, self.stairWidth, self.insideRadius, walkLengthToBalance, balanceAngle )
 
-        for step, ( insideB, walkB, angleB ) in enumerate( harrowBalancedSteps ):
+        stepLines: list = []   # ( stepIndex, insideL, walkL )
+
+        # only the steps with a new step line (walkpath - inside) go to the geometry
+
+        for step, isStepLine in enumerate( harrowBalancedSteps[ 'IsStepLine' ] ):
+
+            if not isStepLine:
+                continue
+
+            insideB = harrowBalancedSteps[ 'Inside' ][ step ]
+            walkB   = harrowBalancedSteps[ 'Walk' ]  [ step ]
 
             if not isReverse:
                 stepIndex = stepStartIndex + step + 1 + walkOffsetBalanceStep
@@ -3650,53 +4843,59 @@ class StairwayDesign:
                 walkL     = data[ 'Walk' ] [ 'Distance' ]   - ( walkOffsetBalance   + walkB )
                 insideL   = data[ 'Inside' ] [ 'Distance' ] - ( insideOffsetBalance + insideB )
 
-            # ------------------------------------------------------------------------------
-
-            # draw the step line (walkpath - inside) if not already done
+            # draw the step line if not already done
 
-            isStepLine = True  if( round( ( step + 1 ) * self.stepGoing - walkB, 2 ) == 0.0 ) else False
+            if stepIndex not in balancingSteps.keys():
 
-            # futil.log( f' > : step       = {step}  -  insideB    = {insideB}      -  walkB      = {walkB}' )
-            # futil.log( f' > : stepIndex  = {stepIndex}  -  insideL    = {insideL}      -  walkL      = {walkL}' )
-            # futil.log( f' > : isStepLine = {isStepLine}' )
-            # futil.log( f' ' )
+                stepLines.append( ( stepIndex, insideL, walkL ) )
 
-            if isStepLine and stepIndex not in balancingSteps.keys():
+        # ------------------------------------------------------------------------------
 
-                # get insidePoint and walkPoint
+        # get insidePoints and walkPoints in one batch
 
-                ( isOK, insidePoint3D, insideCurveSKT, insideTangentVector ) = self.getDataAtLength( insideL, self.insideCurvesSKT )
-                ( isOK, walkPoint3D,   walkCurveSKT,   walkTangentVector )   = self.getDataAtLength( walkL,   self.walkCurvesSKT )
+        insideDatas = self.getDataAtLengths( [ insideL for ( _, insideL, _ ) in stepLines ], self.insideCurvesSKT )
+        walkDatas   = self.getDataAtLengths( [ walkL   for ( _, _, walkL )   in stepLines ], self.walkCurvesSKT )
 
-                # ------------------------------------------------------------------------------
-                # compute the step line (walkpath and outside)
+        for ( stepIndex, _, _ ), insideData, walkData in zip( stepLines, insideDatas, walkDatas ):
 
-                stepInsideLine3D = adsk.core.Line3D.create( insidePoint3D, walkPoint3D )
+            ( isInside, insidePoint3D, insideCurveSKT, insideTangentVector, insideCurveId ) = insideData
+            ( isWalk,   walkPoint3D,   walkCurveSKT,   walkTangentVector,   walkCurveId )   = walkData
 
-                ( isFound, outsidePoint3D, outsideCurveSKT, outsideCurveId ) = self.getNearestPointIntersectLineOnCurves( stepInsideLine3D, self.outsideCurvesSKT, False )
+            if not( isInside and isWalk ):
+                continue
 
-                if isFound:
+            # ------------------------------------------------------------------------------
+            # compute the step line (walkpath and outside)
 
-                    # add dict
+            stepInsideLine3D = adsk.core.Line3D.create( insidePoint3D, walkPoint3D )
 
-                    balancingSteps[ stepIndex ] = {
-                        #'Step':  stepIndex,
+            ( isFound, outsidePoint3D, outsideCurveSKT, outsideCurveId ) = self.getNearestPointIntersectLineOnCurves( stepInsideLine3D, self.outsideCurvesSKT, False )
 
-                        'Walk': {
-                            'Point3D':  walkPoint3D,
-                            'CurveSKT': walkCurveSKT
-                        },
+            if isFound:
 
-                        'Inside': {
-                            'Point3D':  insidePoint3D,
-                            'CurveSKT': insideCurveSKT
-                        },
+                # add dict
 
-                        'Outside': {
-                            'Point3D':  outsidePoint3D,
-                            'CurveSKT': outsideCurveSKT
-                        }
+                balancingSteps[ stepIndex ] = {
+                    #'Step':  stepIndex,
+
+                    'Walk': {
+                        'Point3D':  walkPoint3D,
+                        'CurveSKT': walkCurveSKT,
+                        'CurveId':  walkCurveId
+                    },
+
+                    'Inside': {
+                        'Point3D':  insidePoint3D,
+                        'CurveSKT': insideCurveSKT,
+                        'CurveId':  insideCurveId
+                    },
+
+                    'Outside': {
+                        'Point3D':  outsidePoint3D,
+                        'CurveSKT': outsideCurveSKT,
+                        'CurveId':  outsideCurveId
                     }
+                }
 
 
         # ------------------------------------------------------------------------------
@@ -3708,34 +4907,15 @@ class StairwayDesign:
             insideRadius:   float,
             straightLength: float,
             balanceAngleTo: float
-        ) -> list:
+        ) -> dict:
 
         futil.log( f' > : computeBalancingStepsHarrowMethod()' )
 
         # ------------------------------------------------------------------------------
 
-        result = []
-
-        walkpathRadius     = self.getWalkpathMaxiRadius( stairWidth )
-        walkpathBalance    = ( walkpathRadius * 2 + insideRadius * 2 ) * balanceAngleTo / 2
-        walkpathTotal      = straightLength + walkpathBalance
-        insidePathTotal    = straightLength + insideRadius * balanceAngleTo
-
-        stepNumberStraight = math.floor( straightLength / stepGoing )      # not used
-        stepNumber         = math.ceil( walkpathTotal / stepGoing )
-
-        angleB             = math.atan( walkpathTotal / insidePathTotal )
-        angleA             = math.pi - ( 2 * angleB )
-
-        for step in range( stepNumber ):
+        walkpathRadius = self.getWalkpathMaxiRadius( stairWidth )
 
-            walk   = stepGoing * ( step + 1 )  if( stepGoing * ( step + 1 ) < walkpathTotal )  else walkpathTotal
-            angle  = math.atan( walk / insidePathTotal )
-            inside = insidePathTotal / ( math.tan( angleA ) / math.tan( angle ) + 1 ) / math.cos( angleA )
-
-            result.append( [ inside, walk, angle ] )
-
-        return result
+        return computeHarrowBalancing( stepGoing, walkpathRadius, insideRadius, straightLength, balanceAngleTo )
 
 
     # ------------------------------------------------------------------------------
@@ -3765,14 +4945,338 @@ class StairwayDesign:
         return True
 
 
-    def getCurvesFromSelectedLines( self ) -> bool:
+    def getCurvesFromSelectedLines( self, isOutlineChanged: bool = True ) -> bool:
+
+        previousCurves = [ self.walkCurvesSKT, self.insideCurvesSKT, self.outsideCurvesSKT ]
 
         self.walkCurvesSKT    = self.sketch.findConnectedCurves( self.walkLine )
         self.insideCurvesSKT  = self.sketch.findConnectedCurves( self.insideLine )
         self.outsideCurvesSKT = self.sketch.findConnectedCurves( self.outsideLine )
 
+        # same outline : the walkpaths, the curve indexes and the merged curves are kept for the new curves
+
+        if not isOutlineChanged:
+            return self.moveCurvesCaches( previousCurves, [ self.walkCurvesSKT, self.insideCurvesSKT, self.outsideCurvesSKT ] )
+
+        self.walkPaths.clear()
+        self.curveIndexes.clear()
+        self.bigNurbsCurves.clear()
+        self.curveChains.clear()
+
+        return True
+
+
+    def moveCurvesCaches( self, previousCurves: list, newCurves: list ) -> bool:
+        "Key the geometry computed on the curves of the previous preview by the same curves drawn again"
+
+        futil.log( f' > moveCurvesCaches()' )
+
+        # ------------------------------------------------------------------------------
+
+        for cache in [ self.walkPaths, self.curveIndexes, self.bigNurbsCurves, self.curveChains ]:
+
+            # all the previous keys are removed before adding the new ones
+
+            values = [ cache.pop( id( curves ), None ) for curves in previousCurves ]
+
+            cache.clear()
+
+            for curves, value in zip( newCurves, values ):
+
+                if value != None:
+                    cache[ id( curves ) ] = value
+
+        return True
+
+
+    # ------------------------------------------------------------------------------
+    # CACHE OF COMPUTE RESULTS
+    # ------------------------------------------------------------------------------
+
+    def getComputeKey( self, isBalancing: bool = None ) -> tuple:
+        "Canonical tuple of the inputs used to compute the steps, isBalancing is the preview balancing option if None"
+
+        if isBalancing == None:
+            isBalancing = self.isPreviewBalancing
+
+        return makeCacheKey( [
+            self.stairWidth,
+            self.walkpathRadius,
+            self.insideRadius,
+            self.stairAngle,
+            self.flightLength1,
+            self.flightLength2,
+            self.startLength,
+            self.stepNumber,
+            self.isOverlapStair(),
+            self.overlapLength,
+            self.isRiserStair(),
+            self.riserThickness,
+            self.riserRabbet,
+            isBalancing,
+            self.flightBalanceProp1,
+            self.flightBalanceProp2,
+            self.flightBalanceDelta
+        ] )
+
+
+    def submitCompute( self, computeKey: tuple ) -> bool:
+        "Compute the steps in the worker thread if the paths are lines and arcs, False to compute in the main thread"
+
+        walkPaths: dict = {
+            'Walk':    self.getWalkPath( self.walkCurvesSKT ),
+            'Inside':  self.getWalkPath( self.insideCurvesSKT ),
+            'Outside': self.getWalkPath( self.outsideCurvesSKT )
+        }
+
+        # nurbs curves need the API
+
+        if None in walkPaths.values():
+            return False
+
+        isSubmitted = self.computeWorker.submit( computeKey, computeStepsPacked, walkPaths, self.getComputeValues() )
+
+        # the failed computes are done in the main thread, their errors are logged here (no API call in the worker thread)
+
+        for error in self.computeWorker.takeErrors():
+            futil.log( f'===== Error =====\nsubmitCompute() : compute failed in the worker thread\n{error}', adsk.core.LogLevels.ErrorLogLevel )
+
+        return isSubmitted
+
+
+    def getComputeValues( self ) -> dict:
+        "Copy of the values used by computeStepsPacked(), the worker thread does not read the object"
+
+        isSymmetric = self.isPreviewBalancing and self.IS_SYMMETRIC_BALANCING and self.isSymmetricBalancing()
+
+        return {
+            'stepNumber':         self.stepNumber,
+            'stepGoing':          self.stepGoing,
+            'startLength':        self.startLength,
+            'totalLength':        self.totalLength,
+            'stairAngle':         self.stairAngle,
+            'insideRadius':       self.insideRadius,
+            'walkpathMaxiRadius': self.getWalkpathMaxiRadius( self.stairWidth ),
+            'isOverlap':          self.isOverlapStair(),
+            'overlapLength':      self.overlapLength,
+            'isRiser':            self.isRiserStair(),
+            'riserThickness':     self.riserThickness,
+            'riserRabbet':        self.riserRabbet,
+            'isBalancing':        self.isPreviewBalancing,
+            'flightBalanceProp1': self.flightBalanceProp1,
+            'flightBalanceProp2': self.flightBalanceProp2,
+            'flightBalanceDelta': self.flightBalanceDelta,
+            'symmetryAxis':       self.getSymmetryAxis()  if( isSymmetric )  else None
+        }
+
+
+    def getExecuteComputeResult( self ) -> tuple:
+        "Compute result of the last preview (or from the cache) if it matches the inputs of execute, None if not"
+
+        # execute always computes the balancing steps
+
+        executeKey = self.getComputeKey( isBalancing = True )
+
+        if self.previewProduct != None and self.previewProduct[ 0 ] == executeKey:
+            return self.previewProduct[ 1 ]
+
+        return self.computeCache.get( executeKey )
+
+
+    def packComputeResult( self ) -> tuple:
+        "Steps as plain coordinates, without API objects"
+
+        return (
+            self.packSteps( self.walkSteps, isNamed = False ),
+            self.packSteps( self.radiatingSteps ),
+            self.packSteps( self.radiatingStepsOverlap ),
+            self.packSteps( self.radiatingStepsRiser ),
+            self.packSteps( self.radiatingStepsBack ),
+            self.packSteps( self.balancingSteps ),
+            self.packSteps( self.balancingStepsOverlap ),
+            self.packSteps( self.balancingStepsRiser ),
+            self.packSteps( self.balancingStepsBack )
+        )
+
+
+    def unpackComputeResult( self, computeResult: tuple ) -> bool:
+
+        self.walkSteps             = self.unpackSteps( computeResult[ 0 ], isNamed = False )
+        self.radiatingSteps        = self.unpackSteps( computeResult[ 1 ] )
+        self.radiatingStepsOverlap = self.unpackSteps( computeResult[ 2 ] )
+        self.radiatingStepsRiser   = self.unpackSteps( computeResult[ 3 ] )
+        self.radiatingStepsBack    = self.unpackSteps( computeResult[ 4 ] )
+        self.balancingSteps        = self.unpackSteps( computeResult[ 5 ] )
+        self.balancingStepsOverlap = self.unpackSteps( computeResult[ 6 ] )
+        self.balancingStepsRiser   = self.unpackSteps( computeResult[ 7 ] )
+        self.balancingStepsBack    = self.unpackSteps( computeResult[ 8 ] )
+
+        return True
+
+
+    def packSteps( self, steps: dict, isNamed: bool = True ) -> tuple:
+        "( step, data ) with data = ( ( name, entry ), ... ) for steps by Walk / Inside / Outside, entry if not isNamed"
+
+        packed = []
+
+        for step, stepData in steps.items():
+
+            if isNamed:
+                packed.append( ( step, tuple( ( name, self.packStepEntry( entry ) ) for name, entry in stepData.items() ) ) )
+            else:
+                packed.append( ( step, self.packStepEntry( stepData ) ) )
+
+        return tuple( packed )
+
+
+    def unpackSteps( self, packed: tuple, isNamed: bool = True ) -> dict:
+
+        curvesByName = {
+            'Walk':    self.walkCurvesSKT,
+            'Inside':  self.insideCurvesSKT,
+            'Outside': self.outsideCurvesSKT
+        }
+
+        steps: dict = {}
+
+        for step, stepData in packed:
+
+            if isNamed:
+                steps[ step ] = { name: self.unpackStepEntry( entry, curvesByName[ name ] ) for name, entry in stepData }
+            else:
+                steps[ step ] = self.unpackStepEntry( stepData, self.walkCurvesSKT )
+
+        return steps
+
+
+    def packStepEntry( self, entry: dict ) -> tuple:
+        "( x, y, curveId, distance, crosswise line ( x1, y1, x2, y2 ) ), None for an empty entry"
+
+        if len( entry ) == 0:
+            return None
+
+        point3D: adsk.core.Point3D   = entry[ 'Point3D' ]
+        crosswise: adsk.core.Line3D  = entry.get( 'CrosswiseLine3D' )
+
+        if crosswise != None:
+            crosswise = ( crosswise.startPoint.x, crosswise.startPoint.y, crosswise.endPoint.x, crosswise.endPoint.y )
+
+        return ( point3D.x, point3D.y, entry.get( 'CurveId' ), entry.get( 'Distance' ), crosswise )
+
+
+    def unpackStepEntry( self, packed: tuple, curves: list ) -> dict:
+
+        if packed == None:
+            return {}
+
+        ( x, y, curveId, distance, crosswise ) = packed
+
+        entry: dict = {
+            'Point3D':  adsk.core.Point3D.create( x, y, 0 ),
+            'CurveSKT': curves[ curveId ]  if( curveId != None )  else None,
+            'CurveId':  curveId
+        }
+
+        if distance != None:
+            entry[ 'Distance' ] = distance
+
+        if crosswise != None:
+            entry[ 'CrosswiseLine3D' ] = adsk.core.Line3D.create(
+                adsk.core.Point3D.create( crosswise[ 0 ], crosswise[ 1 ], 0 ),
+                adsk.core.Point3D.create( crosswise[ 2 ], crosswise[ 3 ], 0 )
+            )
+
+        return entry
+
+
+    def clearSteps( self ) -> bool:
+        "Forget the steps computed on the curves of a previous outline"
+
+        self.walkSteps             = {}
+        self.radiatingSteps        = {}
+        self.radiatingStepsOverlap = {}
+        self.radiatingStepsRiser   = {}
+        self.radiatingStepsBack    = {}
+        self.balancingSteps        = {}
+        self.balancingStepsOverlap = {}
+        self.balancingStepsRiser   = {}
+        self.balancingStepsBack    = {}
+
+        return True
+
+
+    def rebindStepsCurves( self ) -> bool:
+        "Bind the sketch curves of the steps computed in a previous preview to the curves drawn again, by their id"
+
+        curvesByName = {
+            'Walk':    self.walkCurvesSKT,
+            'Inside':  self.insideCurvesSKT,
+            'Outside': self.outsideCurvesSKT
+        }
+
+        for stepData in self.walkSteps.values():
+            stepData[ 'CurveSKT' ] = self.walkCurvesSKT[ stepData[ 'CurveId' ] ]
+
+        for steps in [
+                self.radiatingSteps, self.radiatingStepsOverlap, self.radiatingStepsRiser, self.radiatingStepsBack,
+                self.balancingSteps, self.balancingStepsOverlap, self.balancingStepsRiser, self.balancingStepsBack
+            ]:
+
+            for stepData in steps.values():
+
+                for name, curves in curvesByName.items():
+
+                    if name in stepData and stepData[ name ].get( 'CurveId' ) != None:
+                        stepData[ name ][ 'CurveSKT' ] = curves[ stepData[ name ][ 'CurveId' ] ]
+
         return True
 
+
+    def getCurveIndex( self, curves: list ) -> CurveLengthIndex:
+
+        key = id( curves )
+
+        if key not in self.curveIndexes:
+            self.curveIndexes[ key ] = CurveLengthIndex( [ curveSKT.length for curveSKT in curves ] )
+
+        return self.curveIndexes[ key ]
+
+
+    def getBigNurbsCurve( self, curves: list ) -> tuple:
+        "Return ( bigCurve, evaluator, startP, endP ), the merged nurbs curve is computed once per connected curves"
+
+        key = id( curves )
+
+        if key not in self.bigNurbsCurves:
+
+            bigCurve: adsk.core.NurbsCurve3D       = getBigNurbsCurve( curves, self.getCurveChain( curves ).isReversed )
+            evaluator: adsk.core.CurveEvaluator3D  = bigCurve.evaluator
+            ( _, startP, endP )                    = evaluator.getParameterExtents()
+
+            self.bigNurbsCurves[ key ] = ( bigCurve, evaluator, startP, endP )
+
+        return self.bigNurbsCurves[ key ]
+
+
+    def getCurveChain( self, curves: list ) -> CurveChain:
+
+        key = id( curves )
+
+        if key not in self.curveChains:
+            self.curveChains[ key ] = CurveChain( curves )
+
+        return self.curveChains[ key ]
+
+
+    def getWalkPath( self, curves: list ) -> WalkPath:
+
+        key = id( curves )
+
+        if key not in self.walkPaths:
+            self.walkPaths[ key ] = getWalkPathFromCurves( curves )
+
+        return self.walkPaths[ key ]
+
     # ------------------------------------------------------------------------------
 
     def getNearestPointIntersectLineOnCurves( self,
@@ -3783,6 +5287,27 @@ class StairwayDesign:
 
         """Get the nearest point to the intersection of a line with curves"""
 
+        # analytic intersection for lines and arcs
+
+        walkPath: WalkPath = self.getWalkPath( curves )
+
+        if walkPath != None:
+
+            ( isFound, point, curveId, _ ) = intersectLineWalkPath2D(
+                ( line3D.startPoint.x, line3D.startPoint.y ),
+                ( line3D.endPoint.x,   line3D.endPoint.y ),
+                walkPath,
+                isEndpoint
+            )
+
+            if not isFound:
+                return ( False, None, None, None )
+
+            return ( True, adsk.core.Point3D.create( point[ 0 ], point[ 1 ], 0 ), curves[ curveId ], curveId )
+
+        # ------------------------------------------------------------------------------
+        # Fusion intersection for others curves
+
         isFound: bool = False
         isInit:  bool = False
 
@@ -3847,12 +5372,7 @@ class StairwayDesign:
 
     def getTotalLengthCurves( self, curvesSKT: list ) -> float:
 
-        length = 0
-
-        for curveSKT in curvesSKT:
-            length = length + curveSKT.length
-
-        return length
+        return self.getCurveIndex( curvesSKT ).totalLength
 
 
     # ------------------------------------------------------------------------------
@@ -3912,6 +5432,24 @@ class StairwayDesign:
     # DISPLAY STEP INPUTS TEXT FIELDS
     # ------------------------------------------------------------------------------
 
+    def displayPreviewStatusField( self, skippedLayers: list ) -> bool:
+
+        layerLabels = {
+            'dimensions': 'cotes',
+            'radiating':  'rayonnantes',
+            'riser':      'contremarches',
+        }
+
+        text = '{:.0f} ms'.format( sum( self.previewTimes.values() ) )
+
+        if len( skippedLayers ) > 0:
+            text += ' - masqué : ' + ', '.join( layerLabels[ layer ] for layer in skippedLayers )
+
+        self.inputs.itemById( 'preview_status' ).formattedText = text
+
+        return True
+
+
     def displayAllTextFieldsComputed( self ) -> bool:
 
         futil.log( f' > displayAllTextFieldsComputed()')
@@ -4067,6 +5605,7 @@ class StairwayDesign:
             self.stairAngle          = self.fields.getValueByID( id = 'stair_angle'            )
             self.isPreviewRadiating  = self.fields.getValueByID( id = 'is_preview_radiating'   )
             self.isPreviewBalancing  = self.fields.getValueByID( id = 'is_preview_balancing'   )
+            self.previewTimeBudget   = self.fields.getValueByID( id = 'preview_time_budget'    )
             # ------------------------------------------------------------------------------
             self.stepNumberMini      = self.fields.getValueByID( id = 'step_number_mini',     value = self.computeStepNumberMini()   )
             self.stepNumberMaxi      = self.fields.getValueByID( id = 'step_number_maxi',     value = self.computeStepNumberMaxi()   )
@@ -4099,6 +5638,7 @@ class StairwayDesign:
             self.isCreateSteps       = self.fields.getValueByID( id = 'is_create_steps'        )
             self.isCreateRisers      = self.fields.getValueByID( id = 'is_create_risers'       )
             self.isEngraveReference  = self.fields.getValueByID( id = 'is_engrave_reference'   )
+            self.isFastBuild         = self.fields.getValueByID( id = 'is_fast_build'          )
             # ------------------------------------------------------------------------------
             self.isCreateStairLayout = self.fields.getValueByID( id = 'is_create_stair_layout' )
             self.flatModulo          = self.fields.getValueByID( id = 'flat_modulo'            )
@@ -4123,6 +5663,7 @@ class StairwayDesign:
             self.stairAngle          = self.fields.readParameterByID( id = 'stair_angle',            value = self.stairAngle          )
             self.isPreviewRadiating  = self.fields.readParameterByID( id = 'is_preview_radiating',   value = self.isPreviewRadiating  )
             self.isPreviewBalancing  = self.fields.readParameterByID( id = 'is_preview_balancing',   value = self.isPreviewBalancing  )
+            self.previewTimeBudget   = self.fields.readParameterByID( id = 'preview_time_budget',    value = self.previewTimeBudget   )
             # -----------------------------------------------------------------------------
             self.stepNumberMini      = self.fields.readParameterByID( id = 'step_number_mini',       value = self.stepNumberMini      )
             self.stepNumberMaxi      = self.fields.readParameterByID( id = 'step_number_maxi',       value = self.stepNumberMaxi      )
@@ -4155,6 +5696,7 @@ class StairwayDesign:
             self.isCreateSteps       = self.fields.readParameterByID( id = 'is_create_steps',        value = self.isCreateSteps       )
             self.isCreateRisers      = self.fields.readParameterByID( id = 'is_create_risers',       value = self.isCreateRisers      )
             self.isEngraveReference  = self.fields.readParameterByID( id = 'is_engrave_reference',   value = self.isEngraveReference  )
+            self.isFastBuild         = self.fields.readParameterByID( id = 'is_fast_build',          value = self.isFastBuild         )
             # -----------------------------------------------------------------------------
             self.isCreateStairLayout = self.fields.readParameterByID( id = 'is_create_stair_layout', value = self.isCreateStairLayout )
             self.flatModulo          = self.fields.readParameterByID( id = 'flat_modulo',            value = self.flatModulo          )
@@ -4209,6 +5751,7 @@ class StairwayDesign:
             self.fields.saveParameterByID( id = 'is_create_steps',       value = self.isCreateSteps      )
             self.fields.saveParameterByID( id = 'is_create_risers',      value = self.isCreateRisers     )
             self.fields.saveParameterByID( id = 'is_engrave_reference',  value = self.isEngraveReference )
+            self.fields.saveParameterByID( id = 'is_fast_build',         value = self.isFastBuild        )
             # ------------------------------------------------------------------------------
             self.fields.saveParameterByID( id = 'is_create_stair_layout',  value = self.isCreateStairLayout )
             self.fields.saveParameterByID( id = 'flat_modulo',           value = self.flatModulo         )
@@ -4242,6 +5785,8 @@ class StairwayDesign:
 
         #self.fields.createBoolValueCommandInput(        ref = tab.children,    id = 'is_preview_radiating', value = self.isPreviewRadiating )
         self.fields.createBoolValueCommandInput(         ref = tab.children,    id = 'is_preview_balancing', value = self.isPreviewBalancing )
+        self.fields.createValueCommandInput(             ref = tab.children,    id = 'preview_time_budget',  value = self.previewTimeBudget  )
+        self.fields.createTextBoxCommandInput(           ref = tab.children,    id = 'preview_status' )
 
         # ------------------------------------------------------------------------------
 
@@ -4286,6 +5831,7 @@ class StairwayDesign:
         self.fields.createBoolValueCommandInput(         ref = tab.children,    id = 'is_create_steps',      value = self.isCreateSteps      )
         self.fields.createBoolValueCommandInput(         ref = tab.children,    id = 'is_create_risers',     value = self.isCreateRisers     )
         self.fields.createBoolValueCommandInput(         ref = tab.children,    id = 'is_engrave_reference', value = self.isEngraveReference )
+        self.fields.createBoolValueCommandInput(         ref = tab.children,    id = 'is_fast_build',        value = self.isFastBuild        )
 
         # ------------------------------------------------------------------------------
 
@@ -1,2 +1,5 @@
-from .fields import *
-from .misc   import *
+from .fields     import *
+from .geometry2d import *
+from .intersect  import *
+from .misc       import *
+from .walkpath   import *
@@ -0,0 +1,187 @@
+import math
+
+# ------------------------------------------------------------------------------
+# Pure python batch operations on 2D lines (no adsk import)
+# A line is a flat tuple ( x1, y1, x2, y2 ) in sketch space (cm)
+# ------------------------------------------------------------------------------
+
+def offsetLines2D( lines: list, offset: float ) -> list:
+    """Offset all the lines perpendicular by a distance, return lines ( x1, y1, x2, y2 ) of length abs( offset ).
+    The new line starts at the start point moved on the right side of the line (left side if offset < 0), in the direction start -> end"""
+
+    result   = []
+    distance = abs( offset )
+
+    for ( x1, y1, x2, y2 ) in lines:
+
+        length = math.hypot( x2 - x1, y2 - y1 )
+
+        if length == 0:
+            result.append( None )
+            continue
+
+        # unit direction
+
+        dx = ( x2 - x1 ) / length
+        dy = ( y2 - y1 ) / length
+
+        # start point rotated a quarter turn
+
+        xStart = x1 + dy * offset
+        yStart = y1 - dx * offset
+
+        result.append( ( xStart, yStart, xStart + dx * distance, yStart + dy * distance ) )
+
+    return result
+
+
+def offsetStepLines2D( steps: list, offset: float ) -> list:
+    """Offset the step lines given by ( walkPoint, insidePoint ), see offsetLines2D().
+    The line goes from the walk point away from the inside point : the start is the walk point rotated around it
+    by -90° (+90° if offset < 0) from the direction inside -> walk"""
+
+    lines = [ ( xWalk, yWalk, 2 * xWalk - xInside, 2 * yWalk - yInside ) for ( ( xWalk, yWalk ), ( xInside, yInside ) ) in steps ]
+
+    return offsetLines2D( lines, offset )
+
+
+def extendLine2D( line: tuple, distance: float ) -> tuple:
+    "Extend a line ( x1, y1, x2, y2 ) by a distance at both ends"
+
+    ( x1, y1, x2, y2 ) = line
+
+    length = math.hypot( x2 - x1, y2 - y1 )
+
+    if length == 0:
+        return line
+
+    dx = ( x2 - x1 ) / length * distance
+    dy = ( y2 - y1 ) / length * distance
+
+    return ( x1 - dx, y1 - dy, x2 + dx, y2 + dy )
+
+
+def reflectPoint2D( point: tuple, axisPoint: tuple, axisNormal: tuple ) -> tuple:
+    "Reflect a point across the line through axisPoint, axisNormal is the unit normal of this line"
+
+    distance = ( point[ 0 ] - axisPoint[ 0 ] ) * axisNormal[ 0 ] + ( point[ 1 ] - axisPoint[ 1 ] ) * axisNormal[ 1 ]
+
+    return ( point[ 0 ] - 2 * distance * axisNormal[ 0 ], point[ 1 ] - 2 * distance * axisNormal[ 1 ] )
+
+
+def movePoints2D( points: list, origin: tuple, angle: float ) -> list:
+    "Translate the points by -origin then rotate them by angle around ( 0, 0 ), same as a sketch moved to a front line"
+
+    cosAngle = math.cos( angle )
+    sinAngle = math.sin( angle )
+
+    result = []
+
+    for ( x, y ) in points:
+
+        dx = x - origin[ 0 ]
+        dy = y - origin[ 1 ]
+
+        result.append( ( dx * cosAngle - dy * sinAngle, dx * sinAngle + dy * cosAngle ) )
+
+    return result
+
+
+def getPolygonArea2D( points: list ) -> float:
+    "Signed area of a closed polygon, positive if the points turn counter clockwise"
+
+    area = 0.0
+
+    for pointId, ( x1, y1 ) in enumerate( points ):
+
+        ( x2, y2 ) = points[ ( pointId + 1 ) % len( points ) ]
+
+        area += x1 * y2 - x2 * y1
+
+    return area / 2
+
+
+# ------------------------------------------------------------------------------
+# Polylines : list of ( x, y ) points
+# ------------------------------------------------------------------------------
+
+def offsetPolyline2D( points: list, offset: float ) -> list:
+    "Offset an open polyline on its left side (right side if offset < 0), the offset lines are joined at their intersection"
+
+    directions = []
+
+    for ( x1, y1 ), ( x2, y2 ) in zip( points[ :-1 ], points[ 1: ] ):
+
+        length = math.hypot( x2 - x1, y2 - y1 )
+        directions.append( ( ( x2 - x1 ) / length, ( y2 - y1 ) / length ) )
+
+    # left normals
+
+    normals = [ ( - dy, dx ) for ( dx, dy ) in directions ]
+
+    result = [ ( points[ 0 ][ 0 ] + normals[ 0 ][ 0 ] * offset, points[ 0 ][ 1 ] + normals[ 0 ][ 1 ] * offset ) ]
+
+    # corners : miter point of two consecutive offset lines
+
+    for index in range( 1, len( points ) - 1 ):
+
+        ( nx1, ny1 ) = normals[ index - 1 ]
+        ( nx2, ny2 ) = normals[ index ]
+
+        ratio = offset / ( 1 + nx1 * nx2 + ny1 * ny2 )
+
+        result.append( ( points[ index ][ 0 ] + ( nx1 + nx2 ) * ratio, points[ index ][ 1 ] + ( ny1 + ny2 ) * ratio ) )
+
+    result.append( ( points[ -1 ][ 0 ] + normals[ -1 ][ 0 ] * offset, points[ -1 ][ 1 ] + normals[ -1 ][ 1 ] * offset ) )
+
+    return result
+
+
+def filletPolyline2D( points: list, radius: float ) -> list:
+    """Return the curves of a polyline with a tangent arc of radius at each corner, in order :
+    ( 'Line', startPoint, endPoint ) and ( 'Arc', centerPoint, startPoint, endPoint, sweepAngle ) - sweepAngle > 0 is counter clockwise"""
+
+    curves     = []
+    startPoint = points[ 0 ]
+
+    for index in range( 1, len( points ) - 1 ):
+
+        ( x0, y0 ) = points[ index - 1 ]
+        ( x1, y1 ) = points[ index ]
+        ( x2, y2 ) = points[ index + 1 ]
+
+        length1 = math.hypot( x1 - x0, y1 - y0 )
+        length2 = math.hypot( x2 - x1, y2 - y1 )
+
+        ( dx1, dy1 ) = ( ( x1 - x0 ) / length1, ( y1 - y0 ) / length1 )
+        ( dx2, dy2 ) = ( ( x2 - x1 ) / length2, ( y2 - y1 ) / length2 )
+
+        # signed turn angle (> 0 turn to the left)
+
+        turnAngle = math.atan2( dx1 * dy2 - dy1 * dx2, dx1 * dx2 + dy1 * dy2 )
+
+        if radius <= 0 or turnAngle == 0:
+            curves.append( ( 'Line', startPoint, points[ index ] ) )
+            startPoint = points[ index ]
+            continue
+
+        # tangent points at r.tan( turn / 2 ) from the corner
+
+        tangentLength = radius * math.tan( abs( turnAngle ) / 2 )
+
+        tangentPoint1 = ( x1 - dx1 * tangentLength, y1 - dy1 * tangentLength )
+        tangentPoint2 = ( x1 + dx2 * tangentLength, y1 + dy2 * tangentLength )
+
+        # center on the inner side of the turn
+
+        side        = math.copysign( 1, turnAngle )
+        centerPoint = ( tangentPoint1[ 0 ] - dy1 * radius * side, tangentPoint1[ 1 ] + dx1 * radius * side )
+
+        curves.append( ( 'Line', startPoint, tangentPoint1 ) )
+        curves.append( ( 'Arc', centerPoint, tangentPoint1, tangentPoint2, turnAngle ) )
+
+        startPoint = tangentPoint2
+
+    curves.append( ( 'Line', startPoint, points[ -1 ] ) )
+
+    return curves
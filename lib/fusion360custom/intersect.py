@@ -0,0 +1,115 @@
+import math
+
+from .walkpath import *
+
+# ------------------------------------------------------------------------------
+# Pure python intersections of an infinite line with lines and arcs (no adsk import)
+# The infinite line goes through startPoint and endPoint, coordinates are ( x, y ) tuples
+# ------------------------------------------------------------------------------
+
+def intersectLineSegment2D( startPoint: tuple, endPoint: tuple, segment: LineSegment2D, tolerance: float = POINT_TOLERANCE ) -> list:
+    "Return a list of ( point, length on the segment )"
+
+    dx = endPoint[ 0 ] - startPoint[ 0 ]
+    dy = endPoint[ 1 ] - startPoint[ 1 ]
+
+    sx = segment.endPoint[ 0 ] - segment.startPoint[ 0 ]
+    sy = segment.endPoint[ 1 ] - segment.startPoint[ 1 ]
+
+    denominator = dx * sy - dy * sx
+
+    # parallel (or degenerate) : no single intersection
+
+    if abs( denominator ) < 1e-12 or segment.length == 0:
+        return []
+
+    ox = segment.startPoint[ 0 ] - startPoint[ 0 ]
+    oy = segment.startPoint[ 1 ] - startPoint[ 1 ]
+
+    # position on the segment ( 0 -> 1 )
+
+    u      = ( ox * dy - oy * dx ) / denominator
+    length = u * segment.length
+
+    if not( - tolerance <= length <= segment.length + tolerance ):
+        return []
+
+    length = min( max( length, 0.0 ), segment.length )
+
+    return [ ( segment.getPointAtLength( length ), length ) ]
+
+
+def intersectLineArc2D( startPoint: tuple, endPoint: tuple, arc: ArcSegment2D, tolerance: float = POINT_TOLERANCE ) -> list:
+    "Return a list of ( point, length on the arc )"
+
+    dx = endPoint[ 0 ] - startPoint[ 0 ]
+    dy = endPoint[ 1 ] - startPoint[ 1 ]
+
+    lineLength = math.hypot( dx, dy )
+
+    if lineLength == 0 or arc.length == 0:
+        return []
+
+    dx /= lineLength
+    dy /= lineLength
+
+    # projection of the center on the line
+
+    cx = arc.centerPoint[ 0 ] - startPoint[ 0 ]
+    cy = arc.centerPoint[ 1 ] - startPoint[ 1 ]
+
+    t        = cx * dx + cy * dy
+    distance = abs( cx * dy - cy * dx )
+
+    if distance > arc.radius + tolerance:
+        return []
+
+    half = math.sqrt( max( arc.radius ** 2 - distance ** 2, 0.0 ) )
+
+    result = []
+
+    for tHit in ( [ t ]  if( half <= tolerance )  else [ t - half, t + half ] ):
+
+        point = ( startPoint[ 0 ] + dx * tHit, startPoint[ 1 ] + dy * tHit )
+
+        # keep the points on the arc
+
+        angle = math.atan2( point[ 1 ] - arc.centerPoint[ 1 ], point[ 0 ] - arc.centerPoint[ 0 ] )
+        delta = ( angle - arc.startAngle ) * math.copysign( 1, arc.sweepAngle ) % ( 2 * math.pi )
+
+        if delta > 2 * math.pi - tolerance / arc.radius:
+            delta = 0.0
+
+        if delta <= abs( arc.sweepAngle ) + tolerance / arc.radius:
+
+            length = min( arc.radius * delta, arc.length )
+            result.append( ( arc.getPointAtLength( length ), length ) )
+
+    return result
+
+
+def intersectLineWalkPath2D( startPoint: tuple, endPoint: tuple, walkPath: WalkPath, isEndpoint: bool = False ) -> tuple:
+    """Return ( isFound, point, segmentId, length from the start of the path ) of the intersection
+    nearest to the start point of the line (end point if isEndpoint)"""
+
+    fromPoint = endPoint  if( isEndpoint )  else startPoint
+
+    nearest         = ( False, None, None, None )
+    nearestDistance = None
+
+    for segmentId, segment in enumerate( walkPath.segments ):
+
+        if isinstance( segment, ArcSegment2D ):
+            hits = intersectLineArc2D( startPoint, endPoint, segment )
+        else:
+            hits = intersectLineSegment2D( startPoint, endPoint, segment )
+
+        for ( point, length ) in hits:
+
+            distance = math.hypot( point[ 0 ] - fromPoint[ 0 ], point[ 1 ] - fromPoint[ 1 ] )
+
+            if nearestDistance == None or distance < nearestDistance:
+                nearestDistance = distance
+                nearest         = ( True, point, segmentId, walkPath.startLengths[ segmentId ] + length )
+
+    return nearest
@@ -1,6 +1,9 @@
 import adsk.core, adsk.fusion
 import math
 
+from .geometry2d import *
+from .walkpath   import *
+
 # ------------------------------------------------------------------------------
 
 def moveOccurence( occurrence: adsk.fusion.Occurrence, x: float = 0, y: float = 0, z: float = 0 )-> bool:
@@ -82,13 +85,15 @@ def offsetPoint(
 # ------------------------------------------------------------------------------
 
 def getBigNurbsCurve (
-        curves: list
+        curves: list,
+        isReversed: list = None
     ) -> adsk.core.NurbsCurve3D:
-    "Get a big NURBS curve from selected curves by Brian Etkins. See : https://forums.autodesk.com/t5/fusion-api-and-scripts/convert-multiple-lines-into-a-single-spline/m-p/10489789#M13828"
+    """Get a big NURBS curve from selected curves by Brian Etkins. See : https://forums.autodesk.com/t5/fusion-api-and-scripts/convert-multiple-lines-into-a-single-spline/m-p/10489789#M13828
+    isReversed : flags of a CurveChain, the control points are not tested if given"""
 
     nurbsCurves = []
 
-    for curveSKT in curves:
+    for curveId, curveSKT in enumerate( curves ):
 
         # Get each curve as a NURBS curve.
         nurbs:       adsk.core.NurbsCurve3D  = None
@@ -101,6 +106,15 @@ def getBigNurbsCurve (
             # nurbs = sketchCurve.geometry.asNurbsCurve
             nurbs = sketchCurve.worldGeometry.asNurbsCurve
 
+        # orientation already known
+
+        if isReversed != None:
+
+            if isReversed[ curveId ]:
+                nurbs = reverseNurbsCurve( nurbs )
+
+            nurbsCurves.append( nurbs )
+            continue
 
         # Determine if the end of the start curve matches either the start
         # or end of the second curve. If not, reverse the start curve.
@@ -117,7 +131,7 @@ def getBigNurbsCurve (
             newEnd:     adsk.core.Point3D = newCurve.controlPoints[ -1]
 
             if firstStart.isEqualTo( newStart ) or firstStart.isEqualTo( newEnd ):
-                curves[ 0 ] = reverseNurbsCurve( curves[ 0 ] )
+                nurbsCurves[ 0 ] = reverseNurbsCurve( nurbsCurves[ 0 ] )
 
         # For each subsequent curve, check to see that it's start matches the end of the previous curve.
         # If it doesn't reverse the new curve.
@@ -169,6 +183,262 @@ def reverseNurbsCurve(
     # ------------------------------------------------------------------------------
 
 
+# ------------------------------------------------------------------------------
+
+class CurveChain:
+    "Orientation of connected sketch curves given in chain order (see findConnectedCurves)"
+
+    def __init__( self, curves: list ):
+
+        endPoints = []
+
+        for curveSKT in curves:
+
+            ( _, startPoint, endPoint ) = curveSKT.geometry.evaluator.getEndPoints()
+
+            endPoints.append( ( ( startPoint.x, startPoint.y ), ( endPoint.x, endPoint.y ) ) )
+
+        self.isReversed: list = getChainReversedFlags( endPoints )
+
+        # start and end points of the chain
+
+        ( firstStart, firstEnd ) = endPoints[ 0 ]   if( len( endPoints ) > 0 )  else ( None, None )
+        ( lastStart, lastEnd )   = endPoints[ -1 ]  if( len( endPoints ) > 0 )  else ( None, None )
+
+        self.startPoint: tuple = firstEnd  if( len( endPoints ) > 0 and self.isReversed[ 0 ] )  else firstStart
+        self.endPoint: tuple   = lastStart if( len( endPoints ) > 0 and self.isReversed[ -1 ] ) else lastEnd
+
+
+def getWalkPathFromCurves(
+        curves: list
+    ) -> WalkPath:
+    "Get an analytic walkpath from connected sketch lines and arcs. Return None if another curve type is found"
+
+    segments = []
+
+    for curveSKT in curves:
+
+        if curveSKT.objectType == adsk.fusion.SketchLine.classType():
+
+            line3D: adsk.core.Line3D = curveSKT.geometry
+
+            segments.append( LineSegment2D(
+                ( line3D.startPoint.x, line3D.startPoint.y ),
+                ( line3D.endPoint.x,   line3D.endPoint.y )
+            ) )
+
+        elif curveSKT.objectType == adsk.fusion.SketchArc.classType():
+
+            # the arc goes counter clockwise around its normal from start angle to end angle
+
+            arc3D: adsk.core.Arc3D = curveSKT.geometry
+
+            startAngle = math.atan2( arc3D.startPoint.y - arc3D.center.y, arc3D.startPoint.x - arc3D.center.x )
+            sweepAngle = ( arc3D.endAngle - arc3D.startAngle ) * sign( arc3D.normal.z )
+
+            segments.append( ArcSegment2D(
+                ( arc3D.center.x, arc3D.center.y ),
+                arc3D.radius,
+                startAngle,
+                sweepAngle
+            ) )
+
+        else:
+            return None
+
+    return WalkPath( segments )
+
+
+def createPrismBody(
+        pieces: list,
+        height: float
+    ) -> adsk.fusion.BRepBody:
+    """Temporary body of the prism from z = 0 to height on a closed outline of lines ( startPoint, endPoint ) and arcs ( startPoint, middlePoint, endPoint ).
+    The end of a piece is the start of the next one. The faces are defined in order : bottom, top, then the side face of each piece (2 + piece index).
+    Return None if the body can not be created"""
+
+    if len( pieces ) < 2 or height <= 0:
+        return None
+
+    # the faces are built for an outline turning counter clockwise, their loops are reversed if not
+
+    isClockwise = getPolygonArea2D( [ point for piece in pieces for point in piece[ :-1 ] ] ) < 0
+
+    # ------------------------------------------------------------------------------
+
+    bodyDef: adsk.fusion.BRepBodyDefinition   = adsk.fusion.BRepBodyDefinition.create()
+    shellDef: adsk.fusion.BRepShellDefinition = bodyDef.lumpDefinitions.add().shellDefinitions.add()
+
+    bottomPoints = [ adsk.core.Point3D.create( piece[ 0 ][ 0 ], piece[ 0 ][ 1 ], 0 )      for piece in pieces ]
+    topPoints    = [ adsk.core.Point3D.create( piece[ 0 ][ 0 ], piece[ 0 ][ 1 ], height ) for piece in pieces ]
+
+    bottomVertices = [ bodyDef.createVertexDefinition( point ) for point in bottomPoints ]
+    topVertices    = [ bodyDef.createVertexDefinition( point ) for point in topPoints ]
+
+    verticalEdges  = [ bodyDef.createEdgeDefinitionByCurve( bottomVertices[ i ], topVertices[ i ], adsk.core.Line3D.create( bottomPoints[ i ], topPoints[ i ] ) ) for i in range( len( pieces ) ) ]
+
+    bottomEdges = []
+    topEdges    = []
+    sideFaces   = []
+
+    for i, piece in enumerate( pieces ):
+
+        j = ( i + 1 ) % len( pieces )
+
+        if len( piece ) == 3:
+
+            bottomCurve = adsk.core.Arc3D.createByThreePoints( bottomPoints[ i ], adsk.core.Point3D.create( piece[ 1 ][ 0 ], piece[ 1 ][ 1 ], 0 ),      bottomPoints[ j ] )
+            topCurve    = adsk.core.Arc3D.createByThreePoints( topPoints[ i ],    adsk.core.Point3D.create( piece[ 1 ][ 0 ], piece[ 1 ][ 1 ], height ), topPoints[ j ] )
+
+            # the normal of the cylinder goes away from its axis : it is the right side of an arc turning counter clockwise
+
+            isCounterClockwise = ( ( piece[ 1 ][ 0 ] - piece[ 0 ][ 0 ] ) * ( piece[ 2 ][ 1 ] - piece[ 1 ][ 1 ] ) - ( piece[ 1 ][ 1 ] - piece[ 0 ][ 1 ] ) * ( piece[ 2 ][ 0 ] - piece[ 1 ][ 0 ] ) ) > 0
+
+            surface = adsk.core.Cylinder.create( adsk.core.Point3D.create( bottomCurve.center.x, bottomCurve.center.y, 0 ), adsk.core.Vector3D.create( 0, 0, 1 ), bottomCurve.radius )
+            isParamReversed = ( isCounterClockwise == isClockwise )
+
+        else:
+
+            bottomCurve = adsk.core.Line3D.create( bottomPoints[ i ], bottomPoints[ j ] )
+            topCurve    = adsk.core.Line3D.create( topPoints[ i ],    topPoints[ j ] )
+
+            # the normal of the plane is the right side of the line
+
+            surface = adsk.core.Plane.create( bottomPoints[ i ], adsk.core.Vector3D.create( bottomPoints[ j ].y - bottomPoints[ i ].y, bottomPoints[ i ].x - bottomPoints[ j ].x, 0 ) )
+            isParamReversed = isClockwise
+
+        bottomEdges.append( bodyDef.createEdgeDefinitionByCurve( bottomVertices[ i ], bottomVertices[ j ], bottomCurve ) )
+        topEdges.append( bodyDef.createEdgeDefinitionByCurve( topVertices[ i ], topVertices[ j ], topCurve ) )
+
+        sideFaces.append( ( surface, isParamReversed, [ ( bottomEdges[ i ], False ), ( verticalEdges[ j ], False ), ( topEdges[ i ], True ), ( verticalEdges[ i ], True ) ] ) )
+
+    # ------------------------------------------------------------------------------
+    # Faces : ( surface, isParamReversed, coedges turning counter clockwise around the outside normal of the face )
+    # ------------------------------------------------------------------------------
+
+    faces = [
+        ( adsk.core.Plane.create( bottomPoints[ 0 ], adsk.core.Vector3D.create( 0, 0, -1 ) ), False, [ ( edgeDef, True ) for edgeDef in reversed( bottomEdges ) ] ),
+        ( adsk.core.Plane.create( topPoints[ 0 ],    adsk.core.Vector3D.create( 0, 0,  1 ) ), False, [ ( edgeDef, False ) for edgeDef in topEdges ] ),
+    ] + sideFaces
+
+    for ( surface, isParamReversed, coEdges ) in faces:
+
+        if isClockwise:
+            coEdges = [ ( edgeDef, not isOpposed ) for ( edgeDef, isOpposed ) in reversed( coEdges ) ]
+
+        faceDef: adsk.fusion.BRepFaceDefinition = shellDef.faceDefinitions.add( surface, isParamReversed )
+        loopDef: adsk.fusion.BRepLoopDefinition = faceDef.loopDefinitions.add()
+
+        for ( edgeDef, isOpposed ) in coEdges:
+            loopDef.bRepCoEdgeDefinitions.add( edgeDef, isOpposed )
+
+    return bodyDef.createBody()
+
+
+def addBaseFeatureBodies(
+        component: adsk.fusion.Component,
+        bodies:    list
+    ) -> tuple:
+    """Add temporary bodies to the component, all in one new base feature (a single edit), directly in a design without history.
+    A base feature only holds bodies of its own component. Return ( bodies, baseFeature ), baseFeature is None without history"""
+
+    design: adsk.fusion.Design = component.parentDesign
+
+    if design.designType != adsk.fusion.DesignTypes.ParametricDesignType:
+        return ( [ component.bRepBodies.add( body ) for body in bodies ], None )
+
+    baseFeature: adsk.fusion.BaseFeature = component.features.baseFeatures.add()
+
+    baseFeature.startEdit()
+    newBodies = [ component.bRepBodies.add( body, baseFeature ) for body in bodies ]
+    baseFeature.finishEdit()
+
+    return ( newBodies, baseFeature )
+
+
+def isFaceOnPlane(
+        face:      adsk.fusion.BRepFace,
+        point:     adsk.core.Point3D,
+        normal:    adsk.core.Vector3D,
+        tolerance: float = 1e-4
+    ) -> bool:
+    "True if the face is planar and lies on the plane of the point and the normal (either side)"
+
+    plane: adsk.core.Plane = face.geometry
+
+    if plane.objectType != adsk.core.Plane.classType() or not plane.normal.isParallelTo( normal ):
+        return False
+
+    return abs( plane.origin.vectorTo( point ).dotProduct( plane.normal ) ) <= tolerance * plane.normal.length
+
+
+def findFaceOnPlane(
+        faces,
+        point:     adsk.core.Point3D,
+        normal:    adsk.core.Vector3D,
+        tolerance: float = 1e-4
+    ) -> adsk.fusion.BRepFace:
+    "Planar face lying on the plane of the point and the normal (either side), the largest one if the plane holds several faces. None if not found"
+
+    matchFaces = [ face for face in faces if isFaceOnPlane( face, point, normal, tolerance ) ]
+
+    if len( matchFaces ) == 0:
+        return None
+
+    if len( matchFaces ) == 1:
+        return matchFaces[ 0 ]
+
+    return max( matchFaces, key = ( lambda f: f.area ) )
+
+
+def drawCurves2D(
+        sketch:         adsk.fusion.Sketch,
+        curves2D:       list,
+        isConstruction: bool = False
+    ) -> list:
+    "Draw lines and arcs from filletPolyline2D() without sketch solver, the curves share their end sketch points to stay connected"
+
+    sketchLines: adsk.fusion.SketchLines = sketch.sketchCurves.sketchLines
+    sketchArcs: adsk.fusion.SketchArcs   = sketch.sketchCurves.sketchArcs
+
+    curvesSKT = []
+    prevEnd: adsk.fusion.SketchPoint = None
+
+    for curve2D in curves2D:
+
+        startPoint = prevEnd  if( prevEnd != None )  else adsk.core.Point3D.create( curve2D[ 1 ][ 0 ], curve2D[ 1 ][ 1 ], 0 )
+
+        if curve2D[ 0 ] == 'Line':
+
+            ( _, _, endPoint ) = curve2D
+
+            curveSKT = sketchLines.addByTwoPoints( startPoint, adsk.core.Point3D.create( endPoint[ 0 ], endPoint[ 1 ], 0 ) )
+            prevEnd  = curveSKT.endSketchPoint
+
+        else:
+
+            ( _, centerPoint, arcStartPoint, endPoint, sweepAngle ) = curve2D
+
+            if prevEnd == None:
+                startPoint = adsk.core.Point3D.create( arcStartPoint[ 0 ], arcStartPoint[ 1 ], 0 )
+
+            curveSKT = sketchArcs.addByCenterStartSweep( adsk.core.Point3D.create( centerPoint[ 0 ], centerPoint[ 1 ], 0 ), startPoint, sweepAngle )
+
+            # the arcs are counter clockwise : the end of the curve can be the start sketch point
+
+            endPoint3D = adsk.core.Point3D.create( endPoint[ 0 ], endPoint[ 1 ], 0 )
+
+            if curveSKT.endSketchPoint.geometry.distanceTo( endPoint3D ) <= curveSKT.startSketchPoint.geometry.distanceTo( endPoint3D ):
+                prevEnd = curveSKT.endSketchPoint
+            else:
+                prevEnd = curveSKT.startSketchPoint
+
+        curveSKT.isConstruction = isConstruction
+        curvesSKT.append( curveSKT )
+
+    return curvesSKT
+
+
 # ------------------------------------------------------------------------------
 
 def sign( value ) -> int:
@@ -0,0 +1,408 @@
+import bisect
+import math
+
+# ------------------------------------------------------------------------------
+# Pure python evaluation of a chain of lines and circular arcs (no adsk import)
+# Coordinates are ( x, y ) tuples in sketch space (cm)
+# ------------------------------------------------------------------------------
+
+POINT_TOLERANCE  = 1e-6
+LENGTH_TOLERANCE = 1e-6
+
+# ------------------------------------------------------------------------------
+
+def isEqualPoint2D( point1: tuple, point2: tuple, tolerance: float = POINT_TOLERANCE ) -> bool:
+
+    return abs( point1[ 0 ] - point2[ 0 ] ) <= tolerance  and  abs( point1[ 1 ] - point2[ 1 ] ) <= tolerance
+
+
+
+def getChainReversedFlags( endPoints: list ) -> list:
+    """Orientation of curves given in chain order by their ( startPoint, endPoint ).
+    Same rule as the original nurbs evaluation : the first curve is never reversed, a curve is reversed
+    if the previous curve, as drawn, ends at its end point"""
+
+    flags: list = [ False ] * len( endPoints )
+
+    for curveId in range( 1, len( endPoints ) ):
+
+        ( _, previousEnd ) = endPoints[ curveId - 1 ]
+        ( _, endPoint )    = endPoints[ curveId ]
+
+        flags[ curveId ] = isEqualPoint2D( previousEnd, endPoint )
+
+    return flags
+
+
+# ------------------------------------------------------------------------------
+
+class CurveLengthIndex:
+    "Prefix sums of curve lengths, lookup of a length with a binary search"
+
+    def __init__( self, lengths: list ):
+
+        self.lengths: list      = list( lengths )
+        self.startLengths: list = []
+
+        totalLength = 0.0
+
+        for length in self.lengths:
+            self.startLengths.append( totalLength )
+            totalLength += length
+
+        self.totalLength: float = totalLength
+
+    # ------------------------------------------------------------------------------
+
+    def getIdFromLength( self, length: float ) -> tuple:
+        """Return ( isFound, id, startLength ) of the curve containing the length.
+        Beyond the end return ( False, len( lengths ), totalLength ), before the start ( False, -1, 0 )"""
+
+        if len( self.lengths ) == 0:
+            return ( False, 0, 0.0 )
+
+        # clamp rounding errors at both ends
+
+        if - LENGTH_TOLERANCE <= length < 0:
+            length = 0.0
+
+        if self.totalLength < length <= self.totalLength + LENGTH_TOLERANCE:
+            length = self.totalLength
+
+        if length < 0:
+            return ( False, -1, 0.0 )
+
+        if length > self.totalLength:
+            return ( False, len( self.lengths ), self.totalLength )
+
+        # the last curve starting before or at the length (the end point belongs to the last curve)
+
+        curveId = bisect.bisect_right( self.startLengths, length ) - 1
+        curveId = min( curveId, len( self.lengths ) - 1 )
+
+        return ( True, curveId, self.startLengths[ curveId ] )
+
+
+# ------------------------------------------------------------------------------
+
+class LineSegment2D:
+
+    def __init__( self, startPoint: tuple, endPoint: tuple ):
+
+        self.startPoint: tuple = ( startPoint[ 0 ], startPoint[ 1 ] )
+        self.endPoint: tuple   = ( endPoint[ 0 ],   endPoint[ 1 ] )
+        self.length: float     = math.hypot( endPoint[ 0 ] - startPoint[ 0 ], endPoint[ 1 ] - startPoint[ 1 ] )
+
+    # ------------------------------------------------------------------------------
+
+    def reversed( self ) -> 'LineSegment2D':
+
+        return LineSegment2D( self.endPoint, self.startPoint )
+
+
+    def getPointAtLength( self, length: float ) -> tuple:
+
+        if self.length == 0:
+            return self.startPoint
+
+        ratio = length / self.length
+
+        return (
+            self.startPoint[ 0 ] + ( self.endPoint[ 0 ] - self.startPoint[ 0 ] ) * ratio,
+            self.startPoint[ 1 ] + ( self.endPoint[ 1 ] - self.startPoint[ 1 ] ) * ratio
+        )
+
+
+    def getTangentAtLength( self, length: float ) -> tuple:
+
+        if self.length == 0:
+            return ( 0.0, 0.0 )
+
+        return (
+            ( self.endPoint[ 0 ] - self.startPoint[ 0 ] ) / self.length,
+            ( self.endPoint[ 1 ] - self.startPoint[ 1 ] ) / self.length
+        )
+
+
+    def getLengthAtPoint( self, point: tuple ) -> float:
+        "Length of the projection of the point on the segment"
+
+        if self.length == 0:
+            return 0.0
+
+        ( tx, ty ) = self.getTangentAtLength( 0 )
+        length     = ( point[ 0 ] - self.startPoint[ 0 ] ) * tx + ( point[ 1 ] - self.startPoint[ 1 ] ) * ty
+
+        return min( max( length, 0.0 ), self.length )
+
+
+class ArcSegment2D:
+
+    def __init__( self, centerPoint: tuple, radius: float, startAngle: float, sweepAngle: float ):
+        "sweepAngle > 0 is counter clockwise"
+
+        self.centerPoint: tuple = ( centerPoint[ 0 ], centerPoint[ 1 ] )
+        self.radius: float      = radius
+        self.startAngle: float  = startAngle
+        self.sweepAngle: float  = sweepAngle
+        self.length: float      = radius * abs( sweepAngle )
+
+        self.startPoint: tuple  = self.getPointAtAngle( startAngle )
+        self.endPoint: tuple    = self.getPointAtAngle( startAngle + sweepAngle )
+
+    # ------------------------------------------------------------------------------
+
+    def reversed( self ) -> 'ArcSegment2D':
+
+        return ArcSegment2D( self.centerPoint, self.radius, self.startAngle + self.sweepAngle, - self.sweepAngle )
+
+
+    def getPointAtAngle( self, angle: float ) -> tuple:
+
+        return (
+            self.centerPoint[ 0 ] + self.radius * math.cos( angle ),
+            self.centerPoint[ 1 ] + self.radius * math.sin( angle )
+        )
+
+
+    def getAngleAtLength( self, length: float ) -> float:
+
+        if self.length == 0:
+            return self.startAngle
+
+        return self.startAngle + self.sweepAngle * ( length / self.length )
+
+
+    def getPointAtLength( self, length: float ) -> tuple:
+
+        return self.getPointAtAngle( self.getAngleAtLength( length ) )
+
+
+    def getTangentAtLength( self, length: float ) -> tuple:
+
+        angle     = self.getAngleAtLength( length )
+        direction = math.copysign( 1, self.sweepAngle )
+
+        return ( - math.sin( angle ) * direction, math.cos( angle ) * direction )
+
+
+    def getLengthAtPoint( self, point: tuple ) -> float:
+        "Length of the projection of the point on the arc"
+
+        if self.length == 0:
+            return 0.0
+
+        angle = math.atan2( point[ 1 ] - self.centerPoint[ 1 ], point[ 0 ] - self.centerPoint[ 0 ] )
+        delta = ( angle - self.startAngle ) * math.copysign( 1, self.sweepAngle ) % ( 2 * math.pi )
+
+        # outside of the arc : nearest end
+
+        if delta > abs( self.sweepAngle ):
+            delta = abs( self.sweepAngle )  if( delta - abs( self.sweepAngle ) < 2 * math.pi - delta )  else 0.0
+
+        return self.radius * delta
+
+
+# ------------------------------------------------------------------------------
+
+class WalkPath:
+
+    def __init__( self, segments: list ):
+        "Segments must be given in chain order, they are oriented to follow each other"
+
+        self.isReversed: list = getChainReversedFlags( [ ( segment.startPoint, segment.endPoint ) for segment in segments ] )
+        self.segments: list   = [ segment.reversed()  if( isReversed )  else segment for segment, isReversed in zip( segments, self.isReversed ) ]
+
+        # ------------------------------------------------------------------------------
+
+        self.index: CurveLengthIndex = CurveLengthIndex( [ segment.length for segment in self.segments ] )
+
+        self.lengths: list      = self.index.lengths
+        self.startLengths: list = self.index.startLengths
+        self.totalLength: float = self.index.totalLength
+
+    # ------------------------------------------------------------------------------
+
+    def getSegmentFromLength( self, length: float ) -> tuple:
+
+        return self.index.getIdFromLength( length )
+
+
+    def getDataAtLength( self, length: float ) -> tuple:
+        "Return ( isFound, point, segmentId, unit tangent ) at a length from the start of the path"
+
+        ( isFound, segmentId, startLength ) = self.getSegmentFromLength( length )
+
+        if not isFound:
+            return ( False, None, None, None )
+
+        segment = self.segments[ segmentId ]
+        length  = min( max( length, startLength ), startLength + segment.length )
+
+        return ( True, segment.getPointAtLength( length - startLength ), segmentId, segment.getTangentAtLength( length - startLength ) )
+
+
+    def getLengthAtPoint( self, point: tuple ) -> float:
+        "Length from the start of the path to the projection of the point on the nearest segment"
+
+        nearestLength   = None
+        nearestDistance = None
+
+        for segmentId, segment in enumerate( self.segments ):
+
+            length      = segment.getLengthAtPoint( point )
+            onPoint     = segment.getPointAtLength( length )
+            distance    = math.hypot( point[ 0 ] - onPoint[ 0 ], point[ 1 ] - onPoint[ 1 ] )
+
+            if nearestDistance == None or distance < nearestDistance:
+                nearestDistance = distance
+                nearestLength   = self.startLengths[ segmentId ] + length
+
+        return nearestLength
+
+
+    def getPiecesBetweenLengths( self, fromLength: float, toLength: float ) -> list:
+        """Pieces of the path from a length to another one (backward if toLength < fromLength).
+        A line piece is ( startPoint, endPoint ), an arc piece is ( startPoint, middlePoint, endPoint )"""
+
+        startLength = min( fromLength, toLength )
+        endLength   = max( fromLength, toLength )
+
+        pieces = []
+
+        for segmentId, segment in enumerate( self.segments ):
+
+            segmentLength = self.startLengths[ segmentId ]
+
+            length1 = max( startLength, segmentLength ) - segmentLength
+            length2 = min( endLength, segmentLength + segment.length ) - segmentLength
+
+            if length2 - length1 <= LENGTH_TOLERANCE:
+                continue
+
+            if isinstance( segment, ArcSegment2D ):
+                pieces.append( ( segment.getPointAtLength( length1 ), segment.getPointAtLength( ( length1 + length2 ) / 2 ), segment.getPointAtLength( length2 ) ) )
+            else:
+                pieces.append( ( segment.getPointAtLength( length1 ), segment.getPointAtLength( length2 ) ) )
+
+        if toLength < fromLength:
+            pieces = [ piece[ ::-1 ] for piece in reversed( pieces ) ]
+
+        return pieces
+
+
+# ------------------------------------------------------------------------------
+# Batch evaluation
+# ------------------------------------------------------------------------------
+
+class WalkPathEvaluator:
+    "Stub of adsk.core.CurveEvaluator3D on a WalkPath, the parameter is the length from the start of the path"
+
+    def __init__( self, walkPath: WalkPath ):
+
+        self.walkPath: WalkPath = walkPath
+        self.callCount: int     = 0        # number of calls, the cost of crossing the API in Fusion
+
+    # ------------------------------------------------------------------------------
+
+    def getParameterExtents( self ) -> tuple:
+
+        self.callCount += 1
+
+        return ( True, 0.0, self.walkPath.totalLength )
+
+
+    def getParameterAtLength( self, fromParameter: float, length: float ) -> tuple:
+
+        self.callCount += 1
+
+        parameter = fromParameter + length
+
+        if not( - LENGTH_TOLERANCE <= parameter <= self.walkPath.totalLength + LENGTH_TOLERANCE ):
+            return ( False, None )
+
+        return ( True, min( max( parameter, 0.0 ), self.walkPath.totalLength ) )
+
+
+    def getLengthAtParameter( self, fromParameter: float, toParameter: float ) -> tuple:
+
+        self.callCount += 1
+
+        return ( True, toParameter - fromParameter )
+
+
+    def getPointsAtParameters( self, parameters: list ) -> tuple:
+
+        self.callCount += 1
+
+        points = []
+
+        for parameter in parameters:
+
+            ( isFound, point, _, _ ) = self.walkPath.getDataAtLength( parameter )
+
+            if not isFound:
+                return ( False, [] )
+
+            points.append( ( point[ 0 ], point[ 1 ], 0.0 ) )
+
+        return ( True, points )
+
+
+    def getTangents( self, parameters: list ) -> tuple:
+
+        self.callCount += 1
+
+        tangents = []
+
+        for parameter in parameters:
+
+            ( isFound, _, _, tangent ) = self.walkPath.getDataAtLength( parameter )
+
+            if not isFound:
+                return ( False, [] )
+
+            tangents.append( ( tangent[ 0 ], tangent[ 1 ], 0.0 ) )
+
+        return ( True, tangents )
+
+
+    def getParametersAtPoints( self, points: list ) -> tuple:
+
+        self.callCount += 1
+
+        return ( True, [ self.walkPath.getLengthAtPoint( point ) for point in points ] )
+
+
+# ------------------------------------------------------------------------------
+
+def evaluateAtLengths( evaluator, lengths: list, fromLength: float = 0.0 ) -> tuple:
+    """Return ( isOK, parameters, points, tangents ) at lengths along one curve.
+    The evaluator is an adsk.core.CurveEvaluator3D (or a WalkPathEvaluator), points and tangents are read in one call each"""
+
+    if len( lengths ) == 0:
+        return ( True, [], [], [] )
+
+    ( isOK, startP, endP ) = evaluator.getParameterExtents()
+
+    if not isOK:
+        return ( False, None, None, None )
+
+    parameters = []
+
+    for length in lengths:
+
+        ( isOK, parameter ) = evaluator.getParameterAtLength( startP, length - fromLength )
+
+        if not isOK:
+            return ( False, None, None, None )
+
+        parameters.append( parameter )
+
+    ( isPoints, points )     = evaluator.getPointsAtParameters( parameters )
+    ( isTangents, tangents ) = evaluator.getTangents( parameters )
+
+    if not( isPoints and isTangents ):
+        return ( False, None, None, None )
+
+    return ( True, parameters, list( points ), list( tangents ) )
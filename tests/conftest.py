@@ -0,0 +1,21 @@
+import importlib.util
+import os
+
+# ------------------------------------------------------------------------------
+# The add-in packages import adsk in their __init__ : the modules without adsk
+# are loaded from their file to be tested outside of Fusion 360
+# ------------------------------------------------------------------------------
+
+ROOT_PATH = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+
+
+def loadModule( relativePath: str ):
+    "Load a module without adsk import from its path relative to the add-in folder"
+
+    name = 'stairway360_' + os.path.splitext( os.path.basename( relativePath ) )[ 0 ]
+    spec = importlib.util.spec_from_file_location( name, os.path.join( ROOT_PATH, relativePath ) )
+
+    module = importlib.util.module_from_spec( spec )
+    spec.loader.exec_module( module )
+
+    return module
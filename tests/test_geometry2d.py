@@ -0,0 +1,43 @@
+import math
+
+import pytest
+
+from conftest import loadModule
+
+geometry2d = loadModule( 'lib/fusion360custom/geometry2d.py' )
+
+# ------------------------------------------------------------------------------
+
+def getRotatedStepLine( walkPoint: tuple, insidePoint: tuple, offset: float ) -> tuple:
+    """Offset line of the original computeParallelSteps() : the direction inside -> walk, scaled to |offset|,
+    rotated around the walk point by -90° (+90° if offset < 0)"""
+
+    distance = math.hypot( walkPoint[ 0 ] - insidePoint[ 0 ], walkPoint[ 1 ] - insidePoint[ 1 ] )
+    angle    = - math.pi / 2  if( offset > 0 )  else math.pi / 2
+
+    dx = ( walkPoint[ 0 ] - insidePoint[ 0 ] ) / distance * abs( offset )
+    dy = ( walkPoint[ 1 ] - insidePoint[ 1 ] ) / distance * abs( offset )
+
+    xStart = walkPoint[ 0 ] + dx * math.cos( angle ) - dy * math.sin( angle )
+    yStart = walkPoint[ 1 ] + dx * math.sin( angle ) + dy * math.cos( angle )
+
+    return ( xStart, yStart, xStart + dx, yStart + dy )
+
+
+# ------------------------------------------------------------------------------
+
+@pytest.mark.parametrize( 'offset', [ 1.0, -1.0, 2.5, -2.5 ] )
+def test_offset_step_lines_side( offset: float ):
+
+    steps = [ ( ( 0.0, 0.0 ), ( -3.0, 0.0 ) ), ( ( 1.0, 2.0 ), ( 4.0, -2.0 ) ), ( ( -5.0, 3.0 ), ( -5.0, 7.0 ) ) ]
+
+    for ( walkPoint, insidePoint ), line in zip( steps, geometry2d.offsetStepLines2D( steps, offset ) ):
+
+        assert line == pytest.approx( getRotatedStepLine( walkPoint, insidePoint, offset ) )
+
+
+def test_offset_lines_distance():
+
+    ( line, ) = geometry2d.offsetLines2D( [ ( 0.0, 0.0, 10.0, 0.0 ) ], 2.0 )
+
+    assert line == pytest.approx( ( 0.0, -2.0, 2.0, -2.0 ) )
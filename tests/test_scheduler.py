@@ -0,0 +1,194 @@
+import pytest
+
+from conftest import loadModule
+
+scheduler = loadModule( 'commands/stairwayDesign/scheduler.py' )
+
+# ------------------------------------------------------------------------------
+# Fake clock and timer : the time only moves when the test says so
+# ------------------------------------------------------------------------------
+
+class FakeClock:
+
+    def __init__( self ):
+
+        self.time: float = 100.0
+
+    def __call__( self ) -> float:
+
+        return self.time
+
+    def advance( self, delay: float ):
+
+        self.time += delay
+
+
+class FakeTimer:
+
+    def __init__( self, delay: float, callback ):
+
+        self.delay: float       = delay
+        self.callback           = callback
+        self.isCancelled: bool  = False
+
+    def cancel( self ):
+
+        self.isCancelled = True
+
+
+class FakeTimers:
+    "startTimer() of the scheduler, keeps all the started timers"
+
+    def __init__( self ):
+
+        self.timers: list = []
+
+    def __call__( self, delay: float, callback ) -> FakeTimer:
+
+        timer = FakeTimer( delay, callback )
+        self.timers.append( timer )
+
+        return timer
+
+    def getActiveTimers( self ) -> list:
+
+        return [ timer for timer in self.timers if not timer.isCancelled ]
+
+
+def getScheduler( quietPeriod: float = 0.3 ) -> tuple:
+    "Return ( scheduler, clock, timers, settled calls )"
+
+    clock    = FakeClock()
+    timers   = FakeTimers()
+    settled  = []
+
+    previewScheduler = scheduler.PreviewScheduler(
+        quietPeriod = quietPeriod,
+        onSettled   = lambda: settled.append( clock() ),
+        clock       = clock,
+        startTimer  = timers
+    )
+
+    return ( previewScheduler, clock, timers, settled )
+
+
+# ------------------------------------------------------------------------------
+# Debounce
+# ------------------------------------------------------------------------------
+
+def test_single_change_is_settled():
+
+    ( previewScheduler, _, _, _ ) = getScheduler()
+
+    assert previewScheduler.isSettled()
+
+    previewScheduler.inputChanged()
+
+    assert previewScheduler.isSettled()
+
+
+def test_burst_of_changes_is_settled_after_quiet_period():
+
+    ( previewScheduler, clock, _, _ ) = getScheduler()
+
+    previewScheduler.inputChanged()
+    clock.advance( 0.1 )
+    previewScheduler.inputChanged()
+
+    assert not previewScheduler.isSettled()
+
+    clock.advance( 0.2 )
+    assert not previewScheduler.isSettled()
+
+    clock.advance( 0.15 )
+    assert previewScheduler.isSettled()
+
+
+def test_slow_changes_are_settled():
+
+    ( previewScheduler, clock, _, _ ) = getScheduler()
+
+    previewScheduler.inputChanged()
+    clock.advance( 0.5 )
+    previewScheduler.inputChanged()
+
+    assert previewScheduler.isSettled()
+
+
+def test_schedule_waits_for_the_rest_of_the_quiet_period():
+
+    ( previewScheduler, clock, timers, _ ) = getScheduler()
+
+    previewScheduler.inputChanged()
+    clock.advance( 0.1 )
+    previewScheduler.inputChanged()
+    clock.advance( 0.05 )
+    previewScheduler.schedule()
+
+    ( timer, ) = timers.getActiveTimers()
+
+    assert timer.delay == pytest.approx( 0.25 )
+
+
+# ------------------------------------------------------------------------------
+# Coalescing
+# ------------------------------------------------------------------------------
+
+def test_draft_previews_are_coalesced_in_one_settled_call():
+
+    ( previewScheduler, clock, timers, settled ) = getScheduler()
+
+    # a draft preview is scheduled after each change of the burst
+
+    for _ in range( 5 ):
+
+        previewScheduler.inputChanged()
+        previewScheduler.schedule()
+        clock.advance( 0.1 )
+
+    assert len( timers.timers ) == 5
+
+    ( timer, ) = timers.getActiveTimers()
+
+    assert timer is timers.timers[ -1 ]
+    assert settled == []
+
+    clock.advance( timer.delay )
+    timer.callback()
+
+    assert settled == [ clock() ]
+    assert previewScheduler.timer == None
+    assert previewScheduler.isSettled()
+
+
+# ------------------------------------------------------------------------------
+# Cancel
+# ------------------------------------------------------------------------------
+
+def test_cancel_stops_the_scheduled_call():
+
+    ( previewScheduler, clock, timers, settled ) = getScheduler()
+
+    previewScheduler.inputChanged()
+    previewScheduler.schedule()
+
+    assert previewScheduler.cancel()
+    assert timers.getActiveTimers() == []
+    assert previewScheduler.timer == None
+
+    # nothing left to cancel
+
+    assert not previewScheduler.cancel()
+    assert settled == []
+
+
+def test_fire_without_callback():
+
+    ( previewScheduler, _, timers, _ ) = getScheduler()
+
+    previewScheduler.onSettled = None
+    previewScheduler.schedule()
+
+    timers.timers[ 0 ].callback()
+
+    assert previewScheduler.timer == None
@@ -0,0 +1,90 @@
+import math
+
+from conftest import loadModule
+
+walkpath = loadModule( 'lib/fusion360custom/walkpath.py' )
+
+# ------------------------------------------------------------------------------
+# Walkpath of a quarter turn : line, arc, line
+# ------------------------------------------------------------------------------
+
+RADIUS = 40.0
+
+
+def getQuarterTurnPath() -> 'walkpath.WalkPath':
+
+    return walkpath.WalkPath( [
+        walkpath.LineSegment2D( ( 0.0, 0.0 ), ( 100.0, 0.0 ) ),
+        walkpath.ArcSegment2D( ( 100.0, RADIUS ), RADIUS, - math.pi / 2, math.pi / 2 ),
+        walkpath.LineSegment2D( ( 100.0 + RADIUS, RADIUS ), ( 100.0 + RADIUS, 150.0 ) )
+    ] )
+
+
+def isEqualTuple( values1: tuple, values2: tuple, tolerance: float = 1e-9 ) -> bool:
+
+    return all( abs( value1 - value2 ) <= tolerance for value1, value2 in zip( values1, values2 ) )
+
+
+# ------------------------------------------------------------------------------
+
+def test_evaluate_at_lengths_matches_data_at_length():
+
+    walkPath  = getQuarterTurnPath()
+    evaluator = walkpath.WalkPathEvaluator( walkPath )
+
+    lengths = [ 0.0, 25.0, 100.0, 100.0 + RADIUS * math.pi / 4, walkPath.totalLength ]
+
+    ( isOK, parameters, points, tangents ) = walkpath.evaluateAtLengths( evaluator, lengths )
+
+    assert isOK
+    assert parameters == lengths
+
+    for length, point, tangent in zip( lengths, points, tangents ):
+
+        ( isFound, expectedPoint, _, expectedTangent ) = walkPath.getDataAtLength( length )
+
+        assert isFound
+        assert isEqualTuple( point, ( expectedPoint[ 0 ], expectedPoint[ 1 ], 0.0 ) )
+        assert isEqualTuple( tangent, ( expectedTangent[ 0 ], expectedTangent[ 1 ], 0.0 ) )
+
+    # middle of the arc
+
+    assert isEqualTuple( points[ 3 ], ( 100.0 + RADIUS * math.sqrt( 0.5 ), RADIUS - RADIUS * math.sqrt( 0.5 ), 0.0 ) )
+
+
+def test_evaluate_at_lengths_call_count():
+
+    evaluator = walkpath.WalkPathEvaluator( getQuarterTurnPath() )
+
+    lengths = [ 10.0 * index for index in range( 20 ) ]
+
+    walkpath.evaluateAtLengths( evaluator, lengths )
+
+    # 1 getParameterExtents + 1 getParameterAtLength by length + 1 getPointsAtParameters + 1 getTangents
+
+    assert evaluator.callCount == len( lengths ) + 3
+
+
+def test_evaluate_at_lengths_from_length():
+    "Lengths on the curve of a chain, given from the start of the chain"
+
+    walkPath  = getQuarterTurnPath()
+    evaluator = walkpath.WalkPathEvaluator( walkPath )
+
+    ( isOK, parameters, points, _ ) = walkpath.evaluateAtLengths( evaluator, [ 60.0, 80.0 ], fromLength = 50.0 )
+
+    assert isOK
+    assert parameters == [ 10.0, 30.0 ]
+    assert isEqualTuple( points[ 1 ], ( 30.0, 0.0, 0.0 ) )
+
+
+def test_evaluate_at_lengths_empty_and_out_of_path():
+
+    evaluator = walkpath.WalkPathEvaluator( getQuarterTurnPath() )
+
+    assert walkpath.evaluateAtLengths( evaluator, [] ) == ( True, [], [], [] )
+    assert evaluator.callCount == 0
+
+    ( isOK, _, _, _ ) = walkpath.evaluateAtLengths( evaluator, [ 10.0, 1000.0 ] )
+
+    assert not isOK